@@ -0,0 +1,91 @@
+"""Measure the cold-start time of a Turbulette project.
+
+Each run starts a new Python process, imports Turbulette and calls `setup()`
+(creating the GINO instance, without connecting to the database).
+Three modes are compared:
+
+- eager : resolver modules are discovered and imported at startup
+- cached : resolver modules are read from `RESOLVERS_CACHE`
+- lazy : `LAZY_RESOLVERS` is enabled on top of the cache
+- snapshot : the schema is built from `SCHEMA_SNAPSHOT`, on top of lazy resolvers
+
+Usage:
+
+    TURBULETTE_SETTINGS_MODULE=tests.settings python scripts/bench_cold_start.py
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from statistics import median
+
+CHILD = """
+from time import perf_counter
+start = perf_counter()
+from turbulette import setup
+imported = perf_counter()
+setup(database=True)
+print(imported - start, perf_counter() - imported)
+"""
+
+SNAPSHOT = "from turbulette.management.cli import cli; cli(['snapshot'])"
+
+
+def run(env: dict) -> tuple:
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        env=env,
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    ).stdout
+    import_time, setup_time = (float(t) for t in output.split()[-2:])
+    return import_time, setup_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    base_env = {**os.environ, "PYTHONPATH": str(Path.cwd())}
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = str(Path(tmp) / "resolvers.json")
+        snapshot = str(Path(tmp) / "schema.snapshot")
+        lazy_env = {**base_env, "RESOLVERS_CACHE": cache, "LAZY_RESOLVERS": "True"}
+        modes = {
+            "eager": base_env,
+            "cached": {**base_env, "RESOLVERS_CACHE": cache},
+            "lazy": lazy_env,
+            "snapshot": {**lazy_env, "SCHEMA_SNAPSHOT": snapshot},
+        }
+        # Build the cache and the schema snapshot
+        run(modes["cached"])
+        subprocess.run(
+            [sys.executable, "-c", SNAPSHOT],
+            env=modes["snapshot"],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+
+        # Interleave modes so they are equally affected by system noise
+        results: dict = {mode: [] for mode in modes}
+        for _ in range(args.runs):
+            for mode, env in modes.items():
+                results[mode].append(run(env))
+
+        print(f"{'mode':<10}{'import':>12}{'setup':>12}{'total':>12}")
+        for mode in modes:
+            import_time = median(r[0] for r in results[mode]) * 1000
+            setup_time = median(r[1] for r in results[mode]) * 1000
+            print(
+                f"{mode:<10}{import_time:>10.1f}ms{setup_time:>10.1f}ms"
+                f"{import_time + setup_time:>10.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Measure the cost of attribute accesses on `LazyInitMixin` singletons.
+
+Compares accesses on the wrapped object itself, on a set up singleton,
+and on a singleton checking its state on each access
+(the behavior before set up singletons were bound to the wrapped object).
+
+Usage:
+
+    python scripts/bench_lazy_init.py
+"""
+
+import argparse
+from timeit import repeat
+
+from turbulette.utils import LazyInitMixin
+
+
+class Target:
+    def get(self):
+        pass
+
+
+class LazyTarget(LazyInitMixin, Target):
+    def __init__(self):
+        super().__init__("target")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--number", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    checked = LazyTarget()
+    checked.obj = Target()
+    checked.__initialized__ = True
+
+    bound = LazyTarget()
+    bound.__setup__(Target())
+
+    print(f"{'access':<10}{'per access':>14}")
+    for name, obj in (("direct", Target()), ("checked", checked), ("bound", bound)):
+        best = min(
+            repeat("obj.get", globals={"obj": obj}, number=args.number, repeat=5)
+        )
+        print(f"{name:<10}{best / args.number * 1e9:>12.1f}ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ from tests.app_1.pyd_models import CreateBook, CreateComics
 from turbulette import mutation, query
 from turbulette.apps.auth import get_token_from_user, user_model
 from turbulette.apps.auth.pyd_models import BaseUserCreate
+from turbulette.db import get_loader
 from turbulette.errors import ErrorField
 from turbulette.validation.decorators import validate
 
@@ -65,8 +66,8 @@ async def add_books(*_):
 
 
 @mutation.field("borrowBook")
-async def borrow_book(*_, **kwargs):
-    book = await Book.get(int(kwargs["id"]))
+async def borrow_book(_, info, **kwargs):
+    book = await get_loader(info.context, Book).load(int(kwargs["id"]))
     await book.update(borrowings=book.borrowings + 1).apply()
     return {"success": True}
 
@@ -81,8 +82,8 @@ async def is_logged(*_):
 
 
 @query.field("book")
-async def resolve_book(*_, **kwargs):
-    book = await Book.query.where(Book.id == int(kwargs["id"])).gino.first()
+async def resolve_book(_, info, **kwargs):
+    book = await get_loader(info.context, Book).load(int(kwargs["id"]))
     return {"book": book.to_dict()}
 
 
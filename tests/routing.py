@@ -10,7 +10,12 @@ async def welcome(request):  # pylint: disable=unused-argument
     return JSONResponse({"welcome": "welcome to the library"})
 
 
+async def echo_form(request):
+    return JSONResponse(dict(await request.form()))
+
+
 routes = [
     Route("/csrf", endpoint=csrf),
     Route("/welcome", endpoint=welcome, methods=["GET", "POST"]),
+    Route("/echo-form", endpoint=echo_form, methods=["POST"]),
 ]
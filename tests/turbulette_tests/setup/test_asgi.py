@@ -1,8 +1,9 @@
+import gc
 from importlib import import_module, reload
 
 import pytest
 
-from turbulette import turbulette_starlette
+from turbulette import preload, turbulette_starlette
 from turbulette.conf.exceptions import ImproperlyConfigured
 
 
@@ -21,3 +22,18 @@ def test_missing_db_settings(settings):
     with pytest.raises(ImproperlyConfigured):
         turbulette_starlette(settings)
     reload(settings_module)
+
+
+@pytest.mark.usefixtures("reload_resources")
+def test_preload(settings):
+    try:
+        app = preload(settings)
+        # Enabled again in workers
+        assert not gc.isenabled()
+        assert gc.enable in app.router.on_startup
+        if hasattr(gc, "get_freeze_count"):
+            assert gc.get_freeze_count() > 0
+    finally:
+        gc.enable()
+        if hasattr(gc, "unfreeze"):
+            gc.unfreeze()
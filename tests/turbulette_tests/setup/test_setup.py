@@ -3,12 +3,14 @@ from os import environ
 
 import pytest
 from ariadne.asgi import GraphQL
+from simple_settings import LazySettings
 from starlette.applications import Starlette
 
 from turbulette import setup as turbulette_setup
 from turbulette import turbulette_starlette
 from turbulette.conf.constants import PROJECT_SETTINGS_MODULE
 from turbulette.conf.exceptions import ImproperlyConfigured
+from turbulette.conf.utils import freeze_settings
 
 
 def test_minimal_setup(settings_no_apps):
@@ -49,6 +51,44 @@ async def test_lazy_init_mixin():
         await cache.cache.connect()
 
 
+def test_lazy_init_mixin_setup():
+    from turbulette.cache import LazyCache
+
+    class Target:
+        value = 1
+
+    lazy = LazyCache()
+    lazy.__setup__(Target())
+    assert isinstance(lazy, LazyCache)
+    assert type(lazy).__name__ == "LazyCache"
+    assert lazy.value == 1
+    assert lazy.initialized
+
+    # Setting up again binds the new object
+    other = Target()
+    other.value = 2
+    lazy.__setup__(other)
+    assert lazy.value == 2
+    assert lazy.obj is other
+    assert type(lazy).__bases__ == (LazyCache,)
+
+
+def test_freeze_settings(settings_no_apps):
+    settings = LazySettings(settings_no_apps)
+    assert freeze_settings(settings)
+    assert isinstance(settings, LazySettings)
+    assert settings.DEBUG is True
+    assert "DEBUG" in vars(settings)
+    assert not hasattr(settings, "MISSING_SETTING")
+    with pytest.raises(AttributeError):
+        settings.DEBUG = False
+
+    settings.configure(DEBUG=False, NEW_SETTING=1)
+    assert settings.DEBUG is False
+    assert settings.NEW_SETTING == 1
+    assert settings.as_dict()["NEW_SETTING"] == 1
+
+
 @pytest.mark.usefixtures("reload_resources")
 def test_no_database(settings_no_apps_module, settings_no_apps):
     # Simulate removing `DB_HOST` from .env
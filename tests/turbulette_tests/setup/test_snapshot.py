@@ -0,0 +1,66 @@
+import pytest
+from click.testing import CliRunner
+from graphql import print_schema
+
+from turbulette.apps import Registry
+from turbulette.apps.snapshot import SchemaSnapshot
+from turbulette.conf.constants import PROJECT_SETTINGS_MODULE
+from turbulette.management.cli import cli
+
+
+def _fail(*_):
+    raise AssertionError("GraphQL files should not be parsed")
+
+
+@pytest.mark.usefixtures("reload_resources")
+def test_snapshot(settings_no_apps, settings_no_apps_module, tmp_path, monkeypatch):
+    path = str(tmp_path / "schema.snapshot")
+    monkeypatch.setenv(PROJECT_SETTINGS_MODULE, settings_no_apps)
+    monkeypatch.setattr(settings_no_apps_module, "SCHEMA_SNAPSHOT", path, raising=False)
+
+    res = CliRunner().invoke(cli, ["snapshot"])
+    assert res.exit_code == 0, res.output
+    schema = print_schema(Registry(project_settings=settings_no_apps).setup())
+
+    snapshot = SchemaSnapshot.load(path)
+    assert snapshot is not None
+    monkeypatch.setattr("turbulette.apps.app.load_schema_from_path", _fail)
+    monkeypatch.setattr("ariadne.make_executable_schema", _fail)
+    registry = Registry(project_settings=settings_no_apps)
+    assert print_schema(registry.setup()) == schema
+    assert snapshot.matches(registry.type_defs)
+
+
+@pytest.mark.usefixtures("reload_resources")
+def test_outdated_snapshot(registry, settings_no_apps_module, tmp_path, monkeypatch):
+    path = str(tmp_path / "schema.snapshot")
+    assert SchemaSnapshot.load(path) is None
+
+    SchemaSnapshot.build("type Query { outdated: Int }").save(path)
+    monkeypatch.setattr(settings_no_apps_module, "SCHEMA_SNAPSHOT", path, raising=False)
+    schema = registry.setup()
+    assert "outdated" not in schema.query_type.fields
+    assert not SchemaSnapshot.load(path).matches(registry.type_defs)
+
+
+def test_snapshot_other_versions(tmp_path, monkeypatch):
+    path = tmp_path / "schema.snapshot"
+    SchemaSnapshot.build("type Query { books: Int }").save(str(path))
+    assert SchemaSnapshot.load(str(path)) is not None
+
+    # Snapshots written with another graphql-core are not unpickled
+    monkeypatch.setattr("turbulette.apps.snapshot.graphql_version", "99.0.0")
+    monkeypatch.setattr("pickle.loads", _fail)
+    assert SchemaSnapshot.load(str(path)) is None
+    monkeypatch.undo()
+
+    path.write_bytes(path.read_bytes()[:-10])
+    assert SchemaSnapshot.load(str(path)) is None
+
+
+@pytest.mark.usefixtures("reload_resources")
+def test_snapshot_no_path(settings_no_apps, monkeypatch):
+    monkeypatch.setenv(PROJECT_SETTINGS_MODULE, settings_no_apps)
+    res = CliRunner().invoke(cli, ["snapshot"])
+    assert res.exit_code != 0, res.output
+    assert "SCHEMA_SNAPSHOT" in res.output
@@ -0,0 +1,113 @@
+import sys
+from os import utime
+
+import pytest
+from graphql import build_schema
+
+from turbulette.apps import TurbuletteApp
+from turbulette.apps.startup import (
+    LazyResolver,
+    ResolversCache,
+    load_lazy_resolvers,
+    root_functions,
+)
+
+FIELDS_MODULE = """
+from turbulette.apps.base import query
+
+
+@query.field("lazyHello")
+def resolve_lazy_hello(*_):
+    return "hello"
+"""
+
+# Registers things as a side effect, like policy conditions
+HELPERS_MODULE = """
+import lazy_app
+
+lazy_app.REGISTERED.append("helpers")
+"""
+
+
+@pytest.fixture
+def lazy_app(tmp_path):
+    package = tmp_path / "lazy_app"
+    (package / "resolvers").mkdir(parents=True)
+    (package / "__init__.py").write_text("REGISTERED = []\n")
+    (package / "resolvers" / "__init__.py").write_text("")
+    (package / "resolvers" / "fields.py").write_text(FIELDS_MODULE)
+    (package / "resolvers" / "helpers.py").write_text(HELPERS_MODULE)
+    sys.path.insert(0, str(tmp_path))
+    yield TurbuletteApp("lazy_app")
+    sys.path.remove(str(tmp_path))
+    for module in [m for m in sys.modules if m.startswith("lazy_app")]:
+        del sys.modules[module]
+    root_functions("Query").pop("lazyHello", None)
+
+
+@pytest.mark.usefixtures("reload_resources")
+def test_startup_profile(registry):
+    registry.setup()
+    assert set(registry.profile.timings["base"]) == {
+        "schema",
+        "directives",
+        "resolvers",
+        "models",
+        "pydantic",
+    }
+    assert "make_schema" in registry.profile.timings["registry"]
+    report = registry.profile.report()
+    assert report.splitlines()[0].split()[0] == "app"
+    assert "Startup took" in report
+
+
+def test_discover_resolvers(lazy_app):
+    modules, paths = lazy_app.discover_resolvers()
+    assert modules == [
+        "lazy_app.resolvers",
+        "lazy_app.resolvers.fields",
+        "lazy_app.resolvers.helpers",
+    ]
+    assert lazy_app.package_path / "resolvers" in paths
+
+
+def test_resolvers_cache(lazy_app, tmp_path):
+    cache_path = tmp_path / "cache" / "resolvers.json"
+    cache = ResolversCache(str(cache_path))
+    lazy_app.load_resolvers(cache)
+    cache.save()
+    assert cache.get("lazy_app") == {
+        "lazy_app.resolvers": {},
+        "lazy_app.resolvers.fields": {"Query": ["lazyHello"]},
+        "lazy_app.resolvers.helpers": {},
+    }
+
+    # Simulate a new process, loading resolvers lazily from the cache
+    for module in [m for m in sys.modules if m.startswith("lazy_app.")]:
+        del sys.modules[module]
+    root_functions("Query").pop("lazyHello")
+    sys.modules["lazy_app"].REGISTERED.clear()
+    lazy_app.load_resolvers(ResolversCache(str(cache_path)), lazy=True)
+    placeholder = root_functions("Query")["lazyHello"]
+    assert isinstance(placeholder, LazyResolver)
+    assert "lazy_app.resolvers.fields" not in sys.modules
+    # Modules without root fields are imported for their side effects
+    assert "lazy_app.resolvers.helpers" in sys.modules
+    assert sys.modules["lazy_app"].REGISTERED == ["helpers"]
+
+    assert placeholder(None, None) == "hello"
+    assert "lazy_app.resolvers.fields" in sys.modules
+    assert root_functions("Query")["lazyHello"] is not placeholder
+
+    # Modifying a resolver module invalidates the app entry
+    utime(lazy_app.package_path / "resolvers" / "fields.py", ns=(0, 0))
+    assert ResolversCache(str(cache_path)).get("lazy_app") is None
+
+
+def test_load_lazy_resolvers(lazy_app):
+    schema = build_schema("type Query { lazyHello: String }")
+    field = schema.query_type.fields["lazyHello"]
+    field.resolve = LazyResolver("lazy_app.resolvers.fields", "Query", "lazyHello")
+    assert load_lazy_resolvers(schema) == 1
+    assert field.resolve is root_functions("Query")["lazyHello"]
+    assert load_lazy_resolvers(schema) == 0
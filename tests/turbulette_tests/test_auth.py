@@ -320,3 +320,116 @@ async def test_jwe(tester, create_user):
             op_name="exclusiveBooks",
             raises=ErrorCode.JWE_DECRYPTION_ERROR,
         )
+
+
+async def test_jwt_decoded_once(
+    tester, create_staff_user, get_staff_tokens, monkeypatch
+):
+    from turbulette.apps.auth import decorators
+
+    from .queries import query_borrowings_price_bought
+
+    calls = []
+
+    def counting_decode_jwt(jwt):
+        calls.append(jwt)
+        return decode_jwt(jwt)
+
+    decode_jwt = decorators.decode_jwt
+    monkeypatch.setattr(decorators, "decode_jwt", counting_decode_jwt)
+
+    # `books`, then `priceBought` and `borrowings` for each book require the JWT
+    await tester.assert_query_success(
+        query=query_borrowings_price_bought,
+        jwt=get_staff_tokens[0],
+        op_name="books",
+    )
+    assert len(calls) == 1
+
+    # The token type is still checked by each decorator
+    await tester.assert_query_failed(
+        query=query_books, jwt=get_staff_tokens[1], op_name="books"
+    )
+
+
+async def test_token_cache(tester, get_user_tokens, monkeypatch):
+    from time import time
+
+    from turbulette.apps.auth import core
+    from turbulette.conf.utils import settings_stub
+
+    calls = []
+
+    def counting_decode_jwt(jwt):
+        calls.append(jwt)
+        return _decode_jwt(jwt)
+
+    _decode_jwt = core._decode_jwt
+    monkeypatch.setattr(core, "_decode_jwt", counting_decode_jwt)
+    core.token_cache.clear()
+
+    # Disabled by default
+    core.decode_jwt(get_user_tokens[0])
+    assert len(core.token_cache) == 0
+
+    with settings_stub(JWT_CACHE_ENABLED=True):
+        claims = core.decode_jwt(get_user_tokens[0])[1]
+        claims["scopes"].append("modified")
+        assert "modified" not in core.decode_jwt(get_user_tokens[0])[1]["scopes"]
+        await tester.assert_query_success(
+            query=query_books, jwt=get_user_tokens[0], op_name="books"
+        )
+        assert len(calls) == 2
+        assert core.token_cache.hits == 2
+        assert core.token_cache.stats()["hit_ratio"] == 2 / 3
+
+        # Expired tokens are verified again
+        key, (decoded, _) = next(iter(core.token_cache._data.items()))
+        core.token_cache.set(key, decoded, expires_at=time() - 1)
+        core.decode_jwt(get_user_tokens[0])
+        assert len(calls) == 3
+
+        # Invalid tokens are never cached
+        await tester.assert_query_failed(
+            query=query_books, jwt=get_user_tokens[0] + "wrong", op_name="books"
+        )
+        assert len(core.token_cache) == 1
+
+    core.token_cache.clear()
+
+
+def test_lru_cache():
+    from turbulette.utils import LRUCache
+
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    # "b" is the least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+    assert len(cache) == 2
+
+
+async def test_hashing_pool(tester):
+    from time import sleep
+
+    from turbulette.apps.auth.core import (
+        HashingPool,
+        get_password_hash_async,
+        verify_password_async,
+    )
+
+    pool = HashingPool(max_workers=1)
+    tasks = asyncio.gather(*(pool.run(sleep, 0.05) for _ in range(3)))
+    await asyncio.sleep(0.01)
+    assert pool.pending == 3
+    assert pool.queue_depth == 2
+    await tasks
+    assert pool.pending == 0
+
+    hashed = await get_password_hash_async(DEFAULT_PASSWORD)
+    assert await verify_password_async(DEFAULT_PASSWORD, hashed)
+    assert not await verify_password_async("wrong", hashed)
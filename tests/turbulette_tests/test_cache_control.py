@@ -0,0 +1,160 @@
+import pytest
+from ariadne import QueryType, graphql, make_executable_schema
+
+from turbulette.exceptions import SchemaError
+
+pytestmark = pytest.mark.asyncio
+
+type_defs = """
+    directive @cache_control(
+        maxAge: Int!, scope: CacheControlScope = PUBLIC
+    ) on FIELD_DEFINITION
+
+    enum CacheControlScope {
+        PUBLIC
+        PRIVATE
+    }
+
+    type Query {
+        catalog(page: Int): [String] @cache_control(maxAge: 60)
+        cart: [String] @cache_control(maxAge: 60, scope: PRIVATE)
+    }
+"""
+
+mutation_type_defs = """
+    type Mutation {
+        order: Boolean @cache_control(maxAge: 60)
+    }
+"""
+
+
+@pytest.fixture
+def cached_schema():
+    from turbulette.apps.auth.directives import CacheControlDirective
+
+    calls = []
+    query = QueryType()
+
+    @query.field("catalog")
+    async def resolve_catalog(*_, page=0):
+        calls.append("catalog")
+        return [f"book {page}"]
+
+    @query.field("cart")
+    def resolve_cart(_, info):
+        calls.append("cart")
+        return [info.context["request"].headers.get("authorization", "anonymous")]
+
+    schema = make_executable_schema(
+        type_defs,
+        query,
+        directives={"cache_control": CacheControlDirective},
+    )
+    return schema, calls
+
+
+async def execute(schema, query, variables=None, jwt=None):
+    from turbulette.test.tester import TestRequest
+
+    _, response = await graphql(
+        schema,
+        {"query": query, "variables": variables},
+        context_value={"request": TestRequest(jwt=jwt)},
+    )
+    return response
+
+
+async def test_cache_control_public(tester, cached_schema):
+    schema, calls = cached_schema
+    query = "query catalog($page: Int) { catalog(page: $page) }"
+
+    for _ in range(2):
+        response = await execute(schema, query, {"page": 1})
+        assert response == {"data": {"catalog": ["book 1"]}}
+    assert calls == ["catalog"]
+
+    # Different variables, different cache entries
+    response = await execute(schema, query, {"page": 2})
+    assert response == {"data": {"catalog": ["book 2"]}}
+    assert calls == ["catalog", "catalog"]
+
+
+async def test_cache_control_private(
+    tester, cached_schema, get_user_tokens, get_staff_tokens
+):
+    schema, calls = cached_schema
+    query = "query cart { cart }"
+
+    # Not cached for anonymous users
+    for _ in range(2):
+        await execute(schema, query)
+    assert len(calls) == 2
+
+    calls.clear()
+    for jwt in (get_user_tokens[0], get_staff_tokens[0]):
+        for _ in range(2):
+            response = await execute(schema, query, jwt=jwt)
+            assert response["data"]["cart"][0].endswith(jwt)
+    assert len(calls) == 2
+
+
+policy_type_defs = """
+    directive @cache_control(
+        maxAge: Int!, scope: CacheControlScope = PUBLIC
+    ) on FIELD_DEFINITION
+    directive @policy on FIELD_DEFINITION
+
+    enum CacheControlScope {
+        PUBLIC
+        PRIVATE
+    }
+
+    type Query {
+        books: [String] %s
+    }
+"""
+
+
+@pytest.mark.parametrize(
+    "directives",
+    ["@cache_control(maxAge: 60) @policy", "@policy @cache_control(maxAge: 60)"],
+)
+async def test_cache_control_policy(tester, create_user, get_user_tokens, directives):
+    from turbulette.apps.auth.directives import CacheControlDirective, PolicyDirective
+
+    calls = []
+    query = QueryType()
+
+    @query.field("books")
+    async def resolve_books(*_):
+        calls.append("books")
+        return ["Dune"]
+
+    schema = make_executable_schema(
+        policy_type_defs % directives,
+        query,
+        directives={"cache_control": CacheControlDirective, "policy": PolicyDirective},
+    )
+    # One cache entry per directive order
+    operation = f"query books {{ books }} # {directives}"
+
+    for _ in range(2):
+        response = await execute(schema, operation, jwt=get_user_tokens[0])
+        assert response["data"] == {"books": ["Dune"]}
+    assert calls == ["books"]
+
+    # The policy is evaluated before reading the cache
+    response = await execute(schema, operation)
+    assert response["data"] == {"books": None}
+    assert response["errors"]
+    assert calls == ["books"]
+
+
+def test_cache_control_mutation(tester):
+    from turbulette.apps.auth.directives import CacheControlDirective
+
+    with pytest.raises(SchemaError):
+        make_executable_schema(
+            [type_defs, mutation_type_defs],
+            directives={"cache_control": CacheControlDirective},
+        )
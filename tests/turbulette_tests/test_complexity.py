@@ -0,0 +1,169 @@
+import asyncio
+
+import pytest
+from ariadne import make_executable_schema
+from async_asgi_testclient import TestClient
+from graphql import parse
+
+from turbulette.apps.base.directives import CostDirective
+from turbulette.complexity import COST_EXTENSION, CostHint, QueryComplexity
+
+pytestmark = pytest.mark.asyncio
+
+type_defs = """
+    directive @cost(value: Int, multipliers: [String!]) on FIELD_DEFINITION
+
+    type Query {
+        books(first: Int): [Book] @cost(value: 2, multipliers: ["first"])
+        author: Author
+        comics(first: Int = 50): [Book] @cost(multipliers: ["first"])
+    }
+
+    type Book {
+        title: String
+        author: Author
+    }
+
+    type Author {
+        name: String
+        books(first: Int): [Book] @cost(multipliers: ["first"])
+    }
+"""
+
+schema = make_executable_schema(type_defs, directives={"cost": CostDirective})
+
+
+def measure(query, variables=None, operation_name=None, **limits):
+    return QueryComplexity(**limits).validate(
+        schema, parse(query), variables, operation_name
+    )
+
+
+def test_cost_directive(tester):
+    field = tester.schema.query_type.fields["comics"]
+    assert field.extensions[COST_EXTENSION] == CostHint(2, ())
+
+
+def test_operation_cost():
+    assert measure("{ author { name } }") == ([], 2)
+    # (2 + 1) * 10
+    assert measure("{ books(first: 10) { title } }") == ([], 30)
+    # Multipliers are read from variables
+    assert measure(
+        "query books($first: Int) { books(first: $first) { title } }", {"first": 3}
+    ) == ([], 9)
+    # (2 + 1 + 1 + (1 + 1) * 5) * 10
+    assert measure(
+        "{ books(first: 10) { title author { books(first: 5) { title } } } }"
+    ) == ([], 140)
+    # Fragments are counted once for each spread
+    assert (
+        measure(
+            """
+        query { author { ...name } books { ...title author { ...name } } }
+        fragment name on Author { name }
+        fragment title on Book { title }
+        """
+        )
+        == ([], 7)
+    )
+    # Only the executed operation is measured
+    assert measure(
+        "query a { author { name } } query b { books(first: 10) { title } }",
+        operation_name="b",
+    ) == ([], 30)
+
+
+def test_default_multipliers():
+    # (1 + 1) * 50, from the schema default
+    assert measure("{ comics { title } }") == ([], 100)
+    assert measure("query comics($first: Int) { comics(first: $first) { title } }") == (
+        [],
+        100,
+    )
+    # (1 + 1) * 20, from the variable default
+    assert measure(
+        "query comics($first: Int = 20) { comics(first: $first) { title } }"
+    ) == ([], 40)
+    assert measure("{ comics { title } }", max_cost=99)[0]
+
+
+def test_operation_limits():
+    query = "{ author { books(first: 5) { author { name } } } }"
+    errors, cost = measure(query, max_depth=3)
+    assert cost == 16
+    assert len(errors) == 1
+    assert "depth 4" in errors[0].message
+
+    errors, _ = measure(query, max_cost=15)
+    assert len(errors) == 1
+    assert "cost 16" in errors[0].message
+
+    assert measure(query, max_depth=4, max_cost=16) == ([], 16)
+
+
+def test_nested_fragments():
+    # Each fragment is spread twice by the previous one
+    count = 40
+    fragments = "".join(
+        f"fragment F{i} on Author {{"
+        f" x: books {{ author {{ ...F{i + 1} }} }}"
+        f" y: books {{ author {{ ...F{i + 1} }} }}"
+        " }"
+        for i in range(count)
+    )
+    query = (
+        f"{{ author {{ ...F0 }} }} {fragments} fragment F{count} on Author {{ name }}"
+    )
+    cost = 1
+    for _ in range(count):
+        cost = 2 * (cost + 2)
+    assert measure(query) == ([], cost + 1)
+
+    # The walk stops as soon as a limit is exceeded
+    errors, _ = measure(query, max_depth=10)
+    assert "depth 11" in errors[0].message
+    errors, _ = measure(query, max_cost=1000)
+    assert "exceeds the maximum allowed cost of 1000" in errors[0].message
+
+
+async def test_query_throttling(monkeypatch):
+    from turbulette.graphql_app import TurbuletteGraphQL
+
+    complexity = QueryComplexity(max_cost=20, throttle_cost=5, throttle_concurrency=1)
+    app = TurbuletteGraphQL(schema, query_complexity=complexity)
+    client = TestClient(app)
+
+    running, max_running = 0, 0
+
+    async def execute(*args, **kwargs):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return await app_execute(*args, **kwargs)
+
+    app_execute = app._execute
+    monkeypatch.setattr(app, "_execute", execute)
+
+    # Too expensive
+    resp = await client.post("/", json={"query": "{ books(first: 10) { title } }"})
+    assert resp.status_code == 400
+
+    # Throttled
+    responses = await asyncio.gather(
+        *(
+            client.post("/", json={"query": "{ books(first: 2) { title } }"})
+            for _ in range(3)
+        )
+    )
+    assert all(resp.json() == {"data": {"books": None}} for resp in responses)
+    assert max_running == 1
+
+    # Cheap operations are not throttled
+    max_running = 0
+    await asyncio.gather(
+        *(client.post("/", json={"query": "{ author { name } }"}) for _ in range(3))
+    )
+    assert max_running == 3
@@ -14,6 +14,12 @@ async def test_csrf(blank_conf):
 
     async with TestClient(app) as client:
 
+        # Safe methods set the cookie if missing
+        resp = await client.get("/welcome")
+        assert resp.status_code == 200
+        assert resp.cookies[settings.CSRF_COOKIE_NAME]
+        client.cookie_jar.clear()
+
         resp = await client.get("/csrf")
         assert resp.status_code == 200
         assert "csrftoken" in resp.json()
@@ -57,6 +63,15 @@ async def test_csrf(blank_conf):
             )
             assert resp.status_code == 200
 
+            # The form is still readable by the endpoint
+            resp = await client.post(
+                "/echo-form",
+                cookies={settings.CSRF_COOKIE_NAME: csrf_token},
+                form={settings.CSRF_COOKIE_NAME: csrf_token, "title": "Dune"},
+            )
+            assert resp.status_code == 200
+            assert resp.json()["title"] == "Dune"
+
             # No form
             resp = await client.post(
                 "/welcome", form={settings.CSRF_COOKIE_NAME: csrf_token}
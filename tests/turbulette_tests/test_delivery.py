@@ -0,0 +1,194 @@
+"""Test bounded delivery of subscription messages."""
+
+from asyncio import ensure_future, sleep
+
+import pytest
+from ariadne import SubscriptionType, make_executable_schema
+from starlette.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from turbulette.delivery import DeliveryQueue, QueueOverflow, WebSocketSender
+from turbulette.graphql_app import TurbuletteGraphQL
+from turbulette.pubsub import Broker
+
+pytestmark = pytest.mark.asyncio
+
+
+type_defs = """
+    type Query {
+        _: Boolean
+    }
+
+    type Subscription {
+        counter(to: Int!): Int!
+    }
+"""
+
+subscription = SubscriptionType()
+
+
+@subscription.source("counter")
+async def counter_source(*_, to):
+    for i in range(to):
+        yield i
+
+
+@subscription.field("counter")
+def resolve_counter(count, *_, **__):
+    return count
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+        self.close_code = None
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+
+async def test_drop_oldest():
+    queue = DeliveryQueue(2, "drop_oldest")
+    for i in range(4):
+        queue.put(i)
+    queue.put("control", droppable=False)
+    assert [await queue.get() for _ in range(3)] == [2, 3, "control"]
+    assert queue.dropped == 2
+
+
+async def test_coalesce():
+    queue = DeliveryQueue(3, "coalesce")
+    queue.put({"value": 0}, key="a")
+    queue.put({"value": 1}, key="a")
+    queue.put({"value": 0}, key="b")
+    # Messages are only coalesced once the queue is full
+    assert queue.coalesced == 0
+    queue.put({"value": 2}, key="a")
+    queue.put({"value": 3}, key="a")
+    queue.put({"value": 1}, key="b")
+    assert len(queue) == 3
+    assert [await queue.get() for _ in range(3)] == [
+        {"value": 0},
+        {"value": 3},
+        {"value": 1},
+    ]
+    assert queue.coalesced == 3
+    # Without a pending message with the same key, the oldest one is dropped
+    for value in range(4):
+        queue.put({"value": value}, key=value)
+    assert [await queue.get() for _ in range(3)] == [
+        {"value": 1},
+        {"value": 2},
+        {"value": 3},
+    ]
+    assert queue.dropped == 1
+
+
+async def test_disconnect():
+    queue = DeliveryQueue(1, "disconnect")
+    queue.put(0)
+    with pytest.raises(QueueOverflow):
+        queue.put(1)
+    with pytest.raises(QueueOverflow):
+        await queue.get()
+    assert queue.dropped == 1
+
+
+async def test_websocket_sender_disconnect():
+    websocket = FakeWebSocket()
+    sender = WebSocketSender(websocket, 1, "disconnect")
+    sender.send({"type": "ka"})
+    sender.send({"type": "data", "id": "1", "payload": {}})
+    sender.send({"type": "data", "id": "1", "payload": {}})
+    await sender.run()
+    await sleep(0)
+    assert websocket.close_code == 1013
+    assert websocket.sent == []
+    assert sender.stats()["dropped"] == 1
+
+
+async def test_websocket_sender_closed():
+    websocket = FakeWebSocket()
+
+    async def send_json(data):
+        raise RuntimeError('Cannot call "send" once a close message has been sent.')
+
+    websocket.send_json = send_json
+    sender = WebSocketSender(websocket)
+    sender.send({"type": "ka"})
+    # The sender stops without raising
+    await sender.run()
+
+
+async def test_websocket_sender_metrics():
+    websocket = FakeWebSocket()
+    sender = WebSocketSender(websocket, 1, "coalesce")
+    for i in range(3):
+        sender.send({"type": "data", "id": "1", "payload": {"data": i}})
+    sender.send({"type": "complete", "id": "1"})
+    running = ensure_future(sender.run())
+    await sleep(0.01)
+    sender.queue.close(QueueOverflow())
+    await running
+    assert websocket.sent == [
+        {"type": "data", "id": "1", "payload": {"data": 2}},
+        {"type": "complete", "id": "1"},
+    ]
+    stats = sender.stats()
+    assert stats["sent"] == 2
+    assert stats["coalesced"] == 2
+    assert stats["max_latency"] > 0
+
+
+async def test_broker_subscriber_overflow():
+    broker = Broker("memory://", queue_size=2, overflow_policy="disconnect")
+    async with broker.subscribe("events") as subscriber:
+        for i in range(3):
+            await broker.publish("events", i)
+        with pytest.raises(QueueOverflow):
+            await subscriber.get()
+
+
+async def test_broker_subscriber_coalesce():
+    broker = Broker("memory://", queue_size=2, overflow_policy="coalesce")
+    async with broker.subscribe("events", key=lambda msg: msg["id"]) as subscriber:
+        for i in range(3):
+            await broker.publish("events", {"id": 1, "value": i})
+        await broker.publish("events", {"id": 2, "value": 0})
+        assert await subscriber.get() == {"id": 1, "value": 2}
+        assert await subscriber.get() == {"id": 2, "value": 0}
+
+
+def test_websocket_subscription():
+    schema = make_executable_schema(type_defs, subscription)
+    app = TurbuletteGraphQL(schema, subscription_queue_size=10)
+    client = TestClient(app)
+    with client.websocket_connect("/", "graphql-ws") as websocket:
+        websocket.send_json({"type": "connection_init"})
+        assert websocket.receive_json()["type"] == "connection_ack"
+        websocket.send_json(
+            {
+                "type": "start",
+                "id": "1",
+                "payload": {"query": "subscription { counter(to: 3) }"},
+            }
+        )
+        messages = [websocket.receive_json() for _ in range(4)]
+        assert [msg["payload"]["data"]["counter"] for msg in messages[:3]] == [
+            0,
+            1,
+            2,
+        ]
+        assert messages[3] == {"type": "complete", "id": "1"}
+        stats = app.subscription_stats()
+        assert len(stats) == 1
+        # The ack and the first results are already sent
+        assert stats[0]["sent"] >= 3
+        assert stats[0]["max_latency"] >= 0
+        websocket.send_json({"type": "connection_terminate"})
+        with pytest.raises(WebSocketDisconnect):
+            websocket.receive_json()
+    assert app.subscription_stats() == []
@@ -0,0 +1,48 @@
+import pytest
+from async_asgi_testclient import TestClient
+from graphql import build_schema
+
+from turbulette.errors import error_formatter
+from turbulette.extensions import PolicyExtension
+
+pytestmark = pytest.mark.asyncio
+
+QUERY = "query typename { __typename }"
+
+
+async def test_document_cache(tester):
+    from turbulette.graphql_app import TurbuletteGraphQL
+
+    app = TurbuletteGraphQL(
+        tester.schema,
+        extensions=[PolicyExtension],
+        error_formatter=error_formatter,
+        document_cache_size=2,
+    )
+    client = TestClient(app)
+
+    for _ in range(3):
+        resp = await client.post("/", json={"query": QUERY})
+        assert resp.json() == {"data": {"__typename": "Query"}}
+    assert (app.document_cache.hits, app.document_cache.misses) == (2, 1)
+
+    # Invalid documents are not cached
+    for _ in range(2):
+        resp = await client.post("/", json={"query": "query { unknownField }"})
+        assert resp.status_code == 400
+    assert len(app.document_cache.documents) == 1
+
+    # Documents are dropped when the schema changes
+    app.schema = build_schema("type Query { hello: String }")
+    resp = await client.post("/", json={"query": QUERY})
+    assert resp.json() == {"data": {"__typename": "Query"}}
+    assert app.document_cache.stats()["hits"] == 0
+
+
+async def test_document_cache_disabled(tester):
+    from turbulette.graphql_app import TurbuletteGraphQL
+
+    app = TurbuletteGraphQL(tester.schema, extensions=[PolicyExtension])
+    assert app.document_cache is None
+    resp = await TestClient(app).post("/", json={"query": QUERY})
+    assert resp.json() == {"data": {"__typename": "Query"}}
@@ -0,0 +1,209 @@
+"""Test incremental delivery with `@defer` and `@stream`."""
+
+import json
+import sys
+
+import pytest
+from ariadne import QueryType, make_executable_schema
+from starlette.testclient import TestClient
+
+from turbulette.graphql_app import TurbuletteGraphQL
+from turbulette.incremental import MULTIPART_CONTENT_TYPE
+
+type_defs = """
+    directive @defer(label: String, if: Boolean! = true) on FRAGMENT_SPREAD | INLINE_FRAGMENT
+    directive @stream(label: String, initialCount: Int! = 0, if: Boolean! = true) on FIELD
+
+    type Query {
+        hello: String!
+        slow: String
+        broken: String
+        numbers(count: Int!): [Int!]!
+        lazyNumbers(count: Int!): [Int!]!
+    }
+"""
+
+query = QueryType()
+
+
+@query.field("hello")
+def resolve_hello(*_):
+    return "world"
+
+
+@query.field("slow")
+async def resolve_slow(*_):
+    return "done"
+
+
+@query.field("broken")
+def resolve_broken(*_):
+    raise ValueError("Broken")
+
+
+@query.field("numbers")
+def resolve_numbers(*_, count):
+    return range(count)
+
+
+@query.field("lazyNumbers")
+async def resolve_lazy_numbers(*_, count):
+    async def numbers():
+        for i in range(count):
+            yield i
+
+    return numbers()
+
+
+schema = make_executable_schema(type_defs, query)
+app = TurbuletteGraphQL(schema, stream_chunk_size=2)
+client = TestClient(app)
+
+
+def post(query_: str, multipart: bool = True, variables: dict = None):
+    headers = {"Accept": "multipart/mixed, application/json"} if multipart else {}
+    return client.post(
+        "/", json={"query": query_, "variables": variables or {}}, headers=headers
+    )
+
+
+def parse_multipart(body: str):
+    assert body.endswith("\r\n-----\r\n")
+    parts = body[: -len("\r\n-----\r\n")].split("\r\n---\r\n")[1:]
+    return [json.loads(part.split("\r\n\r\n", 1)[1]) for part in parts]
+
+
+async def payloads(query_: str, app_=app, request=None, extensions=()):
+    _, _, parts = await app_.execute_incremental_query(
+        {"query": query_}, {"request": request}, list(extensions), None
+    )
+    body = b""
+    async for chunk in parts:
+        body += chunk
+    return parse_multipart(body.decode())
+
+
+@pytest.mark.asyncio
+async def test_defer():
+    result = await payloads('{ hello ... @defer(label: "later") { slow broken } }')
+    assert result[0] == {"data": {"hello": "world"}, "hasNext": True}
+    entry = result[1]["incremental"][0]
+    assert entry["data"] == {"slow": "done", "broken": None}
+    assert entry["path"] == []
+    assert entry["label"] == "later"
+    assert entry["errors"][0]["message"] == "Broken"
+    assert result[1]["hasNext"] is False
+
+
+@pytest.mark.asyncio
+async def test_defer_fragment_spread():
+    result = await payloads(
+        "{ hello ...Later @defer } fragment Later on Query { slow }"
+    )
+    assert result == [
+        {"data": {"hello": "world"}, "hasNext": True},
+        {"incremental": [{"data": {"slow": "done"}, "path": []}], "hasNext": False},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream():
+    result = await payloads("{ numbers(count: 5) @stream(initialCount: 2) }")
+    assert result == [
+        {"data": {"numbers": [0, 1]}, "hasNext": True},
+        {"incremental": [{"items": [2, 3], "path": ["numbers", 2]}], "hasNext": True},
+        {"incremental": [{"items": [4], "path": ["numbers", 4]}], "hasNext": False},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_async_iterator():
+    result = await payloads("{ lazyNumbers(count: 3) @stream(initialCount: 1) }")
+    assert result == [
+        {"data": {"lazyNumbers": [0]}, "hasNext": True},
+        {
+            "incremental": [{"items": [1, 2], "path": ["lazyNumbers", 1]}],
+            "hasNext": False,
+        },
+    ]
+
+
+policy_type_defs = """
+    directive @defer(label: String, if: Boolean! = true) on FRAGMENT_SPREAD | INLINE_FRAGMENT
+    directive @policy on FIELD_DEFINITION
+
+    type Query {
+        hello: String!
+        secret: String @policy
+    }
+"""
+
+
+@pytest.mark.asyncio
+async def test_defer_policy(tester, create_user, get_user_tokens):
+    from turbulette.apps.auth.directives import PolicyDirective
+    from turbulette.conf import settings
+    from turbulette.errors import ErrorCode, error_formatter
+    from turbulette.extensions import PolicyExtension
+    from turbulette.test.tester import TestRequest
+
+    policy_query = QueryType()
+    policy_query.set_field("hello", resolve_hello)
+
+    @policy_query.field("secret")
+    async def resolve_secret(*_):
+        return "s3cr3t"
+
+    policy_app = TurbuletteGraphQL(
+        make_executable_schema(
+            policy_type_defs, policy_query, directives={"policy": PolicyDirective}
+        ),
+        error_formatter=error_formatter,
+    )
+    result = await payloads(
+        "{ hello ... @defer { secret } }",
+        policy_app,
+        TestRequest(jwt=get_user_tokens[0]),
+        [PolicyExtension],
+    )
+    assert result[0] == {"data": {"hello": "world"}, "hasNext": True}
+    # Errors added by deferred resolvers are reported with their payload
+    assert result[1]["incremental"] == [{"data": {"secret": None}, "path": []}]
+    errors = result[1]["extensions"][settings.TURBULETTE_ERROR_KEY]
+    assert ErrorCode.QUERY_NOT_ALLOWED.name in errors
+    assert result[1]["hasNext"] is False
+
+
+def test_disabled_directives():
+    response = post(
+        "query ($defer: Boolean!) {"
+        " hello ... @defer(if: $defer) { slow } numbers(count: 3) @stream(if: false)"
+        "}",
+        variables={"defer": False},
+    )
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {
+        "data": {"hello": "world", "slow": "done", "numbers": [0, 1, 2]}
+    }
+
+
+def test_no_multipart():
+    response = post(
+        "{ hello ... @defer { slow } numbers(count: 3) @stream }", multipart=False
+    )
+    assert response.json() == {
+        "data": {"hello": "world", "slow": "done", "numbers": [0, 1, 2]}
+    }
+
+
+@pytest.mark.skipif(
+    sys.version_info >= (3, 11),
+    reason="Starlette 0.13 streaming responses require Python < 3.11",
+)
+def test_multipart_response():
+    response = post("{ hello numbers(count: 3) @stream(initialCount: 1) }")
+    assert response.headers["content-type"] == MULTIPART_CONTENT_TYPE
+    assert parse_multipart(response.content.decode()) == [
+        {"data": {"hello": "world", "numbers": [0]}, "hasNext": True},
+        {"incremental": [{"items": [1, 2], "path": ["numbers", 1]}], "hasNext": False},
+    ]
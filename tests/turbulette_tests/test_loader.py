@@ -0,0 +1,93 @@
+"""Test model loaders."""
+
+from asyncio import gather
+from datetime import datetime
+
+import pytest
+
+from .constants import CUSTOMER_USERNAME
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+async def books(turbulette_setup):
+    from tests.app_1.models import Book
+
+    return [
+        await Book.create(
+            title=f"Book {i}",
+            author="Author",
+            publication_date=datetime.now(),
+            borrowings=0,
+            price_bought=1.0,
+        )
+        for i in range(3)
+    ]
+
+
+def count_batches(loader):
+    batches = []
+    batch_load = loader.batch_load
+
+    async def counting_batch_load(keys):
+        batches.append(keys)
+        return await batch_load(keys)
+
+    loader.batch_load = counting_batch_load
+    return batches
+
+
+async def test_model_loader_batching(books):
+    from tests.app_1.models import Book
+    from turbulette.db import get_loader
+
+    context = {}
+    loader = get_loader(context, Book)
+    assert get_loader(context, Book) is loader
+    batches = count_batches(loader)
+
+    ids = [book.id for book in books]
+    loaded = await gather(*(loader.load(id_) for id_ in [*ids, -1]))
+    assert [book.id for book in loaded[:-1]] == ids
+    assert loaded[-1] is None
+    assert batches == [[*ids, -1]]
+
+    # Loaded rows are cached for the rest of the operation
+    assert (await loader.load(ids[0])) is loaded[0]
+    assert await loader.load_many(ids) == loaded[:-1]
+    assert len(batches) == 1
+
+    loader.clear(ids[0])
+    await loader.load(ids[0])
+    assert batches[-1] == [ids[0]]
+
+
+async def test_model_loader_column(create_user):
+    from tests.app_1.models import BaseUser
+    from turbulette.apps.auth.models import RolePermission
+    from turbulette.db import ModelLoader, get_loader
+
+    user = await get_loader({}, BaseUser, "username").load(CUSTOMER_USERNAME)
+    assert user.username == CUSTOMER_USERNAME
+
+    with pytest.raises(ValueError):
+        ModelLoader(RolePermission)
+
+
+async def test_loader_errors_are_not_cached():
+    from turbulette.db import DataLoader
+
+    calls = []
+
+    async def batch_load(keys):
+        calls.append(keys)
+        if len(calls) == 1:
+            raise RuntimeError
+        return keys
+
+    loader = DataLoader(batch_load)
+    with pytest.raises(RuntimeError):
+        await loader.load(1)
+    assert await loader.load(1) == 1
+    assert len(calls) == 2
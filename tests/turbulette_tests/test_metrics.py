@@ -0,0 +1,121 @@
+import pytest
+from async_asgi_testclient import TestClient
+
+from turbulette.errors import ErrorCode, error_formatter
+from turbulette.extensions import GRAPHQL_ERROR, MetricsExtension, PolicyExtension
+from turbulette.metrics import OTHER_LABEL, Counter, Histogram, Metric, Metrics, metrics
+
+from .queries import mutation_borrow_book, query_comics
+
+pytestmark = pytest.mark.asyncio
+
+QUERY = "query typename { __typename }"
+
+
+@pytest.fixture
+def restore_metrics():
+    """Restore the global metrics set up by the test."""
+    lazy_class, obj, initialized = type(metrics), metrics.obj, metrics.initialized
+    yield
+    object.__setattr__(metrics, "__class__", lazy_class)
+    metrics.obj, metrics.__initialized__ = obj, initialized
+
+
+@pytest.fixture
+def metrics_client(tester, restore_metrics):
+    from turbulette.graphql_app import TurbuletteGraphQL
+
+    metrics.__setup__(Metrics())
+    app = TurbuletteGraphQL(
+        tester.schema,
+        extensions=[PolicyExtension, MetricsExtension],
+        error_formatter=error_formatter,
+    )
+    return TestClient(app)
+
+
+def test_metric_samples_required():
+    with pytest.raises(TypeError):
+        Metric("requests", "Requests.", (), 1)
+
+
+def test_histogram():
+    histogram = Histogram("duration", "Duration.", ("name",), 2, buckets=(0.1, 1))
+    histogram.observe(("a",), 0.05)
+    histogram.observe(("a",), 0.5)
+    histogram.observe(("a",), 5)
+    histogram.observe(("b",), 1)
+    assert histogram.count(("a",)) == 3
+    assert histogram.render().splitlines() == [
+        "# HELP duration Duration.",
+        "# TYPE duration histogram",
+        'duration_bucket{name="a",le="0.1"} 1',
+        'duration_bucket{name="a",le="1"} 2',
+        'duration_bucket{name="a",le="+Inf"} 3',
+        'duration_sum{name="a"} 5.55',
+        'duration_count{name="a"} 3',
+        'duration_bucket{name="b",le="0.1"} 0',
+        'duration_bucket{name="b",le="1"} 1',
+        'duration_bucket{name="b",le="+Inf"} 1',
+        'duration_sum{name="b"} 1',
+        'duration_count{name="b"} 1',
+    ]
+
+
+def test_counter_max_series():
+    counter = Counter("requests_total", "Requests.", ("name",), 2)
+    for name in ("a", "b", "c", 'd"'):
+        counter.inc((name,))
+    counter.inc(("a",), 2)
+    assert counter.get(("a",)) == 3
+    assert counter.get((OTHER_LABEL,)) == 2
+    assert 'requests_total{name="__other__"} 2' in counter.render()
+
+
+async def test_metrics_extension(metrics_client):
+    for _ in range(2):
+        resp = await metrics_client.post("/", json={"query": QUERY})
+        assert resp.json() == {"data": {"__typename": "Query"}}
+    assert metrics.operation_duration.count(("typename", "query")) == 2
+    # Default resolvers are not measured
+    assert not metrics.resolver_duration.series
+
+    resp = await metrics_client.post("/", json={"query": query_comics})
+    assert resp.status_code == 200
+    assert metrics.resolver_duration.count(("Query", "comics")) == 1
+    assert not metrics.resolver_duration.count(("Comic", "author"))
+
+    resp = await metrics_client.post("/", json={"query": "query { unknownField }"})
+    assert resp.status_code == 400
+    assert metrics.operation_duration.count(("", "")) == 1
+    assert metrics.errors.get((GRAPHQL_ERROR,)) == 1
+    assert "graphql_operation_duration_seconds_count" in metrics.render()
+
+
+async def test_metrics_policy_denials(
+    tester, create_book, create_staff_user, get_staff_tokens, metrics_client
+):
+    from turbulette.conf import settings
+
+    resp = await metrics_client.post(
+        "/",
+        json={
+            "query": mutation_borrow_book,
+            "variables": {"id": create_book.id},
+            "operationName": "borrowBook",
+        },
+        headers={"authorization": f"{settings.JWT_PREFIX} {get_staff_tokens[0]}"},
+    )
+    assert resp.status_code == 200
+    code = ErrorCode.QUERY_NOT_ALLOWED.name
+    assert metrics.errors.get((code,)) == 1
+    assert metrics.policy_denials.get(("borrowBook", code)) == 1
+    assert metrics.resolver_duration.count(("Mutation", "borrowBook")) == 1
+
+
+async def test_metrics_sampling(metrics_client):
+    metrics.__setup__(Metrics(sample_rate=0))
+    resp = await metrics_client.post("/", json={"query": query_comics})
+    assert resp.status_code == 200
+    assert metrics.operation_duration.count(("comics", "query")) == 1
+    assert not metrics.resolver_duration.series
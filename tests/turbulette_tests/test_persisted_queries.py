@@ -0,0 +1,147 @@
+import json
+
+import pytest
+from ariadne import SubscriptionType, make_executable_schema
+from async_asgi_testclient import TestClient
+from starlette.testclient import TestClient as WebSocketTestClient
+
+from turbulette.errors import error_formatter
+from turbulette.extensions import PolicyExtension
+
+pytestmark = pytest.mark.asyncio
+
+QUERY = "query typename { __typename }"
+
+
+def graphql_app(schema, persisted_queries):
+    from turbulette.graphql_app import TurbuletteGraphQL
+
+    return TurbuletteGraphQL(
+        schema,
+        extensions=[PolicyExtension],
+        error_formatter=error_formatter,
+        persisted_queries=persisted_queries,
+    )
+
+
+def persisted_query(hash_, query=None):
+    data = {"extensions": {"persistedQuery": {"version": 1, "sha256Hash": hash_}}}
+    if query is not None:
+        data["query"] = query
+    return data
+
+
+async def test_automatic_persisted_queries(tester):
+    from turbulette.persisted_queries import PersistedQueries, query_hash
+
+    client = TestClient(graphql_app(tester.schema, PersistedQueries()))
+    hash_ = query_hash(QUERY)
+
+    # Unknown hash
+    resp = await client.post("/", json=persisted_query(hash_))
+    assert resp.status_code == 200
+    assert resp.json()["errors"][0]["extensions"]["code"] == "PERSISTED_QUERY_NOT_FOUND"
+
+    # Register the query
+    resp = await client.post("/", json=persisted_query(hash_, QUERY))
+    assert resp.json() == {"data": {"__typename": "Query"}}
+
+    # Send the hash only
+    resp = await client.post("/", json=persisted_query(hash_))
+    assert resp.json() == {"data": {"__typename": "Query"}}
+
+    # Hash mismatch
+    resp = await client.post("/", json=persisted_query("0" * 64, QUERY))
+    assert resp.json()["errors"][0]["extensions"]["code"] == "PERSISTED_QUERY_ERROR"
+
+    # Regular queries still work
+    resp = await client.post("/", json={"query": QUERY})
+    assert resp.json() == {"data": {"__typename": "Query"}}
+
+
+async def test_persisted_queries_allow_list(tester, tmp_path):
+    from turbulette.persisted_queries import PersistedQueries, query_hash
+
+    other_query = "query other { __typename }"
+    allow_list = tmp_path / "queries.json"
+    allow_list.write_text(json.dumps([QUERY]))
+
+    persisted_queries = PersistedQueries(allow_list_only=True)
+    persisted_queries.load(allow_list.as_posix())
+    client = TestClient(graphql_app(tester.schema, persisted_queries))
+
+    resp = await client.post("/", json=persisted_query(query_hash(QUERY)))
+    assert resp.json() == {"data": {"__typename": "Query"}}
+
+    resp = await client.post("/", json={"query": QUERY})
+    assert resp.json() == {"data": {"__typename": "Query"}}
+
+    for data in (
+        {"query": other_query},
+        persisted_query(query_hash(other_query)),
+        persisted_query(query_hash(other_query), other_query),
+    ):
+        resp = await client.post("/", json=data)
+        assert (
+            resp.json()["errors"][0]["extensions"]["code"]
+            == "PERSISTED_QUERY_NOT_ALLOWED"
+        )
+
+    allow_list.write_text(json.dumps({"0" * 64: other_query}))
+    with pytest.raises(ValueError):
+        persisted_queries.load(allow_list.as_posix())
+
+
+subscription_type_defs = """
+    type Query {
+        _: Boolean
+    }
+
+    type Subscription {
+        counter: Int!
+    }
+"""
+
+
+def test_persisted_queries_websocket(tester):
+    from turbulette.persisted_queries import PersistedQueries, query_hash
+
+    subscription = SubscriptionType()
+
+    @subscription.source("counter")
+    async def counter_source(*_):
+        yield 1
+
+    @subscription.field("counter")
+    def resolve_counter(count, *_):
+        return count
+
+    allowed = "subscription counter { counter }"
+    persisted_queries = PersistedQueries(allow_list_only=True)
+    persisted_queries.allow_list[query_hash(allowed)] = allowed
+    app = graphql_app(
+        make_executable_schema(subscription_type_defs, subscription),
+        persisted_queries,
+    )
+
+    with WebSocketTestClient(app).websocket_connect("/", "graphql-ws") as websocket:
+        websocket.send_json({"type": "connection_init"})
+        assert websocket.receive_json()["type"] == "connection_ack"
+        for operation_id, payload in (
+            ("1", {"query": "subscription other { counter }"}),
+            ("2", persisted_query(query_hash(allowed))),
+        ):
+            websocket.send_json(
+                {"type": "start", "id": operation_id, "payload": payload}
+            )
+        message = websocket.receive_json()
+        assert message["type"] == "error"
+        assert message["id"] == "1"
+        assert message["payload"]["extensions"]["code"] == "PERSISTED_QUERY_NOT_ALLOWED"
+        message = websocket.receive_json()
+        assert message == {
+            "type": "data",
+            "id": "2",
+            "payload": {"data": {"counter": 1}},
+        }
+        websocket.send_json({"type": "connection_terminate"})
@@ -229,6 +229,113 @@ async def test_conditions(tester, create_book, create_staff_user):
         )
 
 
+async def test_policy_decisions_cache(
+    tester, create_staff_user, get_staff_tokens, monkeypatch
+):
+    from turbulette.apps.auth import decorators
+    from turbulette.conf.utils import settings_stub
+
+    calls = []
+
+    async def counting_authorized(claims, info):
+        calls.append((info.parent_type.name, info.field_name))
+        return await authorized(claims, info)
+
+    authorized = decorators.authorized
+    monkeypatch.setattr(decorators, "authorized", counting_authorized)
+
+    # `books` field, then `priceBought` and `borrowings` once for all books
+    resp = await tester.assert_query_success(
+        query=query_borrowings_price_bought,
+        jwt=get_staff_tokens[0],
+        op_name="books",
+    )
+    assert len(resp[1]["data"]["books"]["books"]) == 2
+    assert all(book["borrowings"] for book in resp[1]["data"]["books"]["books"])
+    assert len(calls) == 3
+
+    calls.clear()
+    with settings_stub(POLICY_CACHE_DECISIONS=False):
+        await tester.assert_query_success(
+            query=query_borrowings_price_bought,
+            jwt=get_staff_tokens[0],
+            op_name="books",
+        )
+    assert len(calls) == 5
+
+
+async def test_errors_are_request_scoped(
+    tester, create_user, get_user_tokens, create_staff_user, get_staff_tokens
+):
+    import asyncio
+
+    denied, allowed = await asyncio.gather(
+        tester.query(query_borrowings_price_bought, jwt=get_user_tokens[0]),
+        tester.query(query_borrowings_price_bought, jwt=get_staff_tokens[0]),
+    )
+
+    assert denied[1]["extensions"]["errors"][ErrorCode.FIELD_NOT_ALLOWED.name]
+    assert "extensions" not in allowed[1]
+
+
+async def test_add_error_outside_request(tester):
+    import contextvars
+
+    from turbulette.conf import settings
+    from turbulette.errors import add_error, get_errors
+
+    def add_errors():
+        add_error(ErrorCode.FIELD_NOT_ALLOWED, "borrowings")
+        add_error(ErrorCode.FIELD_NOT_ALLOWED, "borrowings")
+        add_error(ErrorCode.QUERY_NOT_ALLOWED)
+        return get_errors()
+
+    context = contextvars.copy_context()
+    errors = context.run(add_errors)[settings.TURBULETTE_ERROR_KEY]
+    assert errors[ErrorCode.FIELD_NOT_ALLOWED.name] == ["borrowings"]
+    assert errors[ErrorCode.QUERY_NOT_ALLOWED.name] == [
+        ErrorCode.QUERY_NOT_ALLOWED.value
+    ]
+
+
+async def test_role_permissions_invalidation(tester, create_user, create_staff_user):
+    from turbulette.apps.auth.core import RolePermissions
+    from turbulette.apps.auth.models import Permission, Role, RolePermission
+
+    store, other_store, lazy_store = (
+        RolePermissions(0),
+        RolePermissions(0),
+        RolePermissions(3600),
+    )
+    for store_ in (store, other_store, lazy_store):
+        assert await store_.get("customer") == frozenset([CUSTOMER_PERMISSION])
+    assert await store.get_many(["customer", "admin", "_staff"]) == frozenset(
+        [CUSTOMER_PERMISSION, "books:add"]
+    )
+    assert await store.get_many([]) == frozenset()
+
+    role = await Role.query.where(Role.name == "customer").gino.first()
+    permission = await Permission.create(key="book:read", name="Can read a book")
+    await RolePermission.create(role=role.id, permission=permission.id)
+
+    try:
+        # Permissions are cached until the version changes
+        assert await other_store.get("customer") == frozenset([CUSTOMER_PERMISSION])
+        await store.invalidate()
+        expected = frozenset([CUSTOMER_PERMISSION, "book:read"])
+        assert await store.get("customer") == expected
+        assert await store.get_many(["customer", "_staff"]) == expected
+        assert await other_store.get("customer") == expected
+        # Processes check the version at most every `check_interval` seconds
+        assert await lazy_store.get("customer") == frozenset([CUSTOMER_PERMISSION])
+    finally:
+        await RolePermission.delete.where(
+            RolePermission.permission == permission.id
+        ).gino.status()
+        await permission.delete()
+        await store.invalidate()
+
+
 def test_non_null():
     schema = gql(
         """
@@ -260,3 +367,43 @@ def test_non_null():
             snake_case_fallback_resolvers,
             directives={"policy": PolicyDirective},
         )
+
+
+def test_compile_policies():
+    import json
+
+    from turbulette.apps.auth.policy.policy import compile_policies
+
+    with open("tests/policies.json") as file:
+        index = compile_policies(json.load(file))
+
+    # Rules are indexed by (type, field)
+    assert ("mutation", "borrowBook") in index
+    assert ("book", "borrowings") in index
+    assert ("query", "unknown") not in index
+
+    rule = index[("mutation", "borrowBook")][0]
+    assert rule.policy.principals == (("perm", "book:borrow"),)
+    assert rule.allow.match("borrowBook")
+    assert rule.deny is None
+
+    # One rule per policy involved, in the policy schema order
+    rules = index[("book", "borrowings")]
+    assert len(rules) == 2
+    assert rules[0].policy.principals == (("staff", "staff"),)
+    assert dict(rules[0].policy.conditions)["is_claim_present"] == "iss"
+    assert rules[0].allow.match("books") and not rules[0].allow.match("comics")
+    assert rules[1].allow is None
+    assert rules[1].deny.match("book") and not rules[1].deny.match("comics")
+
+
+def test_root_matcher():
+    from turbulette.apps.auth.policy.policy import RootMatcher
+
+    assert RootMatcher().match("anything")
+    matcher = RootMatcher(["book*", "*comics", "library"])
+    assert matcher.match("books")
+    assert matcher.match("allcomics")
+    assert matcher.match("library")
+    assert not matcher.match("libraries")
+    assert not RootMatcher([]).match("books")
@@ -0,0 +1,188 @@
+"""Test the pub/sub broker."""
+
+from asyncio import StreamReader, StreamWriter, sleep, start_server, wait_for
+
+import pytest
+
+from turbulette.pubsub import Broker, PubSubError, _encode_command, _read_reply
+
+pytestmark = pytest.mark.asyncio
+
+
+class RESPServer:
+    """Minimal stand-in for a Redis server, implementing pub/sub commands."""
+
+    def __init__(self):
+        self.channels = {}
+        self.connections = set()
+        self.server = None
+
+    async def start(self) -> int:
+        self.server = await start_server(self.handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def drop_subscribers(self):
+        """Close connections of all subscribers."""
+        for writers in self.channels.values():
+            for writer in writers:
+                writer.close()
+        self.channels.clear()
+
+    def drop_connections(self):
+        """Close all client connections."""
+        for writer in self.connections:
+            writer.close()
+        self.connections.clear()
+        self.channels.clear()
+
+    async def handle(self, reader: StreamReader, writer: StreamWriter):
+        self.connections.add(writer)
+        try:
+            while True:
+                command, *args = await _read_reply(reader)
+                command = command.upper()
+                if command == "PUBLISH":
+                    subscribers = self.channels.get(args[0], set())
+                    for subscriber in subscribers:
+                        subscriber.write(_encode_command("message", *args))
+                    writer.write(b":%d\r\n" % len(subscribers))
+                elif command == "SUBSCRIBE":
+                    self.channels.setdefault(args[0], set()).add(writer)
+                    writer.write(_encode_command("subscribe", args[0]))
+                elif command == "UNSUBSCRIBE":
+                    self.channels.get(args[0], set()).discard(writer)
+                    writer.write(_encode_command("unsubscribe", args[0]))
+                else:
+                    writer.write(b"-ERR unknown command\r\n")
+        except ConnectionError:
+            writer.close()
+
+
+async def subscribers_count(server: RESPServer, channel: str, expected: int):
+    """Wait for the server to process (un)subscriptions."""
+    for _ in range(100):
+        if len(server.channels.get(channel, ())) == expected:
+            return
+        await sleep(0.01)
+    raise AssertionError(f"Expected {expected} subscribers on {channel}")
+
+
+@pytest.fixture
+async def resp_server():
+    server = RESPServer()
+    port = await server.start()
+    yield server, port
+    await server.stop()
+
+
+async def test_memory_broker():
+    broker = Broker("memory://")
+    await broker.connect()
+
+    async with broker.subscribe("books") as first, broker.subscribe("books") as second:
+        await broker.publish("books", {"title": "Dune"})
+        await broker.publish("authors", {"name": "Frank Herbert"})
+        assert await first.get() == {"title": "Dune"}
+        assert await second.get() == {"title": "Dune"}
+        assert len(broker.subscribers("books")) == 2
+
+    assert broker.subscribers("books") == []
+    await broker.disconnect()
+
+
+async def test_memory_broker_iteration():
+    broker = Broker("memory://")
+    async with broker.subscribe("numbers") as subscriber:
+        for i in range(3):
+            await broker.publish("numbers", i)
+        received = []
+        async for message in subscriber:
+            received.append(message)
+            if len(received) == 3:
+                break
+    assert received == [0, 1, 2]
+
+
+async def test_redis_broker(resp_server):
+    server, port = resp_server
+    publisher = Broker(f"redis://127.0.0.1:{port}")
+    subscriber_broker = Broker(f"redis://127.0.0.1:{port}")
+    await publisher.connect()
+    await subscriber_broker.connect()
+
+    async with subscriber_broker.subscribe("books") as subscriber:
+        await subscribers_count(server, "books", 1)
+        await publisher.publish("books", {"title": "Dune"})
+        assert await wait_for(subscriber.get(), 1) == {"title": "Dune"}
+
+    await subscribers_count(server, "books", 0)
+
+    await publisher.disconnect()
+    await subscriber_broker.disconnect()
+
+
+async def test_redis_broker_reconnect(resp_server):
+    server, port = resp_server
+    broker = Broker(f"redis://127.0.0.1:{port}")
+    broker.backend.reconnect_delay = 0.01
+    await broker.connect()
+
+    async with broker.subscribe("books") as subscriber:
+        await subscribers_count(server, "books", 1)
+        server.drop_subscribers()
+        # Subscriptions are restored on a new connection
+        await subscribers_count(server, "books", 1)
+        await broker.publish("books", {"title": "Dune"})
+        assert await wait_for(subscriber.get(), 1) == {"title": "Dune"}
+
+        # Subscribers get an error once reconnection fails
+        server.server.close()
+        server.drop_subscribers()
+        with pytest.raises(PubSubError):
+            await wait_for(subscriber.get(), 1)
+        assert not broker.is_connected
+
+    await broker.disconnect()
+
+
+async def test_redis_broker_publisher_reconnect(resp_server):
+    server, port = resp_server
+    broker = Broker(f"redis://127.0.0.1:{port}")
+    broker.backend.reconnect_delay = 0.01
+    with pytest.raises(PubSubError):
+        await broker.publish("books", {"title": "Dune"})
+    await broker.connect()
+
+    async with broker.subscribe("books") as subscriber:
+        await subscribers_count(server, "books", 1)
+        server.drop_connections()
+        await subscribers_count(server, "books", 1)
+        # The message is published on a new connection
+        await broker.publish("books", {"title": "Dune"})
+        assert await wait_for(subscriber.get(), 1) == {"title": "Dune"}
+
+    await broker.disconnect()
+
+
+async def test_redis_broker_invalid_message(resp_server):
+    server, port = resp_server
+    broker = Broker(f"redis://127.0.0.1:{port}")
+    await broker.connect()
+
+    async with broker.subscribe("books") as subscriber:
+        await subscribers_count(server, "books", 1)
+        await broker.backend.publish("books", "not JSON")
+        # The listener keeps delivering messages
+        await broker.publish("books", {"title": "Dune"})
+        assert await wait_for(subscriber.get(), 1) == {"title": "Dune"}
+
+    await broker.disconnect()
+
+
+async def test_unsupported_backend():
+    with pytest.raises(ValueError):
+        Broker("kafka://localhost")
@@ -0,0 +1,62 @@
+"""Test JSON serializers."""
+
+import json
+from datetime import date, datetime, timezone
+
+import pytest
+from ariadne import make_executable_schema
+from starlette.testclient import TestClient
+
+from turbulette.apps.base.resolvers.root_types import serialize_date, serialize_datetime
+from turbulette.conf.exceptions import ImproperlyConfigured
+from turbulette.graphql_app import TurbuletteGraphQL
+from turbulette.serializers import get_serializer, json_dumps
+
+CONTENT = {
+    "datetime": datetime(2021, 2, 3, 4, 5, 6, 7, tzinfo=timezone.utc),
+    "naive": datetime(2021, 2, 3, 4, 5, 6),
+    "date": date(2021, 2, 3),
+    "text": "café",
+    "list": [1, 2.5, None, True],
+}
+
+
+def tagged_dumps(content):
+    return json.dumps({"tagged": content}).encode("utf-8")
+
+
+def check_dates(encoded: bytes):
+    data = json.loads(encoded)
+    assert data["datetime"] == serialize_datetime(CONTENT["datetime"])
+    assert data["naive"] == serialize_datetime(CONTENT["naive"])
+    assert data["date"] == serialize_date(CONTENT["date"])
+    assert data["text"] == "café"
+    assert data["list"] == [1, 2.5, None, True]
+
+
+def test_json_serializer():
+    check_dates(get_serializer("json")(CONTENT))
+    with pytest.raises(TypeError):
+        json_dumps({"set": {1}})
+
+
+def test_orjson_serializer():
+    pytest.importorskip("orjson")
+    check_dates(get_serializer("orjson")(CONTENT))
+    assert get_serializer("auto") is get_serializer("orjson")
+
+
+def test_dotted_path_serializer():
+    serializer = get_serializer("tests.turbulette_tests.test_serializers.tagged_dumps")
+    assert serializer is tagged_dumps
+    with pytest.raises(ImproperlyConfigured):
+        get_serializer("tests.turbulette_tests.test_serializers.unknown")
+    with pytest.raises(ImproperlyConfigured):
+        get_serializer("unknown")
+
+
+def test_graphql_route_serializer():
+    schema = make_executable_schema("type Query { hello: String }")
+    app = TurbuletteGraphQL(schema, json_serializer=tagged_dumps)
+    response = TestClient(app).post("/", json={"query": "{ hello }"})
+    assert response.json() == {"tagged": {"data": {"hello": None}}}
@@ -0,0 +1,123 @@
+import pytest
+from async_asgi_testclient import TestClient
+
+from turbulette import conf
+from turbulette.errors import error_formatter
+from turbulette.extensions import PolicyExtension, TracingExtension
+from turbulette.tracing import (
+    DB,
+    OPERATION,
+    RESOLVER,
+    SpanExporter,
+    Tracer,
+    activate_span,
+    deactivate_span,
+    trace_database,
+    tracer,
+)
+
+from .queries import query_book
+
+pytestmark = pytest.mark.asyncio
+
+QUERY = "query comics { comics { comics { title } } }"
+
+
+class ListExporter(SpanExporter):
+    def __init__(self):
+        self.traces = []
+
+    def export(self, trace):
+        self.traces.append(trace)
+
+
+class FailingExporter(SpanExporter):
+    def export(self, trace):
+        raise RuntimeError("Collector is down")
+
+
+@pytest.fixture
+def restore_tracer():
+    """Restore the global tracer set up by the test."""
+    lazy_class, obj, initialized = type(tracer), tracer.obj, tracer.initialized
+    yield
+    object.__setattr__(tracer, "__class__", lazy_class)
+    tracer.obj, tracer.__initialized__ = obj, initialized
+
+
+@pytest.fixture
+def tracing_client(tester, restore_tracer):
+    from turbulette.graphql_app import TurbuletteGraphQL
+
+    engine = conf.db.bind
+    connection_cls = engine.connection_cls
+    trace_database(engine)
+    app = TurbuletteGraphQL(
+        tester.schema,
+        extensions=[PolicyExtension, TracingExtension],
+        error_formatter=error_formatter,
+    )
+    yield TestClient(app)
+    engine.connection_cls = connection_cls
+
+
+async def test_tracing(tester, create_book, tracing_client):
+    exporter = ListExporter()
+    tracer.__setup__(Tracer(exporters=[FailingExporter(), exporter]))
+
+    resp = await tracing_client.post(
+        "/", json={"query": query_book, "variables": {"id": create_book.id}}
+    )
+    assert resp.json()["data"]["book"]["book"]["title"] == create_book.title
+    assert exporter.traces == tracer.traces()
+    trace = tracer.traces()[0]
+    root, resolver, db = (
+        next(span for span in trace.spans if span.kind == kind)
+        for kind in (OPERATION, RESOLVER, DB)
+    )
+    assert len(trace.spans) == 3
+    assert root.name == "query book"
+    assert resolver.name == "Query.book"
+    assert resolver.parent is root
+    assert db.parent is resolver
+    assert "SELECT" in db.attributes["db.statement"]
+    assert root.duration >= resolver.duration >= db.duration > 0
+
+    otlp = trace.to_otlp()["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert {span["traceId"] for span in otlp} == {trace.trace_id}
+    assert otlp[0]["name"] == "query book"
+    assert "parentSpanId" not in otlp[0]
+
+
+async def test_tracing_slow_resolvers(tracing_client):
+    tracer.__setup__(Tracer(slow_resolver_threshold=10, buffer_size=2))
+    for _ in range(3):
+        resp = await tracing_client.post("/", json={"query": QUERY})
+        assert resp.status_code == 200
+    # Fast resolvers are left out of traces
+    assert [len(trace.spans) for trace in tracer.traces()] == [1, 1]
+
+    resp = await tracing_client.post("/", json={"query": "query { unknownField }"})
+    assert resp.status_code == 400
+    root = tracer.traces()[-1].root
+    assert root.name == "graphql"
+    assert "unknownField" in root.error
+
+
+async def test_tracing_sampling(tracing_client):
+    tracer.__setup__(Tracer(sample_rate=0))
+    resp = await tracing_client.post("/", json={"query": QUERY})
+    assert resp.status_code == 200
+    assert not tracer.traces()
+
+
+async def test_tracing_one(tester, tracing_client):
+    trace = Tracer().start_trace("one")
+    token = activate_span(trace.root)
+    try:
+        assert await conf.db.one("SELECT 1") == (1,)
+        assert await conf.db.one_or_none("SELECT 2") == (2,)
+    finally:
+        deactivate_span(token)
+    statements = [span.attributes["db.statement"] for span in trace.spans[1:]]
+    assert statements == ["SELECT 1", "SELECT 2"]
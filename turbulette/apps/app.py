@@ -1,13 +1,14 @@
 """Base classes to manage Turbulette apps."""
 
+import sys
 from importlib import import_module
 from importlib.util import find_spec
 from inspect import getmembers, isclass
-from os import sep
 from pathlib import Path
-from typing import Dict, List, Type
+from typing import Dict, List, Optional, Tuple, Type
 
 from ariadne import SchemaDirectiveVisitor, load_schema_from_path
+from ariadne.load_schema import walk_graphql_files
 from pydantic import BaseModel
 
 from turbulette.validation.pyd_model import GraphQLModel
@@ -21,6 +22,13 @@ from .constants import (
     PACKAGE_RESOLVERS,
 )
 from .exceptions import TurbuletteAppError
+from .startup import (
+    LazyResolver,
+    ResolversCache,
+    StartupProfile,
+    diff_root_fields,
+    snapshot_root_fields,
+)
 
 
 def _star_import(module_path: str):
@@ -97,7 +105,27 @@ class TurbuletteApp:
         self.pydantic_module = pydantic_module
         self.ready = False
 
-    def load_resolvers(self) -> None:
+    def discover_resolvers(self) -> Tuple[List[str], List[Path]]:
+        """Find resolver modules under the `resolvers` package.
+
+        Returns:
+            Tuple[List[str], List[Path]]: Module names, and the files and folders
+                they were found in
+        """
+        resolvers_path = self.package_path / self.resolvers_package
+        files = sorted(resolvers_path.rglob("*.py"))
+        modules = []
+        for file in files:
+            parts = file.relative_to(self.package_path).with_suffix("").parts
+            if parts[-1] == "__init__":
+                parts = parts[:-1]
+            modules.append(".".join((self.package_name, *parts)))
+        folders = {resolvers_path, *(file.parent for file in files)}
+        return modules, sorted(folders) + files
+
+    def load_resolvers(
+        self, cache: Optional[ResolversCache] = None, lazy: bool = False
+    ) -> None:
         """Load app resolvers.
 
         This assumes that all python modules under the `resolvers`
@@ -106,20 +134,38 @@ class TurbuletteApp:
         unnecessary imports at startup.
 
         Resolvers defined outside the `resolvers` package won't be loaded
+
+        Args:
+            cache (ResolversCache, optional): Cache of resolver modules,
+                used instead of walking the `resolvers` package when it's up to date
+            lazy (bool, optional): With an up to date cache, import resolver
+                modules on the first call of one of their root fields. Modules
+                not binding root fields are still imported at startup, as they
+                may register things as a side effect (like policy conditions).
+                Side effects of modules binding root fields only happen
+                on first use. Defaults to False.
         """
-        resolver_modules = [
-            m.as_posix()[:-3]
-            .replace(sep, ".")
-            .split(f"{self.package_name}.{self.resolvers_package}.")[1]
-            for m in (self.package_path / f"{self.resolvers_package}").rglob("*.py")
-        ]
-
-        if len(resolver_modules) > 0:
-            for module in resolver_modules:
-                # Relative import
-                import_module(
-                    f".{module}", f"{self.package_name}.{self.resolvers_package}"
-                )
+        modules = cache.get(self.package_name) if cache is not None else None
+        if modules is not None:
+            for module, fields in modules.items():
+                if module in sys.modules:
+                    continue
+                if lazy and fields:
+                    LazyResolver.bind(module, fields)
+                else:
+                    import_module(module)
+            return
+
+        module_names, paths = self.discover_resolvers()
+        modules, complete = {}, True
+        for module in module_names:
+            # Fields bound by already imported modules cannot be recorded
+            complete = complete and module not in sys.modules
+            before = snapshot_root_fields()
+            import_module(module)
+            modules[module] = diff_root_fields(before)
+        if cache is not None and complete:
+            cache.set(self.package_name, paths, modules)
 
     def load_models(self) -> None:
         """Load app GINO models."""
@@ -146,25 +192,55 @@ class TurbuletteApp:
                 ):
                     self.directives[member.name] = member
 
-    def load_schema(self) -> None:
+    def load_schema(self, validate: bool = True) -> None:
         """Load GraphQL schema.
 
         Only GraphQL files under the `graphql` folder will be loaded.
+
+        Args:
+            validate (bool, optional): Parse each file to report syntax errors.
+                Can be disabled when the schema comes from an up to date snapshot.
+                Defaults to True.
         """
         if (self.package_path / self.schema_folder).is_dir() and self.schema is None:
-            type_defs = [
-                load_schema_from_path(
-                    str((self.package_path / f"{self.schema_folder}").resolve())
-                )
-            ]
+            path = str((self.package_path / f"{self.schema_folder}").resolve())
+            if validate:
+                type_defs = [load_schema_from_path(path)]
+            else:
+                # Same as `load_schema_from_path`, without parsing
+                type_defs = [
+                    "\n".join(
+                        Path(file).read_text()
+                        for file in sorted(walk_graphql_files(path))
+                    )
+                ]
             if type_defs:
                 self.schema = [*type_defs]
 
-    def load_graphql_ressources(self) -> None:
-        """Load all needed resources to enable GraphQL queries."""
-        self.load_schema()
-        self.load_directives()
-        self.load_resolvers()
+    def load_graphql_ressources(
+        self,
+        profile: Optional[StartupProfile] = None,
+        cache: Optional[ResolversCache] = None,
+        lazy: bool = False,
+        validate_schema: bool = True,
+    ) -> None:
+        """Load all needed resources to enable GraphQL queries.
+
+        Args:
+            profile (StartupProfile, optional): Record the time spent in each phase
+            cache (ResolversCache, optional): Cache of resolver modules
+            lazy (bool, optional): Import resolver modules on first use.
+                Defaults to False.
+            validate_schema (bool, optional): Parse GraphQL files when loading them.
+                Defaults to True.
+        """
+        profile = profile or StartupProfile()
+        with profile.measure(self.label, "schema"):
+            self.load_schema(validate_schema)
+        with profile.measure(self.label, "directives"):
+            self.load_directives()
+        with profile.measure(self.label, "resolvers"):
+            self.load_resolvers(cache, lazy)
         self.ready = True
 
     def load_pydantic_models(self) -> Dict[str, Type[GraphQLModel]]:
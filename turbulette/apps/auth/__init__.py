@@ -9,6 +9,8 @@ from .core import (  # noqa
     TokenType,
     get_user_by_claims,
     get_password_hash,
+    get_password_hash_async,
+    role_permissions,
 )
 
 from .policy import policy  # noqa
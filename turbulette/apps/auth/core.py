@@ -1,8 +1,13 @@
 """Core authentication logic."""
 
+from asyncio import get_event_loop
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
 from enum import Enum
+from hashlib import sha256
 from importlib import import_module
-from typing import List, Tuple
+from time import monotonic
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
 from gino.declarative import Model
 from jwcrypto.jwe import JWE, InvalidJWEData
@@ -13,6 +18,7 @@ from python_jwt import generate_jwt, process_jwt, verify_jwt
 
 from turbulette.cache import cache
 from turbulette.conf import settings
+from turbulette.utils import LRUCache
 
 from .exceptions import (
     JWEDecryptionError,
@@ -45,6 +51,180 @@ if settings.JWT_ENCRYPT:
         **{key: str(value) for key, value in settings.ENCRYPTION_KEY.items()}
     )
 
+token_cache = LRUCache(settings.JWT_CACHE_SIZE)
+"""Verified tokens, used when the `JWT_CACHE_ENABLED` setting is `True`."""
+
+
+class HashingPool:
+    """Run password hashing in a bounded thread pool.
+
+    Hashing algorithms like bcrypt or argon2 are deliberately slow
+    and would block the event loop when called from a resolver.
+    They release the GIL, so a thread pool is enough to run them concurrently.
+    """
+
+    def __init__(self, max_workers: int):
+        """Initialize the pool.
+
+        Args:
+            max_workers (int): Maximum number of passwords hashed concurrently
+        """
+        self.max_workers = max_workers
+        self.pending = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of hashing tasks waiting for a free worker."""
+        return max(0, self.pending - self.max_workers)
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """Run `func` in the pool and wait for its result."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="turbulette-hashing"
+            )
+        self.pending += 1
+        try:
+            return await get_event_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+
+
+hashing_pool = HashingPool(settings.PASSWORD_HASHING_WORKERS)
+"""Pool used by `verify_password_async` and `get_password_hash_async`."""
+
+
+class RolePermissions:
+    """Two-tier store of the permission keys granted by each role.
+
+    Permission keys are kept in memory as frozensets, in front of the shared cache
+    (`CACHE` setting), so checking a permission does not need a cache round trip
+    for each role. Roles missing from the shared cache are loaded from the database.
+
+    All processes share a version counter stored in the cache: `invalidate`
+    bumps it, which discards both in-memory and shared entries.
+    Each process looks at the counter at most every `check_interval` seconds.
+    """
+
+    VERSION_KEY = "turbulette:auth:role_perms:version"
+
+    def __init__(self, check_interval: int):
+        """Initialize the store.
+
+        Args:
+            check_interval (int): Minimum delay in seconds between two checks
+                of the shared version counter
+        """
+        self.check_interval = check_interval
+        self._roles: Dict[str, FrozenSet[str]] = {}
+        # Union of the permission keys granted by a tuple of roles
+        self._unions = LRUCache(1024)
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+
+    def _key(self, role: str) -> str:
+        return f"turbulette:auth:role_perms:{self._version}:{role}"
+
+    async def _check_version(self):
+        now = monotonic()
+        if self._version is not None and now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        version = await cache.get(self.VERSION_KEY, 0)
+        if version != self._version:
+            self._roles.clear()
+            self._unions.clear()
+            self._version = version
+
+    async def get(self, role: str) -> FrozenSet[str]:
+        """Get the permission keys granted by a role.
+
+        Args:
+            role (str): Role name
+
+        Returns:
+            FrozenSet[str]: Permission keys
+        """
+        await self._check_version()
+        keys = self._roles.get(role)
+        if keys is None:
+            cached = await cache.get(self._key(role))
+            if cached is None:
+                cached = await _fetch_role_permissions(role)
+                await cache.set(self._key(role), cached)
+            keys = self._roles[role] = frozenset(cached)
+        return keys
+
+    async def get_many(self, roles: Iterable[str]) -> FrozenSet[str]:
+        """Get the permission keys granted by any of the given roles.
+
+        The union is computed once for each combination of roles,
+        so checking a permission is a single set lookup.
+        Roles starting with `_` (like the staff scope) are ignored.
+
+        Args:
+            roles (Iterable[str]): Role names, usually the `scopes` claim
+
+        Returns:
+            FrozenSet[str]: Permission keys
+        """
+        await self._check_version()
+        roles = tuple(roles)
+        keys = self._unions.get(roles)
+        if keys is None:
+            keys = frozenset().union(
+                *[await self.get(role) for role in roles if not role.startswith("_")]
+            )
+            self._unions.set(roles, keys)
+        return keys
+
+    async def prime(self, role: str, keys: Iterable[str]):
+        """Store the permission keys of a role, if they are not known yet.
+
+        Args:
+            role (str): Role name
+            keys (Iterable[str]): Permission keys granted by the role
+        """
+        await self._check_version()
+        if role not in self._roles:
+            self._roles[role] = frozenset(keys)
+            await cache.add(self._key(role), sorted(self._roles[role]))
+
+    async def invalidate(self) -> int:
+        """Discard permissions stored by all processes.
+
+        Call it after changing roles or permissions in the database.
+        Other processes will notice it within `check_interval` seconds.
+
+        Returns:
+            int: The new version
+        """
+        await cache.add(self.VERSION_KEY, 0)
+        self._version = await cache.incr(self.VERSION_KEY)
+        self._checked_at = monotonic()
+        self._roles.clear()
+        self._unions.clear()
+        return self._version
+
+
+role_permissions = RolePermissions(settings.ROLE_PERMISSIONS_CHECK_INTERVAL)
+"""Permission keys of roles, used by the `perm` policy principal."""
+
+
+async def _fetch_role_permissions(role: str) -> List[str]:
+    """Load the permission keys of a role from the database."""
+    # pylint: disable=import-outside-toplevel
+    from .models import Permission, Role, RolePermission
+
+    query = Role.join(RolePermission).join(Permission).select()
+    permissions = (
+        await query.gino.load(Permission.load())
+        .query.where(Role.name == role)
+        .gino.all()
+    )
+    return [permission.key for permission in permissions]
+
 
 class TokenType(Enum):
     """Type of JWTs available.
@@ -59,8 +239,9 @@ class TokenType(Enum):
 
 
 def _jwt_payload(user_id: str, scopes: list, is_staff: bool) -> dict:
-    if is_staff:
-        scopes.append(STAFF_SCOPE)
+    # Don't modify `scopes` in place, it may come from claims shared by the request
+    if is_staff and STAFF_SCOPE not in scopes:
+        scopes = [*scopes, STAFF_SCOPE]
     payload = {"sub": user_id, "scopes": scopes}
 
     if settings.JWT_AUDIENCE is not None:
@@ -150,10 +331,7 @@ async def _get_scopes(user: user_model) -> List[str]:
 
     # Cache role permissions if they are not there
     for role in role_perms:
-        cached_role = await cache.get(role.name)
-        if not cached_role:
-            permissions = [p.to_dict() for p in role.permissions]
-            await cache.set(role.name, permissions)
+        await role_permissions.prime(role.name, (p.key for p in role.permissions))
 
     return [role.name for role in role_perms]
 
@@ -193,6 +371,9 @@ def _process_jwt_header(token: str) -> str:
 def decode_jwt(jwt: str) -> Tuple:
     """Decode JSON web token.
 
+    When `JWT_CACHE_ENABLED` is `True`, verified tokens are kept in
+    `token_cache` until they expire, so their signature is only verified once.
+
     Args:
         jwt: The JSON web token
 
@@ -202,6 +383,25 @@ def decode_jwt(jwt: str) -> Tuple:
     Returns:
         The user id
     """
+    if not (settings.JWT_CACHE_ENABLED and settings.JWT_VERIFY):
+        return _decode_jwt(jwt)
+
+    key = sha256(jwt.encode("utf-8")).digest()
+    decoded = token_cache.get(key)
+    if decoded is None:
+        decoded = _decode_jwt(jwt)
+        exp = decoded[1].get("exp")
+        # Tokens that never expire are not cached
+        if exp is None:
+            return decoded
+        token_cache.set(
+            key, decoded, expires_at=exp - settings.JWT_LEEWAY.total_seconds()
+        )
+    # Callers get their own copy of the cached header and claims
+    return deepcopy(decoded)
+
+
+def _decode_jwt(jwt: str) -> Tuple:
     if settings.JWT_ENCRYPT:
         token = JWE()
         try:
@@ -270,6 +470,31 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Same as `verify_password`, without blocking the event loop.
+
+    Args:
+        plain_password: Plain password to check
+        hashed_password: Hashed password to compare to
+
+    Returns:
+        `True` if the password matched the hash, else `False`
+    """
+    return await hashing_pool.run(pwd_context.verify, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Same as `get_password_hash`, without blocking the event loop.
+
+    Args:
+        password: The password to hash
+
+    Returns:
+        The resulting hash
+    """
+    return await hashing_pool.run(pwd_context.hash, password)
+
+
 async def get_user_by_claims(claims):
     username = claims.get("sub")
 
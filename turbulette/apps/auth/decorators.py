@@ -1,14 +1,81 @@
 """Auth decorators exposing most of the auth logic."""
 
+import json
+from asyncio import ensure_future
 from datetime import datetime
-from typing import Any, Callable
+from enum import Enum
+from hashlib import sha256
+from inspect import isawaitable
+from typing import Any, Callable, Optional
 
-from turbulette.errors import ErrorCode, add_error
+from ariadne.types import GraphQLResolveInfo
+from graphql import print_ast
+
+from turbulette.cache import cache
+from turbulette.errors import BaseError, ErrorCode, add_error
+from turbulette.type import Claims
 from turbulette.utils import is_query
 
 from .core import TokenType, _process_jwt_header, decode_jwt, settings
 from .exceptions import JWTInvalidTokenType, JWTNotFresh
 from .policy import authorized
+from .policy.policy import root_field_key
+
+# Context key holding policy decisions already taken during the request
+POLICY_DECISIONS_CONTEXT_KEY = "_policy_decisions"
+
+# Context key holding the authorization header and its verified claims
+JWT_CONTEXT_KEY = "_jwt"
+
+# Context key holding the hash of the operation being executed
+OPERATION_HASH_CONTEXT_KEY = "_operation_hash"
+
+CACHE_CONTROL_KEY_PREFIX = "turbulette:cache_control:"
+
+
+class CacheControlScope(Enum):
+    """Who can share a cached result.
+
+    - `PUBLIC` : all users
+    - `PRIVATE` : only the user identified by the JWT `sub` claim
+    """
+
+    PUBLIC = "PUBLIC"
+    PRIVATE = "PRIVATE"
+
+
+def _get_claims(context: dict) -> Claims:
+    """Decode and verify the request JWT, only once per request.
+
+    The verified claims are stored in the context along with the
+    authorization header they come from, so protected fields resolved
+    later in the same request don't verify the signature again.
+    """
+    header = context["request"].headers["authorization"]
+    verified = context.get(JWT_CONTEXT_KEY)
+    if verified is not None and verified[0] == header:
+        return verified[1]
+    claims = decode_jwt(_process_jwt_header(header))[1]
+    context[JWT_CONTEXT_KEY] = (header, claims)
+    return claims
+
+
+async def _authorized(claims: Claims, info: GraphQLResolveInfo) -> bool:
+    """Evaluate policies once per field and root field for the current request.
+
+    When resolving a list, the same field is resolved for each item
+    with the same claims, so the decision is shared by all of them.
+    Sibling resolvers run concurrently, hence the pending evaluation is
+    stored rather than its result.
+    """
+    if not settings.POLICY_CACHE_DECISIONS:
+        return await authorized(claims, info)
+    decisions = info.context.setdefault(POLICY_DECISIONS_CONTEXT_KEY, {})
+    key = (info.parent_type.name, info.field_name, root_field_key(info))
+    decision = decisions.get(key)
+    if decision is None:
+        decision = decisions[key] = ensure_future(authorized(claims, info))
+    return await decision
 
 
 def scope_required(func: Callable[..., Any]):
@@ -24,7 +91,7 @@ def scope_required(func: Callable[..., Any]):
 
     @access_token_required
     async def wrapper(obj, info, **kwargs):
-        if await authorized(info.context["claims"], info):
+        if await _authorized(info.context["claims"], info):
             return await func(obj, info, **kwargs)
         if is_query(info):
             add_error(ErrorCode.QUERY_NOT_ALLOWED)
@@ -100,8 +167,7 @@ def _jwt_required(token_type: TokenType):
 
     def wrap(func: Callable[..., Any]):
         async def wrapped_func(obj, info, **kwargs):
-            jwt = _process_jwt_header(info.context["request"].headers["authorization"])
-            claims = decode_jwt(jwt)[1]
+            claims = _get_claims(info.context)
             if TokenType(claims["type"]) is not token_type:
                 raise JWTInvalidTokenType(
                     f"The provided JWT is not a {token_type.value} token"
@@ -112,3 +178,66 @@ def _jwt_required(token_type: TokenType):
         return wrapped_func
 
     return wrap
+
+
+def _operation_hash(info: GraphQLResolveInfo) -> str:
+    """Hash the operation text, once per request."""
+    operation_hash = info.context.get(OPERATION_HASH_CONTEXT_KEY)
+    if operation_hash is None:
+        operation = info.operation
+        source = operation.loc.source.body if operation.loc else print_ast(operation)
+        name = operation.name.value if operation.name else ""
+        operation_hash = sha256(f"{name}:{source}".encode("utf-8")).hexdigest()
+        info.context[OPERATION_HASH_CONTEXT_KEY] = operation_hash
+    return operation_hash
+
+
+def _cache_control_key(
+    info: GraphQLResolveInfo, scope: CacheControlScope
+) -> Optional[str]:
+    """Build the cache key of a field result, `None` if it can't be cached."""
+    parts = [
+        _operation_hash(info),
+        json.dumps(info.variable_values, sort_keys=True, default=str),
+        ".".join(str(key) for key in info.path.as_list()),
+    ]
+    if scope is CacheControlScope.PRIVATE:
+        if "authorization" not in info.context["request"].headers:
+            return None
+        try:
+            parts.append(_get_claims(info.context)["sub"])
+        except BaseError:
+            return None
+    return CACHE_CONTROL_KEY_PREFIX + sha256("\n".join(parts).encode()).hexdigest()
+
+
+def cache_control(max_age: int, scope: CacheControlScope = CacheControlScope.PUBLIC):
+    """Cache the result of the wrapped resolver in the cache defined by `CACHE`.
+
+    Results are cached for `max_age` seconds, by operation, variables and path
+    of the field in the response. `PRIVATE` results are also cached by user
+    (JWT `sub` claim), and not cached at all for anonymous requests.
+
+    `None` results and results that cannot be serialized are not cached.
+    """
+
+    def decorator(func: Callable[..., Any]):
+        async def wrapper(obj, info, **kwargs):
+            key = _cache_control_key(info, scope)
+            if key is not None:
+                cached = await cache.get(key)
+                if cached is not None:
+                    return cached
+            result = func(obj, info, **kwargs)
+            if isawaitable(result):
+                result = await result
+            if key is not None and result is not None:
+                try:
+                    await cache.set(key, result, ttl=max_age)
+                except (TypeError, ValueError):
+                    pass
+            return result
+
+        return wrapper
+
+    return decorator
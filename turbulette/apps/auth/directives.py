@@ -1,5 +1,7 @@
 """GraphQL directives for the auth app."""
 
+from typing import Callable
+
 from ariadne import SchemaDirectiveVisitor
 from graphql import default_field_resolver
 from graphql.type.definition import GraphQLNonNull
@@ -7,7 +9,63 @@ from graphql.type.definition import GraphQLNonNull
 from turbulette.exceptions import SchemaError
 from turbulette.utils import is_query
 
-from .decorators import access_token_required, fresh_token_required, scope_required
+from .decorators import (
+    CacheControlScope,
+    access_token_required,
+    cache_control,
+    fresh_token_required,
+    scope_required,
+)
+
+
+def _resolve_access_token_required(original_resolver):
+    @access_token_required
+    async def resolve_login_required(obj, info, **kwargs):
+        return await original_resolver(obj, info, **kwargs)
+
+    return resolve_login_required
+
+
+def _resolve_fresh_token_required(original_resolver):
+    @fresh_token_required
+    async def resolve_fresh_token_required(obj, info, **kwargs):
+        return await original_resolver(obj, info, **kwargs)
+
+    return resolve_fresh_token_required
+
+
+def _resolve_policy(original_resolver):
+    @scope_required
+    async def resolve_scope(obj, info, **kwargs):
+        if is_query(info):
+            return await original_resolver(obj, info, **kwargs)
+        return original_resolver(obj, info, **kwargs)
+
+    return resolve_scope
+
+
+def _wrap_auth(field, make_resolver: Callable[[Callable], Callable]):
+    """Wrap the field resolver in an auth check.
+
+    The wrapper keeps how it was built, so `@cache_control`
+    can be inserted below it.
+    """
+    original_resolver = field.resolve or default_field_resolver
+    resolver = make_resolver(original_resolver)
+    resolver.auth_layer = (make_resolver, original_resolver)
+    field.resolve = resolver
+    return field
+
+
+def _below_auth(resolver: Callable, decorator: Callable[[Callable], Callable]):
+    """Apply `decorator` to the resolver wrapped by auth checks, if any."""
+    layer = getattr(resolver, "auth_layer", None)
+    if layer is None:
+        return decorator(resolver)
+    make_resolver, original_resolver = layer
+    wrapped = make_resolver(_below_auth(original_resolver, decorator))
+    wrapped.auth_layer = (make_resolver, original_resolver)
+    return wrapped
 
 
 class AccessTokenRequiredDirective(SchemaDirectiveVisitor):
@@ -18,14 +76,7 @@ class AccessTokenRequiredDirective(SchemaDirectiveVisitor):
     def visit_field_definition(
         self, field, object_type
     ):  # pylint: disable=unused-argument
-        original_resolver = field.resolve or default_field_resolver
-
-        @access_token_required
-        async def resolve_login_required(obj, info, **kwargs):
-            return await original_resolver(obj, info, **kwargs)
-
-        field.resolve = resolve_login_required
-        return field
+        return _wrap_auth(field, _resolve_access_token_required)
 
 
 class FreshTokenRequiredDirective(SchemaDirectiveVisitor):
@@ -36,14 +87,7 @@ class FreshTokenRequiredDirective(SchemaDirectiveVisitor):
     def visit_field_definition(
         self, field, object_type
     ):  # pylint: disable=unused-argument
-        original_resolver = field.resolve or default_field_resolver
-
-        @fresh_token_required
-        async def resolve_fresh_token_required(obj, info, **kwargs):
-            return await original_resolver(obj, info, **kwargs)
-
-        field.resolve = resolve_fresh_token_required
-        return field
+        return _wrap_auth(field, _resolve_fresh_token_required)
 
 
 class PolicyDirective(SchemaDirectiveVisitor):
@@ -54,16 +98,33 @@ class PolicyDirective(SchemaDirectiveVisitor):
     def visit_field_definition(
         self, field, object_type
     ):  # pylint: disable=unused-argument
-        original_resolver = field.resolve or default_field_resolver
-
         if isinstance(field.type, GraphQLNonNull):
             raise SchemaError("Fields with @policy directive cannot be non-null")
+        return _wrap_auth(field, _resolve_policy)
+
+
+class CacheControlDirective(SchemaDirectiveVisitor):
+    """Cache the field result for `maxAge` seconds.
+
+    Only the field resolver is cached: auth directives (`@policy`,
+    `@access_token_required`, `@fresh_token_required`) are still evaluated
+    when the result comes from the cache, whatever their order on the field.
+    """
 
-        @scope_required
-        async def resolve_scope(obj, info, **kwargs):
-            if is_query(info):
-                return await original_resolver(obj, info, **kwargs)
-            return original_resolver(obj, info, **kwargs)
+    name = "cache_control"
 
-        field.resolve = resolve_scope
+    def visit_field_definition(
+        self, field, object_type
+    ):  # pylint: disable=unused-argument
+        if object_type.name in ("Mutation", "Subscription"):
+            raise SchemaError(
+                f"@cache_control cannot be used on {object_type.name} fields"
+            )
+        field.resolve = _below_auth(
+            field.resolve or default_field_resolver,
+            cache_control(
+                self.args["maxAge"],
+                CacheControlScope(self.args.get("scope") or "PUBLIC"),
+            ),
+        )
         return field
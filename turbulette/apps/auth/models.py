@@ -248,7 +248,7 @@ class AbstractUser:
             password (str): The new password
         """
         user = await cls.get_by_username(username)
-        hashed_password = auth.get_password_hash(password)
+        hashed_password = await auth.get_password_hash_async(password)
         await user.update(hashed_password=hashed_password).apply()
 
     async def get_perms(self) -> List[Permission]:
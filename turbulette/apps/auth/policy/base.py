@@ -7,7 +7,7 @@ from ariadne.types import GraphQLResolveInfo
 
 from turbulette.conf import settings
 
-from .policy import PolicyType
+from .policy import PolicyIndex, PolicyType
 
 # Base policy object
 policy = PolicyType()
@@ -22,6 +22,14 @@ def get_policy_config():
     return settings.POLICY
 
 
+def get_policy_index() -> PolicyIndex:
+    """Get the compiled policy schema.
+
+    Policies are compiled once, and again only if the `POLICY` setting changes.
+    """
+    return policy.compile(get_policy_config())
+
+
 async def authorized(claims: dict, info: GraphQLResolveInfo) -> bool:
     """Evaluate authorization policies with the JWT claims and the query infos.
 
@@ -32,15 +40,4 @@ async def authorized(claims: dict, info: GraphQLResolveInfo) -> bool:
     Returns:
         bool: True if authorized, False otherwise
     """
-    policies = get_policy_config()
-    policies = await policy.involved(claims, policies, info)
-    if not policies:  # pragma: no cover ### can't cover both all policy types and none
-        return False
-    valid_policies = await policy.with_valid_conditions(claims, policies, info)
-    if (
-        not valid_policies
-    ):  # pragma: no cover ### can't cover both all context types and none
-        return False
-    applied_policies = policy.apply(info, valid_policies)
-    authorized_ = bool(applied_policies) and all(applied_policies)
-    return authorized_
+    return await policy.evaluate(claims, get_policy_index(), info)
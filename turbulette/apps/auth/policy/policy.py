@@ -1,6 +1,16 @@
 """Core policy logic."""
 
-from typing import Callable, Dict, List
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 
 from graphql.pyutils import Path
 from graphql.type.definition import GraphQLResolveInfo
@@ -17,6 +27,108 @@ from .constants import (
 )
 
 
+class RootMatcher:
+    """Pre-compiled root field patterns of an allow/deny statement.
+
+    Patterns ending with `*` are prefixes, patterns starting with `*` are suffixes
+    and all others must match the root field exactly. A statement without
+    `query` patterns matches any root field.
+    """
+
+    __slots__ = ("any", "exact", "prefixes", "suffixes")
+
+    def __init__(self, patterns: Optional[List[str]] = None):
+        self.any = patterns is None
+        exact, prefixes, suffixes = [], [], []
+        for pattern in patterns or []:
+            if pattern.endswith("*"):
+                prefixes.append(pattern.split("*")[0])
+            elif pattern.startswith("*"):
+                suffixes.append(pattern.split("*")[1])
+            else:
+                exact.append(pattern)
+        self.exact: FrozenSet[str] = frozenset(exact)
+        self.prefixes: Tuple[str, ...] = tuple(prefixes)
+        self.suffixes: Tuple[str, ...] = tuple(suffixes)
+
+    def match(self, root_key: str) -> bool:
+        return (
+            self.any
+            or root_key in self.exact
+            or root_key.startswith(self.prefixes)
+            or root_key.endswith(self.suffixes)
+        )
+
+
+class CompiledPolicy(NamedTuple):
+    """A policy with its principal and condition statements parsed once."""
+
+    principals: Tuple[Tuple[str, str], ...]
+    conditions: Tuple[Tuple[str, Any], ...]
+
+
+class FieldRule(NamedTuple):
+    """What a single policy says about a given `(type, field)` pair.
+
+    `allow` and `deny` are `None` when the policy has no such statement for the field.
+    """
+
+    policy: CompiledPolicy
+    allow: Optional[RootMatcher]
+    deny: Optional[RootMatcher]
+
+
+PolicyIndex = Dict[Tuple[str, str], Tuple[FieldRule, ...]]
+
+
+def root_field_key(info: GraphQLResolveInfo) -> str:
+    """Return the key of the root field (query, mutation...) being resolved."""
+    root_field = info.path
+    while root_field.prev is not None:
+        root_field = root_field.prev
+    return str(root_field.key)
+
+
+def _parse_principal(statement: str) -> Tuple[str, str]:
+    parsed = statement.split(":", 1)
+    return parsed[0], parsed[0] if len(parsed) == 1 else parsed[1]
+
+
+def compile_policies(policies: List[Policy]) -> PolicyIndex:
+    """Build an index of the policy schema keyed by `(parent_type, field_name)`.
+
+    Only policies having an allow or deny statement on a given field can
+    take part in its authorization, so evaluating the index entry of a field
+    gives the same result as evaluating the whole policy schema.
+
+    Args:
+        policies (List[Policy]): The policy schema
+
+    Returns:
+        PolicyIndex: Field rules for each `(parent_type, field_name)` pair
+    """
+    index: Dict[Tuple[str, str], Dict[int, List[Optional[RootMatcher]]]] = {}
+    for position, policy in enumerate(policies):
+        compiled = CompiledPolicy(
+            principals=tuple(
+                _parse_principal(statement) for statement in policy[KEY_PRINCIPAL]
+            ),
+            conditions=tuple(policy.get(KEY_CONDITIONS, {}).items()),
+        )
+        for slot, key in enumerate((KEY_ALLOW, KEY_DENY), start=1):
+            for type_, values in policy.get(key, {}).items():
+                matcher = RootMatcher(values.get(KEY_ALLOW_QUERY))
+                for field in values[KEY_ALLOW_FIELDS]:
+                    rule = index.setdefault((type_, field), {}).setdefault(
+                        position, [compiled, None, None]
+                    )
+                    rule[slot] = matcher
+    return {
+        key: tuple(FieldRule(*rule) for _, rule in sorted(rules.items()))
+        for key, rules in index.items()
+    }
+
+
 class PolicyType:
     """Store policy resolvers and handle core logic to apply policies.
 
@@ -30,6 +142,8 @@ class PolicyType:
     def __init__(self):
         self._principals = {}
         self._conditions = {}
+        self._compiled_from: Optional[List[Policy]] = None
+        self._index: PolicyIndex = {}
 
     def _parse_query_string(self, pattern: str, field: Path) -> bool:
         match = False
@@ -137,14 +251,33 @@ class PolicyType:
         """
         res = []
         for policy in policies:
-            for statement in policy[KEY_PRINCIPAL]:
-                parsed = statement.split(":", 1)
-                val = parsed[0] if len(parsed) == 1 else parsed[1]
-                if await self._principals[parsed[0]](val, claims, info):
-                    res.append(policy)
-                    break
+            principals = (_parse_principal(s) for s in policy[KEY_PRINCIPAL])
+            if await self._is_involved(claims, principals, info):
+                res.append(policy)
         return res
 
+    async def _is_involved(
+        self,
+        claims: Claims,
+        principals: Iterable[Tuple[str, str]],
+        info: GraphQLResolveInfo,
+    ) -> bool:
+        for key, val in principals:
+            if await self._principals[key](val, claims, info):
+                return True
+        return False
+
+    async def _has_valid_conditions(
+        self,
+        claims: Claims,
+        conditions: Iterable[Tuple[str, Any]],
+        info: GraphQLResolveInfo,
+    ) -> bool:
+        for statement, val in conditions:
+            if not await self._conditions[statement](val, claims, info):
+                return False
+        return True
+
     async def with_valid_conditions(
         self, claims: Claims, policies: List[Policy], info: GraphQLResolveInfo
     ) -> List[Policy]:
@@ -162,14 +295,10 @@ class PolicyType:
         """
         valid_policies = []
         for policy in policies:
-            if KEY_CONDITIONS not in policy:
+            if await self._has_valid_conditions(
+                claims, policy.get(KEY_CONDITIONS, {}).items(), info
+            ):
                 valid_policies.append(policy)
-            else:
-                for statement, val in policy[KEY_CONDITIONS].items():
-                    if not await self._conditions[statement](val, claims, info):
-                        break
-                else:
-                    valid_policies.append(policy)
         return valid_policies
 
     def _apply(self, info: GraphQLResolveInfo, key: str, policy: Policy) -> bool:
@@ -205,3 +334,60 @@ class PolicyType:
             if allowed is not None:
                 applied_apolicies.append(allowed)
         return applied_apolicies
+
+    def compile(self, policies: List[Policy]) -> PolicyIndex:
+        """Return the index of the given policy schema.
+
+        The index is only rebuilt when a different policy schema is given.
+
+        Args:
+            policies (List[Policy]): The policy schema
+
+        Returns:
+            PolicyIndex: Field rules for each `(parent_type, field_name)` pair
+        """
+        if policies is not self._compiled_from:
+            self._index = compile_policies(policies)
+            self._compiled_from = policies
+        return self._index
+
+    async def evaluate(
+        self, claims: Claims, index: PolicyIndex, info: GraphQLResolveInfo
+    ) -> bool:
+        """Evaluate the compiled policies involving the field being resolved.
+
+        Gives the same result as filtering with `involved`,
+        `with_valid_conditions` then `apply`, but only looks at the
+        policies that have an allow or deny statement on this field.
+
+        Args:
+            claims (Claims): Current JWT claims
+            index (PolicyIndex): Compiled policy schema
+            info (GraphQLResolveInfo): GraphQL infos for the current query
+
+        Returns:
+            bool: True if any policy allows the access and none denies it
+        """
+        rules = index.get((info.parent_type.name.lower(), info.field_name))
+        if not rules:
+            return False
+        root_key = root_field_key(info)
+        authorized = False
+        for rule in rules:
+            allowed = None
+            if rule.allow is not None and rule.allow.match(root_key):
+                allowed = True
+            if rule.deny is not None and rule.deny.match(root_key):
+                allowed = False
+            if allowed is None:
+                continue
+            if not await self._is_involved(
+                claims, rule.policy.principals, info
+            ) or not await self._has_valid_conditions(
+                claims, rule.policy.conditions, info
+            ):
+                continue
+            if not allowed:
+                return False
+            authorized = True
+        return authorized
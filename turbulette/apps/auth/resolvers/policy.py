@@ -3,8 +3,7 @@
 from graphql.type.definition import GraphQLResolveInfo
 
 from turbulette.apps.auth import policy
-from turbulette.apps.auth.core import STAFF_SCOPE
-from turbulette.cache import cache
+from turbulette.apps.auth.core import STAFF_SCOPE, role_permissions
 from turbulette.type import Claims
 
 
@@ -28,14 +27,7 @@ async def has_perm(
     claims: Claims,
     info: GraphQLResolveInfo,  # pylint: disable=unused-argument
 ) -> bool:
-    involved = False
-    for role in claims["scopes"]:
-        if not role.startswith("_"):
-            cached_role = await cache.get(role)
-            if any(val == perm["key"] for perm in cached_role):
-                involved = True
-                break
-    return involved
+    return val in await role_permissions.get_many(claims["scopes"])
 
 
 @policy.principal("staff")
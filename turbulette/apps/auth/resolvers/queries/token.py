@@ -7,7 +7,7 @@ from turbulette.apps.auth.core import (
     encode_jwt,
     jwt_payload,
     jwt_payload_from_claims,
-    verify_password,
+    verify_password_async,
 )
 from turbulette.apps.auth.decorators import refresh_token_required
 from turbulette.apps.auth.pyd_models import AccessToken, Token
@@ -21,7 +21,7 @@ async def get_jwt(*_, username, password):
     user = await user_model.query.where(user_model.username == username).gino.first()
     error = ErrorField()
     if user:
-        if verify_password(password, user.hashed_password):
+        if await verify_password_async(password, user.hashed_password):
             payload = await jwt_payload(user)
             access_token = encode_jwt(payload, TokenType.ACCESS)
             refresh_token = (
@@ -15,6 +15,11 @@ SETTINGS_RULES = {
         "JWT_VERIFY_EXPIRATION": "bool",
         "JWT_REFRESH_ENABLED": "bool",
         "JWT_BLACKLIST_ENABLED": "bool",
+        "POLICY_CACHE_DECISIONS": "bool",
+        "JWT_CACHE_ENABLED": "bool",
+        "JWT_CACHE_SIZE": "int",
+        "PASSWORD_HASHING_WORKERS": "int",
+        "ROLE_PERMISSIONS_CHECK_INTERVAL": "int",
     },
 }
 
@@ -25,6 +30,16 @@ Defines the hash algorithm used to hash user passwords
 Default: `bcrypt`
 """
 
+PASSWORD_HASHING_WORKERS: int = 4
+"""
+Maximum number of passwords hashed or verified concurrently.
+
+Password hashing runs in a dedicated thread pool to not block the event loop,
+this is the size of the pool.
+
+Default: `4`
+"""
+
 TURBULETTE_ERROR_KEY: str = "errors"
 """
 The key holding Turbulette errors under `"extensions"` in GraphQL responses.
@@ -32,6 +47,26 @@ The key holding Turbulette errors under `"extensions"` in GraphQL responses.
 Defaults: `"errors"`
 """
 
+POLICY_CACHE_DECISIONS: bool = True
+"""Evaluate policies only once per request for a given field.
+
+The decision is shared by all objects resolving the same field under
+the same root field, so policies are not evaluated again for each item of a list.
+Disable it if your principal or condition resolvers depend on the parent object.
+
+Default: `True`
+"""
+
+ROLE_PERMISSIONS_CHECK_INTERVAL: int = 5
+"""Minimum delay, in seconds, between two checks of the role permissions version.
+
+Role permissions are kept in memory by each process, and discarded when the version
+shared through the cache is bumped by `role_permissions.invalidate()`.
+This is how long a process may keep using outdated permissions after that.
+
+Default: `5`
+"""
+
 # JWT
 JWT_VERIFY: bool = True
 """Enables JWT verification.
@@ -101,6 +136,23 @@ and the verifier's clock when verifiying that the token was generated in the pas
 Default: `timedelta(0)` (no leeway)
 """
 
+JWT_CACHE_ENABLED: bool = False
+"""Keep verified tokens in memory until they expire.
+
+Clients usually send the same access token until it expires, enabling
+this avoids verifying (and decrypting) it again on each request.
+Cached claims are looked up by a hash of the raw token.
+
+Default: `False`
+"""
+
+JWT_CACHE_SIZE: int = 1024
+"""Maximum number of verified tokens kept in memory
+when `JWT_CACHE_ENABLED` is `True`.
+
+Default: `1024`
+"""
+
 JWT_BLACKLIST_ENABLED: bool = False
 """Enables token blacklist.
 
@@ -1,7 +1,7 @@
 """Auth helpers."""
 
 from . import user_model
-from .core import get_password_hash
+from .core import get_password_hash_async
 from .models import Role, UserRole
 
 
@@ -18,7 +18,7 @@ async def create_user(role: str = None, **user_data) -> None:
     del user_data["password_two"]
     user = await user_model.create(
         **user_data,
-        hashed_password=get_password_hash(password),
+        hashed_password=await get_password_hash_async(password),
     )
     if role:
         user_role = (
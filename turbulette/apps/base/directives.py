@@ -0,0 +1,24 @@
+"""GraphQL directives for the base app."""
+
+from ariadne import SchemaDirectiveVisitor
+
+from turbulette.complexity import COST_EXTENSION, DEFAULT_FIELD_COST, CostHint
+
+
+class CostDirective(SchemaDirectiveVisitor):
+    """Declare the cost of a field, used to compute the cost of operations."""
+
+    name = "cost"
+
+    def visit_field_definition(
+        self, field, object_type
+    ):  # pylint: disable=unused-argument
+        value = self.args.get("value")
+        field.extensions = {
+            **(field.extensions or {}),
+            COST_EXTENSION: CostHint(
+                DEFAULT_FIELD_COST if value is None else value,
+                tuple(self.args.get("multipliers") or ()),
+            ),
+        }
+        return field
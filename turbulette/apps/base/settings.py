@@ -18,6 +18,28 @@ SETTINGS_RULES = {
         "CSRF_FORM_PARAM": "bool",
         "CSRF_HEADER_PARAM": "bool",
         "ALLOWED_HOSTS": "json.loads",
+        "PERSISTED_QUERIES_ENABLED": "bool",
+        "PERSISTED_QUERIES_ONLY": "bool",
+        "DOCUMENT_CACHE_SIZE": "int",
+        "QUERY_MAX_DEPTH": "int",
+        "QUERY_MAX_COST": "int",
+        "QUERY_THROTTLE_COST": "int",
+        "QUERY_THROTTLE_CONCURRENCY": "int",
+        "PUBSUB": "str",
+        "SUBSCRIPTION_QUEUE_SIZE": "int",
+        "SUBSCRIPTION_OVERFLOW_POLICY": "str",
+        "JSON_SERIALIZER": "str",
+        "STREAM_CHUNK_SIZE": "int",
+        "STARTUP_PROFILE": "bool",
+        "LAZY_RESOLVERS": "bool",
+        "FREEZE_SETTINGS": "bool",
+        "METRICS_ENABLED": "bool",
+        "METRICS_ENDPOINT": "str",
+        "METRICS_SAMPLE_RATE": "float",
+        "TRACING_ENABLED": "bool",
+        "TRACING_SAMPLE_RATE": "float",
+        "TRACING_SLOW_RESOLVER_THRESHOLD": "float",
+        "TRACING_BUFFER_SIZE": "int",
     },
     "OVERRIDE_BY_ENV": OVERRIDE_BY_ENV,
 }
@@ -36,6 +58,90 @@ APOLLO_FEDERATION = False
 
 GRAPHQL_ENDPOINT = "/graphql/"
 
+# Encode JSON responses with "json" (standard library), "orjson",
+# or a dotted path to a callable returning bytes.
+# "auto" uses orjson if it's installed
+JSON_SERIALIZER = "auto"
+
+# Accept persisted queries, using the Apollo automatic persisted queries protocol.
+# Queries are stored in the cache defined by the `CACHE` setting
+PERSISTED_QUERIES_ENABLED = False
+
+# Path of a JSON file listing queries to accept, loaded at startup.
+# It holds either a list of queries or an object mapping sha256 hashes to queries
+PERSISTED_QUERIES_ALLOW_LIST = None
+
+# Only accept queries from the allow-list
+PERSISTED_QUERIES_ONLY = False
+
+# Maximum number of parsed and validated queries kept in memory, 0 to disable
+DOCUMENT_CACHE_SIZE = 1024
+
+# Reject operations nested deeper than this, 0 to disable
+QUERY_MAX_DEPTH = 0
+
+# Reject operations costing more than this, 0 to disable.
+# Each field costs 1, unless it declares another cost with the `@cost` directive
+QUERY_MAX_COST = 0
+
+# Operations costing more than this are throttled, 0 to disable
+QUERY_THROTTLE_COST = 0
+
+# Maximum number of throttled operations executed concurrently
+QUERY_THROTTLE_CONCURRENCY = 4
+
+# Number of items sent in each subsequent payload of `@stream` fields
+STREAM_CHUNK_SIZE = 100
+
+# Log the time spent loading each app at startup
+STARTUP_PROFILE = False
+
+# Path of a JSON file caching the resolver modules of each app,
+# so they don't have to be discovered at each startup
+RESOLVERS_CACHE = None
+
+# Import resolver modules on the first call of one of their root fields,
+# instead of at startup. Only effective with `RESOLVERS_CACHE`.
+# Modules binding no root field, like policy conditions and principals,
+# are still imported at startup: keep such registrations out of modules
+# binding root fields
+LAZY_RESOLVERS = False
+
+# Record metrics of GraphQL operations and expose them
+# in the Prometheus text format on `METRICS_ENDPOINT`
+METRICS_ENABLED = False
+
+METRICS_ENDPOINT = "/metrics"
+
+# Ratio of requests in which resolvers are measured, between 0 and 1
+METRICS_SAMPLE_RATE = 1.0
+
+# Trace sampled operations, with spans for resolvers and database queries
+TRACING_ENABLED = False
+
+# Ratio of requests to trace, between 0 and 1
+TRACING_SAMPLE_RATE = 0.1
+
+# Resolvers faster than this (in seconds) are left out of traces
+TRACING_SLOW_RESOLVER_THRESHOLD = 0.01
+
+# Number of finished traces kept in memory
+TRACING_BUFFER_SIZE = 100
+
+# Exporters called with each finished trace
+# e.g. ["turbulette.tracing.LoggingExporter"]
+TRACING_EXPORTERS: list = []
+
+# Freeze settings at the end of setup, making them faster to read.
+# They can only be changed with `settings.configure()` afterwards
+FREEZE_SETTINGS = False
+
+# Path of a schema snapshot written by the `turbulette snapshot` command.
+# When the GraphQL files haven't changed since, the schema is built
+# from the snapshot instead of parsing and validating them.
+# Ignored with `APOLLO_FEDERATION`
+SCHEMA_SNAPSHOT = None
+
 # Logging settings to use when `CONFIGURE_LOGGING` is True.
 # see https://github.com/drgarcia1986/simple-settings#configure-logging
 LOGGING = {
@@ -78,6 +184,19 @@ CONFIGURE_LOGGING = False
 
 CACHE = "locmem://null"
 
+# Pub/sub broker feeding GraphQL subscriptions.
+# Use `redis://host:port` to deliver events across worker processes
+PUBSUB = "memory://"
+
+# Maximum number of subscription messages waiting to be sent
+# to a slow client, 0 for no limit
+SUBSCRIPTION_QUEUE_SIZE = 100
+
+# What to do when a client has too many pending messages:
+# "drop_oldest", "coalesce" (keep the latest result of each subscription)
+# or "disconnect"
+SUBSCRIPTION_OVERFLOW_POLICY = "drop_oldest"
+
 ERROR_FIELD = "errors"
 
 VALIDATION_KWARG_NAME = "_val_data"
@@ -1,11 +1,13 @@
 """The registry stores and manages Turbulette apps."""
 
+import logging
 from importlib import import_module
 from inspect import ismodule
 from types import ModuleType
 from typing import Dict, List
 
 from ariadne import snake_case_fallback_resolvers
+from ariadne.executable_schema import join_type_defs
 from graphql.type import GraphQLSchema
 from simple_settings import LazySettings
 from simple_settings.strategies import SettingsLoadStrategyPython
@@ -27,6 +29,10 @@ from turbulette.validation import pydantic_binder
 from .app import TurbuletteApp
 from .constants import MODULE_SETTINGS
 from .exceptions import RegistryError
+from .snapshot import SchemaSnapshot
+from .startup import ResolversCache, StartupProfile
+
+logger = logging.getLogger(__name__)
 
 
 class TurbuletteSettingsLoadStrategy(SettingsLoadStrategyPython):
@@ -89,6 +95,8 @@ class Registry:
         self.settings_module = app_settings_module
 
         self.schema = None
+        self.type_defs = None
+        self.profile = StartupProfile()
 
     def get_app_by_label(self, label: str) -> TurbuletteApp:
         """Retrieve the Turbulette app given its label.
@@ -122,13 +130,28 @@ class Registry:
                 f'App "{package_name}" cannot be found in the registry'
             ) from error
 
-    def setup(self) -> GraphQLSchema:
+    def setup(self, use_snapshot: bool = True) -> GraphQLSchema:
         """Load GraphQL resources, settings and create the global executable schema.
 
+        Args:
+            use_snapshot (bool, optional): Build the schema from the
+                `SCHEMA_SNAPSHOT` file if it's up to date. Defaults to True.
+
         Returns:
             GraphQLSchema: The aggregated schema from all apps
         """
-        settings = self.load_settings()
+        with self.profile.measure("registry", "settings"):
+            settings = self.load_settings()
+        # Base app settings are missing when the registry has no apps
+        cache_path = getattr(settings, "RESOLVERS_CACHE", None)
+        cache = ResolversCache(cache_path) if cache_path else None
+        lazy = getattr(settings, "LAZY_RESOLVERS", False)
+        snapshot_path = getattr(settings, "SCHEMA_SNAPSHOT", None)
+        snapshot = (
+            SchemaSnapshot.load(snapshot_path)
+            if use_snapshot and snapshot_path and not settings.APOLLO_FEDERATION
+            else None
+        )
         if settings.APOLLO_FEDERATION:
             make_schema = getattr(
                 import_module("ariadne.contrib.federation"), "make_federated_schema"
@@ -137,9 +160,13 @@ class Registry:
             make_schema = getattr(import_module("ariadne"), "make_executable_schema")
         schema, directives = [], {}
         for app in self.apps.values():
-            app.load_graphql_ressources()
-            app.load_models()
-            pydantic_binder.models.update(app.load_pydantic_models())
+            app.load_graphql_ressources(
+                self.profile, cache, lazy, validate_schema=snapshot is None
+            )
+            with self.profile.measure(app.label, "models"):
+                app.load_models()
+            with self.profile.measure(app.label, "pydantic"):
+                pydantic_binder.models.update(app.load_pydantic_models())
             if app.schema:
                 schema.extend([*app.schema])
             directives.update(app.directives)
@@ -147,16 +174,37 @@ class Registry:
         if not schema:
             raise RegistryError("None of the Turbulette apps have a schema")
 
-        executable_schema = make_schema(
-            [*schema],
+        if cache is not None:
+            cache.save()
+
+        self.type_defs = join_type_defs(schema)
+        if snapshot is not None and not snapshot.matches(self.type_defs):
+            logger.warning(
+                "Schema snapshot %s is outdated,"
+                " run `turbulette snapshot` to update it",
+                snapshot_path,
+            )
+            snapshot = None
+
+        bindables = (
             root_mutation,
             root_query,
             root_subscription,
             base_scalars_resolvers,
             snake_case_fallback_resolvers,
             pydantic_binder,
-            directives=None if directives == {} else directives,
         )
+        with self.profile.measure("registry", "make_schema"):
+            if snapshot is not None:
+                executable_schema = snapshot.make_executable_schema(
+                    *bindables, directives=directives or None
+                )
+            else:
+                executable_schema = make_schema(
+                    self.type_defs, *bindables, directives=directives or None
+                )
+        if getattr(settings, "STARTUP_PROFILE", False):
+            logger.info("Startup profile:\n%s", self.profile.report())
         self.ready = True
         self.schema = executable_schema
         return executable_schema
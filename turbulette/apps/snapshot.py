@@ -0,0 +1,122 @@
+"""Schema snapshots, to skip parsing and validating the SDL at startup.
+
+The `snapshot` command builds the schema once, fully validated, and writes
+the parsed SDL along with a hash of the GraphQL files it comes from.
+When the `SCHEMA_SNAPSHOT` setting points to this file, workers read
+the GraphQL files without parsing them, and if their hash matches the snapshot,
+build the executable schema from the stored document, skipping validation.
+
+Snapshots start with a plain text header holding the snapshot format
+and graphql-core versions, checked before unpickling the document:
+a snapshot written by other versions is ignored, not unpickled.
+
+Snapshots are pickled: only load snapshots built by your own deployment.
+"""
+
+import copyreg
+import pickle  # nosec - snapshots are written by the deployment itself
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Type, Union
+
+from ariadne import SchemaDirectiveVisitor
+from ariadne.enums import set_default_enum_values_on_schema
+from ariadne.executable_schema import extract_extensions
+from ariadne.types import SchemaBindable
+from graphql import DocumentNode, GraphQLSchema, build_ast_schema, extend_schema, parse
+from graphql import version as graphql_version
+from graphql.pyutils import FrozenList
+
+SNAPSHOT_VERSION = 1
+
+# `FrozenList` forbids the `extend` call pickle uses to restore list subclasses
+_DISPATCH_TABLE: Dict[type, Any] = {
+    **copyreg.dispatch_table,
+    FrozenList: lambda frozen: (FrozenList, (list(frozen),)),
+}
+
+
+def snapshot_header() -> bytes:
+    """First line of snapshots written with the current versions."""
+    header = f"turbulette-snapshot {SNAPSHOT_VERSION} graphql-core {graphql_version}"
+    return f"{header}\n".encode()
+
+
+def schema_hash(type_defs: str) -> str:
+    """Hash type definitions, along with the graphql-core version parsing them."""
+    content = f"{SNAPSHOT_VERSION}:{graphql_version}:{type_defs}"
+    return sha256(content.encode()).hexdigest()
+
+
+class SchemaSnapshot:
+    """A parsed and validated GraphQL document, ready to build the schema from."""
+
+    def __init__(self, hash_: str, document: DocumentNode):
+        self.hash = hash_
+        self.document = document
+
+    @classmethod
+    def build(cls, type_defs: str) -> "SchemaSnapshot":
+        """Parse type definitions.
+
+        They must have been validated by building an executable schema first.
+        """
+        return cls(schema_hash(type_defs), parse(type_defs, no_location=True))
+
+    @classmethod
+    def load(cls, path: str) -> Optional["SchemaSnapshot"]:
+        """Load a snapshot file.
+
+        Returns:
+            Optional[SchemaSnapshot]: `None` if the file is missing, unreadable
+                or was written by another version
+        """
+        header = snapshot_header()
+        try:
+            content = Path(path).read_bytes()
+            if not content.startswith(header):
+                return None
+            # The snapshot is trusted: it's written by the `snapshot` command
+            data = pickle.loads(content[len(header) :])  # nosec
+            return cls(data["hash"], data["document"])
+        except Exception:  # pylint: disable=broad-except
+            # Anything unexpected means the snapshot can't be used, not a failure
+            return None
+
+    def save(self, path: str):
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with target.open("wb") as file:
+            file.write(snapshot_header())
+            pickler = pickle.Pickler(file, protocol=pickle.HIGHEST_PROTOCOL)
+            pickler.dispatch_table = _DISPATCH_TABLE
+            pickler.dump({"hash": self.hash, "document": self.document})
+
+    def matches(self, type_defs: str) -> bool:
+        """Tell if the snapshot was built from these type definitions."""
+        return self.hash == schema_hash(type_defs)
+
+    def make_executable_schema(
+        self,
+        *bindables: Union[SchemaBindable, List[SchemaBindable]],
+        directives: Dict[str, Type[SchemaDirectiveVisitor]] = None,
+    ) -> GraphQLSchema:
+        """Same as `ariadne.make_executable_schema`, without validation."""
+        schema = build_ast_schema(self.document, assume_valid=True)
+        extension_ast = extract_extensions(self.document)
+        if extension_ast.definitions:
+            schema = extend_schema(schema, extension_ast, assume_valid=True)
+
+        for bindable in bindables:
+            if isinstance(bindable, list):
+                for obj in bindable:
+                    obj.bind_to_schema(schema)
+            else:
+                bindable.bind_to_schema(schema)
+
+        set_default_enum_values_on_schema(schema)
+
+        if directives:
+            SchemaDirectiveVisitor.visit_schema_directives(schema, directives)
+
+        return schema
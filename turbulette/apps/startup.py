@@ -0,0 +1,223 @@
+"""Tools to measure and cut the time spent loading apps at startup.
+
+- `StartupProfile` measures each loading phase of each app
+- `ResolversCache` stores the resolver modules discovered in each app,
+  along with the root fields they bind, so next startups don't need
+  to walk the `resolvers` packages
+- `LazyResolver` imports a resolver module on the first call
+  of one of its fields, when `LAZY_RESOLVERS` is enabled
+"""
+
+import json
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from importlib import import_module
+from os import stat
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from graphql import GraphQLSchema
+
+from turbulette.apps import base
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+# Root types of the base app that resolver modules can register fields into,
+# with the attribute holding the registered functions
+ROOT_BINDINGS: Dict[str, Tuple[str, str]] = {
+    "Query": ("query", "_resolvers"),
+    "Mutation": ("mutation", "_resolvers"),
+    "Subscription": ("subscription", "_resolvers"),
+    "Subscription.source": ("subscription", "_subscribers"),
+}
+
+FieldMap = Dict[str, List[str]]
+
+
+class StartupProfile:
+    """Record the time spent in each loading phase of each app."""
+
+    def __init__(self):
+        self.timings: Dict[str, Dict[str, float]] = defaultdict(dict)
+
+    @contextmanager
+    def measure(self, app: str, phase: str) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            timings = self.timings[app]
+            timings[phase] = timings.get(phase, 0.0) + perf_counter() - start
+
+    @property
+    def total(self) -> float:
+        return sum(sum(phases.values()) for phases in self.timings.values())
+
+    def report(self) -> str:
+        """Format timings as a table, slowest apps first."""
+        phases = sorted({phase for app in self.timings.values() for phase in app})
+        rows = sorted(
+            self.timings.items(), key=lambda item: sum(item[1].values()), reverse=True
+        )
+        width = max([len("app")] + [len(app) for app in self.timings])
+        lines = [
+            " ".join(
+                [f"{'app':<{width}}"]
+                + [f"{p:>10}" for p in phases]
+                + [f"{'total':>10}"]
+            )
+        ]
+        for app, timings in rows:
+            cells = [f"{timings.get(p, 0.0) * 1000:>8.1f}ms" for p in phases]
+            total = f"{sum(timings.values()) * 1000:>8.1f}ms"
+            lines.append(" ".join([f"{app:<{width}}"] + cells + [total]))
+        lines.append(f"Startup took {self.total * 1000:.1f}ms")
+        return "\n".join(lines)
+
+
+def root_functions(binding: str) -> Dict[str, Any]:
+    """Return functions registered in a root type, by field name."""
+    root_type, attribute = ROOT_BINDINGS[binding]
+    # Looked up each time, as the base app may be reloaded
+    return getattr(getattr(base, root_type), attribute)
+
+
+def snapshot_root_fields() -> Dict[str, set]:
+    """Return the fields currently bound to root types."""
+    return {name: set(root_functions(name)) for name in ROOT_BINDINGS}
+
+
+def diff_root_fields(before: Dict[str, set]) -> FieldMap:
+    """Return root fields bound since `before` was taken."""
+    after = snapshot_root_fields()
+    return {
+        name: sorted(after[name] - before[name])
+        for name in ROOT_BINDINGS
+        if after[name] - before[name]
+    }
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class ResolversCache:
+    """JSON file mapping each app to its resolver modules.
+
+    An app entry is valid as long as its resolver files and folders
+    haven't been modified, added or removed.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.apps: Dict[str, Any] = {}
+        self.modified = False
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if data.get("version") == CACHE_VERSION:
+            self.apps = data.get("apps", {})
+
+    def get(self, package: str) -> Optional[Dict[str, FieldMap]]:
+        """Get resolver modules of an app and the root fields they bind.
+
+        Returns:
+            Optional[Dict[str, FieldMap]]: `None` if the entry is missing or outdated
+        """
+        entry = self.apps.get(package)
+        if entry is None:
+            return None
+        for path, mtime in entry["mtimes"].items():
+            if _mtime(path) != mtime:
+                return None
+        return entry["modules"]
+
+    def set(self, package: str, paths: List[Path], modules: Dict[str, FieldMap]):
+        """Store resolver modules of an app.
+
+        Args:
+            package (str): App package name
+            paths (List[Path]): Resolver files and folders, checked to invalidate
+            modules (Dict[str, FieldMap]): Root fields bound by each module
+        """
+        self.apps[package] = {
+            "mtimes": {str(path): _mtime(str(path)) for path in paths},
+            "modules": modules,
+        }
+        self.modified = True
+
+    def save(self):
+        if self.modified:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(
+                json.dumps({"version": CACHE_VERSION, "apps": self.apps}, indent=2)
+            )
+            self.modified = False
+
+
+class LazyResolver:
+    """Placeholder resolver importing its module on first call.
+
+    Importing the module binds the actual resolver to the root type,
+    replacing the placeholder.
+    """
+
+    def __init__(self, module: str, binding: str, field: str):
+        self.module = module
+        self.binding = binding
+        self.field = field
+        self.resolver = None
+
+    def load(self):
+        if self.resolver is None:
+            import_module(self.module)
+            resolver = root_functions(self.binding).get(self.field)
+            if resolver is None or resolver is self:
+                raise RuntimeError(
+                    f"{self.module} doesn't define a resolver for {self.binding}"
+                    f" field {self.field}, the resolvers cache is outdated"
+                )
+            self.resolver = resolver
+        return self.resolver
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    @classmethod
+    def bind(cls, module: str, fields: FieldMap):
+        """Bind placeholders for all root fields of a module."""
+        for binding, names in fields.items():
+            functions = root_functions(binding)
+            for name in names:
+                functions[name] = cls(module, binding, name)
+
+
+def load_lazy_resolvers(schema: GraphQLSchema) -> int:
+    """Import all lazy resolvers and bind the actual ones to the schema.
+
+    Returns:
+        int: The number of lazy resolvers loaded
+    """
+    loaded = 0
+    for root_type in (
+        schema.query_type,
+        schema.mutation_type,
+        schema.subscription_type,
+    ):
+        if root_type is None:
+            continue
+        for field in root_type.fields.values():
+            for attribute in ("resolve", "subscribe"):
+                resolver = getattr(field, attribute)
+                if isinstance(resolver, LazyResolver):
+                    setattr(field, attribute, resolver.load())
+                    loaded += 1
+    return loaded
@@ -1,5 +1,7 @@
 """Wrap creation of the ASGI app."""
 
+import gc
+import logging
 from importlib import import_module
 from importlib.util import find_spec
 from pathlib import Path
@@ -12,6 +14,7 @@ from starlette.middleware import Middleware
 from starlette.routing import Route, WebSocketRoute
 
 from turbulette import conf
+from turbulette.apps.startup import load_lazy_resolvers
 from turbulette.cache import cache
 from turbulette.conf.constants import (
     ROUTING_MODULE_ROUTES,
@@ -23,9 +26,13 @@ from turbulette.conf.constants import (
 )
 from turbulette.conf.exceptions import ImproperlyConfigured
 from turbulette.main import setup
+from turbulette.pubsub import broker
+from turbulette.tracing import trace_database
 from turbulette.type import DatabaseSettings
 from turbulette.utils import get_project_settings
 
+logger = logging.getLogger(__name__)
+
 
 def gino_starlette(settings: DatabaseSettings, dsn: URL) -> Gino:
     """Setup db connection using `gino_starlette` extension.
@@ -68,10 +75,16 @@ def gino_starlette(settings: DatabaseSettings, dsn: URL) -> Gino:
 
 async def startup():
     await cache.connect()
+    await broker.connect()
 
 
 async def shutdown():
     await cache.disconnect()
+    await broker.disconnect()
+
+
+async def trace_db():
+    trace_database(conf.db.bind)
 
 
 def turbulette_starlette(project_settings: Optional[str] = None) -> Starlette:
@@ -137,6 +150,16 @@ def turbulette_starlette(project_settings: Optional[str] = None) -> Starlette:
                 ROUTING_MODULE_ROUTES,
             )
 
+        if conf.settings.METRICS_ENABLED:
+            # Routes can only be imported once settings are loaded
+            from turbulette.routes import (  # pylint: disable=import-outside-toplevel
+                metrics_route,
+            )
+
+            routes = [
+                Route(conf.settings.METRICS_ENDPOINT, metrics_route, methods=["GET"])
+            ] + list(routes)
+
         app = Starlette(
             debug=getattr(settings_module, "DEBUG"),
             routes=[
@@ -152,8 +175,61 @@ def turbulette_starlette(project_settings: Optional[str] = None) -> Starlette:
         conf.app.__setup__(app)
         if is_database:
             conf.db.init_app(app)
+            if conf.settings.TRACING_ENABLED:
+                # Run after GINO creates the engine on startup
+                app.add_event_handler("startup", trace_db)
         return app
 
     raise ImproperlyConfigured(
         f"Cannot find spec for module {settings_path}"
     )  # pragma: no cover
+
+
+def preload(project_settings: Optional[str] = None) -> Starlette:
+    """Setup the app in a process that is forked to spawn workers.
+
+    Meant to be used with servers preloading the app before forking,
+    like gunicorn with the `--preload` option:
+
+    ```python
+    # app.py
+    app = preload()
+    ```
+
+    ```shell
+    gunicorn --preload -k uvicorn.workers.UvicornWorker -w 4 project.app:app
+    ```
+
+    All apps, settings, the schema and pydantic models are loaded once,
+    lazy resolvers included, and shared between workers. Resolver modules
+    registering things as a side effect are imported by the app setup,
+    even with `LAZY_RESOLVERS`.
+    Database pools, the cache and the pub/sub broker are still connected
+    on startup by each worker, as connections can't be shared across processes.
+
+    Garbage collection is disabled during setup, then objects are frozen
+    (with `gc.freeze()`, on Python 3.7+) so collections in workers
+    don't write to them, keeping their memory pages shared.
+    It's enabled again when a worker starts.
+
+    Args:
+        project_settings (str, optional): project settings module name.
+        Defaults to None.
+
+    Returns:
+        The Starlette instance
+    """
+    gc.disable()
+    try:
+        app = turbulette_starlette(project_settings)
+        loaded = load_lazy_resolvers(conf.registry.schema)
+    except Exception:
+        gc.enable()
+        raise
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+    app.add_event_handler("startup", gc.enable)
+    logger.info(
+        "Preloaded %d apps (%d lazy resolvers)", len(conf.registry.apps), loaded
+    )
+    return app
@@ -0,0 +1,313 @@
+"""Measure the depth and cost of GraphQL operations, and enforce limits on them.
+
+Each field costs 1 by default. Fields can declare their own cost with
+the `@cost` directive, and name arguments multiplying the cost of the field
+and its subfields, usually the number of items returned by a list:
+
+```graphql
+type Query {
+    books(first: Int): [Book] @cost(value: 2, multipliers: ["first"])
+}
+```
+"""
+
+from asyncio import Semaphore
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple, Type
+
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLField,
+    GraphQLSchema,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    get_named_type,
+    validate,
+)
+from graphql.execution.values import get_argument_values, get_variable_values
+from graphql.language import OperationType
+from graphql.validation import ValidationRule
+
+COST_EXTENSION = "cost"
+DEFAULT_FIELD_COST = 1
+
+
+class CostHint(NamedTuple):
+    """Cost of a field, declared with the `@cost` directive."""
+
+    value: int
+    multipliers: Tuple[str, ...]
+
+
+class QueryComplexity:
+    """Reject or throttle operations above the configured depth and cost."""
+
+    def __init__(
+        self,
+        max_depth: int = 0,
+        max_cost: int = 0,
+        throttle_cost: int = 0,
+        throttle_concurrency: int = 1,
+    ):
+        """Initialize the analyzer. Limits set to 0 are disabled.
+
+        Args:
+            max_depth (int, optional): Maximum depth of an operation. Defaults to 0.
+            max_cost (int, optional): Maximum cost of an operation. Defaults to 0.
+            throttle_cost (int, optional): Operations above this cost
+                are throttled. Defaults to 0.
+            throttle_concurrency (int, optional): Maximum number of throttled
+                operations executed concurrently. Defaults to 1.
+        """
+        self.max_depth = max_depth
+        self.max_cost = max_cost
+        self.throttle_cost = throttle_cost
+        self.throttle_concurrency = throttle_concurrency
+        self._semaphore: Optional[Semaphore] = None
+
+    def rule(
+        self,
+        variables: Optional[Dict[str, Any]] = None,
+        operation_name: Optional[str] = None,
+        result: Optional[Dict[str, int]] = None,
+    ) -> Type[ValidationRule]:
+        """Create a validation rule measuring the executed operation.
+
+        Args:
+            variables (dict, optional): Variables of the request,
+                used to get multipliers values
+            operation_name (str, optional): Name of the operation to measure
+            result (dict, optional): Will hold the measured `depth` and `cost`
+
+        Returns:
+            Type[ValidationRule]: The validation rule
+        """
+        complexity = self
+        variables = variables or {}
+        result = {} if result is None else result
+
+        class QueryComplexityRule(ValidationRule):
+            """Measure the executed operation, and report limits it exceeds."""
+
+            def enter_operation_definition(self, node: OperationDefinitionNode, *_args):
+                if operation_name and (
+                    node.name is None or node.name.value != operation_name
+                ):
+                    return
+                root_type = {
+                    OperationType.QUERY: self.context.schema.query_type,
+                    OperationType.MUTATION: self.context.schema.mutation_type,
+                    OperationType.SUBSCRIPTION: self.context.schema.subscription_type,
+                }[node.operation]
+                # Apply defaults of variables left unset
+                coerced = get_variable_values(
+                    self.context.schema, node.variable_definitions, variables
+                )
+                measure = _Measure(
+                    self.context,
+                    variables if isinstance(coerced, list) else coerced,
+                    complexity.max_depth,
+                    complexity.max_cost,
+                )
+                try:
+                    measure.selection_set(node.selection_set, root_type)
+                except _LimitExceeded:
+                    pass
+                depth, cost = measure.depth, measure.cost
+                result.update(depth=depth, cost=cost)
+                if complexity.max_depth and depth > complexity.max_depth:
+                    self.report_error(
+                        GraphQLError(
+                            f"Operation depth {depth} exceeds the maximum"
+                            f" allowed depth of {complexity.max_depth}",
+                            node,
+                        )
+                    )
+                if complexity.max_cost and cost > complexity.max_cost:
+                    self.report_error(
+                        GraphQLError(
+                            f"Operation cost {cost} exceeds the maximum"
+                            f" allowed cost of {complexity.max_cost}",
+                            node,
+                        )
+                    )
+
+        return QueryComplexityRule
+
+    def validate(
+        self,
+        schema: GraphQLSchema,
+        document: DocumentNode,
+        variables: Optional[Dict[str, Any]] = None,
+        operation_name: Optional[str] = None,
+    ) -> Tuple[List[GraphQLError], int]:
+        """Measure an operation and check it against the limits.
+
+        The document must be already validated against the schema.
+
+        Returns:
+            Tuple[List[GraphQLError], int]: Errors and cost of the operation
+        """
+        result: Dict[str, int] = {}
+        errors = validate(
+            schema, document, [self.rule(variables, operation_name, result)]
+        )
+        return errors, result.get("cost", 0)
+
+    def throttled(self, cost: int) -> bool:
+        """Tell if an operation of the given cost must be throttled."""
+        return bool(self.throttle_cost) and cost > self.throttle_cost
+
+    @property
+    def semaphore(self) -> Semaphore:
+        """Limit the number of throttled operations executed concurrently."""
+        # Created on first use, to be bound to the running loop
+        if self._semaphore is None:
+            self._semaphore = Semaphore(self.throttle_concurrency)
+        return self._semaphore
+
+
+def _multiplier(
+    node: FieldNode,
+    field: GraphQLField,
+    hint: Optional[CostHint],
+    variables: Dict[str, Any],
+) -> int:
+    if not hint or not hint.multipliers:
+        return 1
+    try:
+        # Arguments omitted in the query get their default value from the schema
+        arguments = get_argument_values(field, node, variables)
+    except GraphQLError:
+        # Invalid arguments, rejected at execution
+        return 1
+    values = [
+        max(arguments[name], 0)
+        for name in hint.multipliers
+        if isinstance(arguments.get(name), int)
+    ]
+    return sum(values) if values else 1
+
+
+class _LimitExceeded(Exception):
+    """Stop measuring an operation once a limit is exceeded."""
+
+
+class _Measure:
+    """Measure the selection sets of an operation.
+
+    The depth and cost of each fragment are measured once, and reused
+    for all its spreads. The walk stops as soon as a limit is exceeded:
+    `depth` and `cost` then hold what was measured until then.
+    """
+
+    def __init__(
+        self,
+        context,
+        variables: Dict[str, Any],
+        max_depth: int = 0,
+        max_cost: int = 0,
+    ):
+        self.context = context
+        self.variables = variables
+        self.max_depth = max_depth
+        self.max_cost = max_cost
+        self.depth = 0
+        self.cost = 0
+        self.fragments: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        self.measuring: Set[str] = set()
+
+    def _count(self, depth: int, cost: int):
+        """Add to the depth and cost of the whole operation, and check limits."""
+        self.depth = max(self.depth, depth)
+        self.cost += cost
+        if (self.max_depth and self.depth > self.max_depth) or (
+            self.max_cost and self.cost > self.max_cost
+        ):
+            raise _LimitExceeded
+
+    def selection_set(
+        self,
+        selection_set: SelectionSetNode,
+        parent_type,
+        level: int = 0,
+        factor: int = 1,
+        spread: Optional[Set[str]] = None,
+    ) -> Tuple[int, int]:
+        """Return the depth and cost of a selection set.
+
+        Args:
+            level (int): Depth of the selection set in the operation
+            factor (int): Product of the multipliers of parent fields
+            spread (set, optional): Fragments already spread at this level
+        """
+        depth, cost = 0, 0
+        spread = set() if spread is None else spread
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                fields = getattr(parent_type, "fields", {})
+                field = fields.get(selection.name.value)
+                if field is None:
+                    # Introspection fields, or unknown fields reported by other rules
+                    continue
+                hint = (field.extensions or {}).get(COST_EXTENSION)
+                field_cost = hint.value if hint else DEFAULT_FIELD_COST
+                multiplier = _multiplier(selection, field, hint, self.variables)
+                self._count(level + 1, field_cost * multiplier * factor)
+                sub_depth, sub_cost = 0, 0
+                if selection.selection_set:
+                    sub_depth, sub_cost = self.selection_set(
+                        selection.selection_set,
+                        get_named_type(field.type),
+                        level + 1,
+                        factor * multiplier,
+                    )
+                cost += (field_cost + sub_cost) * multiplier
+                depth = max(depth, sub_depth + 1)
+                continue
+
+            if isinstance(selection, InlineFragmentNode):
+                fragment_type = (
+                    self.context.schema.get_type(selection.type_condition.name.value)
+                    if selection.type_condition
+                    else parent_type
+                )
+                sub_depth, sub_cost = self.selection_set(
+                    selection.selection_set, fragment_type, level, factor, spread
+                )
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                fragment = self.context.get_fragment(name)
+                # Spreads merged at the same level, or cycles, are not counted
+                if fragment is None or name in spread or name in self.measuring:
+                    continue
+                spread.add(name)
+                sub_depth, sub_cost = self._fragment(
+                    name, fragment, parent_type, level, factor
+                )
+            else:  # pragma: no cover
+                continue
+            depth, cost = max(depth, sub_depth), cost + sub_cost
+        return depth, cost
+
+    def _fragment(
+        self, name: str, fragment, parent_type, level: int, factor: int
+    ) -> Tuple[int, int]:
+        key = (name, parent_type.name)
+        measured = self.fragments.get(key)
+        if measured is not None:
+            self._count(level + measured[0], measured[1] * factor)
+            return measured
+        fragment_type = self.context.schema.get_type(fragment.type_condition.name.value)
+        self.measuring.add(name)
+        try:
+            measured = self.selection_set(
+                fragment.selection_set, fragment_type, level, factor
+            )
+        finally:
+            self.measuring.discard(name)
+        self.fragments[key] = measured
+        return measured
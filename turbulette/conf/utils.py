@@ -2,8 +2,9 @@
 
 from importlib import import_module
 from pathlib import Path
-from typing import List, Type
+from typing import Any, List, Type
 
+from simple_settings import LazySettings
 from simple_settings.utils import SettingsStub
 from starlette.config import Config
 
@@ -29,6 +30,49 @@ def get_config_from_paths(paths: List[str]) -> Config:
     raise ImproperlyConfigured(f"Failed to find config file from these paths : {paths}")
 
 
+# Attributes used by `LazySettings` itself, that settings can't shadow
+_LAZY_SETTINGS_ATTRIBUTES = frozenset(vars(LazySettings()))
+
+
+class FrozenSettings(LazySettings):
+    """Read-only `LazySettings`, with settings stored as instance attributes.
+
+    Reading a setting is a plain attribute lookup,
+    instead of going through `LazySettings.__getattr__`.
+    Settings can still be changed with `configure`.
+    """
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"Settings are frozen, use `configure()` to change {name}")
+
+    def configure(self, **settings):
+        super().configure(**settings)
+        self._materialize(settings)
+
+    def _materialize(self, settings: dict):
+        self.__dict__.update(
+            {k: v for k, v in settings.items() if k not in _LAZY_SETTINGS_ATTRIBUTES}
+        )
+
+
+def freeze_settings(settings: LazySettings) -> bool:
+    """Turn a `LazySettings` instance into `FrozenSettings`.
+
+    The instance is modified in place, as modules keep references to it.
+    Settings read from a dynamic storage can't be frozen.
+
+    Returns:
+        bool: `True` if settings have been frozen
+    """
+    settings.setup()
+    # pylint: disable=protected-access
+    if settings._dynamic_reader is not None:
+        return False
+    object.__setattr__(settings, "__class__", FrozenSettings)
+    settings._materialize(settings._dict)  # type: ignore [attr-defined]
+    return True
+
+
 class TurubuletteSettingsStub(SettingsStub):
     """Subclass of SettingsStub to make it work with Turbulette settings.
 
@@ -4,3 +4,4 @@ from gino.ext.starlette import Gino  # noqa # pylint: disable=no-name-in-module
 from gino.declarative import declarative_base  # noqa
 from sqlalchemy import MetaData  # noqa
 from .database import db, Model, get_tablename  # noqa
+from .loader import DataLoader, ModelLoader, get_loader  # noqa
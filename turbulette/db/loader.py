@@ -0,0 +1,166 @@
+"""Batch and cache model lookups made while resolving a GraphQL operation."""
+
+from asyncio import Future, ensure_future, get_event_loop
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from gino.declarative import Model
+
+# Context key holding the loaders of the current request
+LOADERS_CONTEXT_KEY = "_loaders"
+
+BatchLoadFn = Callable[[List[Hashable]], Awaitable[List[Any]]]
+
+
+class DataLoader:
+    """Coalesce loads requested during the same loop iteration into a single batch.
+
+    Resolvers of sibling objects run concurrently, so each of them
+    can call `load` and the loader will only call `batch_load` once
+    with all the requested keys. Results are cached by key for
+    the lifetime of the loader.
+    """
+
+    def __init__(self, batch_load: BatchLoadFn):
+        """Initialize the loader.
+
+        Args:
+            batch_load (BatchLoadFn): Coroutine function taking a list of keys,
+                and returning the list of values in the same order
+        """
+        self.batch_load = batch_load
+        self._cache: Dict[Hashable, Future] = {}
+        self._queue: List[Tuple[Hashable, Future]] = []
+
+    def load(self, key: Hashable) -> "Future[Any]":
+        """Load a value given its key.
+
+        Args:
+            key (Hashable): The key of the value to load
+
+        Returns:
+            Future: Resolved with the value once the batch is loaded
+        """
+        future = self._cache.get(key)
+        if future is None:
+            loop = get_event_loop()
+            future = self._cache[key] = loop.create_future()
+            if not self._queue:
+                # Wait for other resolvers of this iteration before loading
+                loop.call_soon(self._dispatch)
+            self._queue.append((key, future))
+        return future
+
+    async def load_many(self, keys: List[Hashable]) -> List[Any]:
+        """Load several values at once.
+
+        Args:
+            keys (List[Hashable]): Keys of the values to load
+
+        Returns:
+            List[Any]: Values in the same order as `keys`
+        """
+        return [await future for future in [self.load(key) for key in keys]]
+
+    def prime(self, key: Hashable, value: Any):
+        """Put a value in the cache, if not already loaded."""
+        if key not in self._cache:
+            future = get_event_loop().create_future()
+            future.set_result(value)
+            self._cache[key] = future
+
+    def clear(self, key: Optional[Hashable] = None):
+        """Remove a key from the cache, or all of them if no key is given."""
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    def _dispatch(self):
+        queue, self._queue = self._queue, []
+        ensure_future(self._load_batch(queue))
+
+    async def _load_batch(self, queue: List[Tuple[Hashable, Future]]):
+        keys = [key for key, _ in queue]
+        try:
+            values = await self.batch_load(keys)
+            if len(values) != len(keys):
+                raise ValueError(
+                    f"batch_load must return {len(keys)} values, got {len(values)}"
+                )
+        except Exception as error:  # pylint: disable=broad-except
+            for key, future in queue:
+                # Failures are not cached, so the key can be loaded again
+                self._cache.pop(key, None)
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (_, future), value in zip(queue, values):
+            if not future.done():
+                future.set_result(value)
+
+
+class ModelLoader(DataLoader):
+    """Load GINO model instances by a unique column, using a single query per batch.
+
+    Keys missing in the database are loaded as `None`.
+    """
+
+    def __init__(self, model: Model, column: Optional[str] = None):
+        """Initialize the loader.
+
+        Args:
+            model (Model): The GINO model to load
+            column (str, optional): Name of a unique column to use as key.
+                Defaults to the primary key.
+
+        Raises:
+            ValueError: Raised if no column is given and
+                the model primary key spans multiple columns
+        """
+        if column is None:
+            primary_key = list(model.__table__.primary_key.columns)
+            if len(primary_key) != 1:
+                raise ValueError(
+                    f"{model.__name__} has a composite primary key,"
+                    " you must specify which column to use"
+                )
+            column = primary_key[0].name
+        self.model = model
+        self.column = column
+        super().__init__(self._load_rows)
+
+    async def _load_rows(self, keys: List[Hashable]) -> List[Optional[Model]]:
+        column = getattr(self.model, self.column)
+        rows = await self.model.query.where(column.in_(keys)).gino.all()
+        by_key = {getattr(row, self.column): row for row in rows}
+        return [by_key.get(key) for key in keys]
+
+
+def get_loader(
+    context: dict, model: Model, column: Optional[str] = None
+) -> ModelLoader:
+    """Get the `ModelLoader` of the current request for the given model and column.
+
+    Loaders are stored in the GraphQL context, so lookups are batched and cached
+    for the current operation only:
+
+    ```python
+    @query.field("book")
+    async def resolve_book(_, info, **kwargs):
+        return await get_loader(info.context, Book).load(int(kwargs["id"]))
+    ```
+
+    Args:
+        context (dict): The GraphQL context
+        model (Model): The GINO model to load
+        column (str, optional): Name of a unique column to use as key.
+            Defaults to the primary key.
+
+    Returns:
+        ModelLoader: The loader
+    """
+    loaders = context.setdefault(LOADERS_CONTEXT_KEY, {})
+    loader = loaders.get((model, column))
+    if loader is None:
+        loader = loaders[(model, column)] = ModelLoader(model, column)
+    return loader
@@ -0,0 +1,248 @@
+"""Bounded delivery queues, protecting the server from slow subscription clients.
+
+When a queue is full, the overflow policy decides what happens
+to new messages:
+
+- `drop_oldest` : the oldest pending message is dropped
+- `coalesce` : the latest pending message with the same key is replaced
+  by the new one, so slow clients skip intermediate results of a subscription.
+  When no message can be replaced, the oldest one is dropped
+- `disconnect` : the queue is closed, and the client disconnected
+"""
+
+from asyncio import Future, get_event_loop
+from collections import deque
+from enum import Enum
+from time import perf_counter
+from typing import Any, Deque, Dict, Hashable, Optional, Union
+
+from starlette.status import WS_1013_TRY_AGAIN_LATER
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+
+class OverflowPolicy(Enum):
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+    DISCONNECT = "disconnect"
+
+
+class QueueOverflow(Exception):
+    """The client didn't consume its messages fast enough."""
+
+
+class Delivery:
+    """A message waiting in a delivery queue."""
+
+    __slots__ = ("value", "key", "droppable", "enqueued_at")
+
+    def __init__(self, value: Any, key: Optional[Hashable], droppable: bool):
+        self.value = value
+        self.key = key
+        self.droppable = droppable
+        self.enqueued_at = perf_counter()
+
+
+class DeliveryQueue:
+    """A FIFO queue with a bounded size and an overflow policy."""
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        policy: Union[OverflowPolicy, str] = OverflowPolicy.DROP_OLDEST,
+    ):
+        """Initialize the queue.
+
+        Args:
+            maxsize (int, optional): Maximum number of pending messages,
+                0 for an unbounded queue. Defaults to 0.
+            policy (Union[OverflowPolicy, str], optional): What to do when
+                the queue is full. Defaults to `OverflowPolicy.DROP_OLDEST`.
+        """
+        self.maxsize = maxsize
+        self.policy = OverflowPolicy(policy)
+        self.dropped = 0
+        self.coalesced = 0
+        self._items: Deque[Delivery] = deque()
+        self._getters: Deque[Future] = deque()
+        self._exception: Optional[Exception] = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def closed(self) -> bool:
+        return self._exception is not None
+
+    def put(self, value: Any, key: Optional[Hashable] = None, droppable: bool = True):
+        """Add a message to the queue, applying the overflow policy if it's full.
+
+        Args:
+            value (Any): The message
+            key (Hashable, optional): Identify messages superseding each other
+                with the `coalesce` policy
+            droppable (bool, optional): Whether the message can be dropped
+                or replaced. Defaults to True.
+
+        Raises:
+            QueueOverflow: Raised if the queue is full with the `disconnect`
+                policy, or if it's already closed
+        """
+        if self._exception is not None:
+            raise self._exception
+        if droppable and self.maxsize and len(self._items) >= self.maxsize:
+            if self.policy is OverflowPolicy.DISCONNECT:
+                self.close(QueueOverflow("Delivery queue is full"))
+                raise self._exception  # type: ignore [misc]
+            if (
+                self.policy is OverflowPolicy.COALESCE
+                and key is not None
+                and self._coalesce(value, key)
+            ):
+                return
+            self._drop_oldest()
+        self._items.append(Delivery(value, key, droppable))
+        self._wakeup()
+
+    async def get(self) -> Any:
+        """Wait for the next message."""
+        return (await self.get_delivery()).value
+
+    async def get_delivery(self) -> Delivery:
+        """Wait for the next message, along with its delivery metadata.
+
+        Raises:
+            QueueOverflow: Raised if the queue has been closed
+        """
+        while not self._items:
+            if self._exception is not None:
+                raise self._exception
+            getter = get_event_loop().create_future()
+            self._getters.append(getter)
+            try:
+                await getter
+            finally:
+                if getter in self._getters:
+                    self._getters.remove(getter)
+        return self._items.popleft()
+
+    def close(self, exception: Exception):
+        """Discard pending messages and make consumers raise `exception`."""
+        self._exception = exception
+        self.dropped += len(self._items)
+        self._items.clear()
+        self._wakeup(all_getters=True)
+
+    def _coalesce(self, value: Any, key: Hashable) -> bool:
+        """Replace the latest pending message with the same key, if any."""
+        for item in reversed(self._items):
+            if item.droppable and item.key == key:
+                # Keep the position and age of the pending message
+                item.value = value
+                self.coalesced += 1
+                return True
+        return False
+
+    def _drop_oldest(self):
+        for item in self._items:
+            if item.droppable:
+                self._items.remove(item)
+                self.dropped += 1
+                return
+
+    def _wakeup(self, all_getters: bool = False):
+        while self._getters:
+            getter = self._getters.popleft()
+            if not getter.done():
+                getter.set_result(None)
+                if not all_getters:
+                    return
+
+
+class DeliveryMetrics:
+    """Count messages and measure their latency, from enqueue to sent."""
+
+    def __init__(self):
+        self.sent = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_latency = 0.0
+
+    def record(self, delivery: Delivery):
+        latency = perf_counter() - delivery.enqueued_at
+        self.sent += 1
+        self.total_latency += latency
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+
+    @property
+    def avg_latency(self) -> float:
+        return self.total_latency / self.sent if self.sent else 0.0
+
+
+class WebSocketSender:
+    """Send messages to a websocket client through a bounded delivery queue.
+
+    Subscription results (`data` messages) are subject to the overflow policy,
+    and coalesced by operation id. Protocol messages are never dropped.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        maxsize: int = 0,
+        policy: Union[OverflowPolicy, str] = OverflowPolicy.DROP_OLDEST,
+    ):
+        self.websocket = websocket
+        self.queue = DeliveryQueue(maxsize, policy)
+        self.metrics = DeliveryMetrics()
+
+    def send(self, message: dict):
+        """Queue a message, disconnecting the client on overflow."""
+        if self.queue.closed:
+            return
+        is_data = message.get("type") == "data"
+        try:
+            self.queue.put(message, key=message.get("id"), droppable=is_data)
+        except QueueOverflow:
+            get_event_loop().create_task(
+                self.websocket.close(code=WS_1013_TRY_AGAIN_LATER)
+            )
+
+    async def run(self):
+        """Send queued messages until the queue is closed or the client leaves."""
+        try:
+            while True:
+                delivery = await self.queue.get_delivery()
+                await self.websocket.send_json(delivery.value)
+                self.metrics.record(delivery)
+        except (QueueOverflow, WebSocketDisconnect):
+            pass
+        except RuntimeError:
+            # Starlette refuses to send once the websocket is closed
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Return delivery metrics of the connection."""
+        return {
+            "sent": self.metrics.sent,
+            "pending": len(self.queue),
+            "dropped": self.queue.dropped,
+            "coalesced": self.queue.coalesced,
+            "avg_latency": self.metrics.avg_latency,
+            "max_latency": self.metrics.max_latency,
+            "last_latency": self.metrics.last_latency,
+        }
+
+
+class QueuedWebSocket:
+    """Proxy a websocket, sending JSON messages through a `WebSocketSender`."""
+
+    def __init__(self, websocket: WebSocket, sender: WebSocketSender):
+        self._websocket = websocket
+        self.sender = sender
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._websocket, name)
+
+    async def send_json(self, data: Any):
+        self.sender.send(data)
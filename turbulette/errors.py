@@ -1,14 +1,22 @@
 """Unify error formatting in GraphQL responses."""
 
+from contextvars import ContextVar, Token
 from enum import Enum
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from ariadne import format_error
 from graphql import GraphQLError
 
 from turbulette import conf
 
-errors: Dict[str, Dict[str, List]] = {}
+ErrorsDict = Dict[str, Dict[str, List[str]]]
+
+_errors: "ContextVar[Optional[ErrorsDict]]" = ContextVar("errors", default=None)
+"""Errors added during the current request.
+
+Each request gets its own dict, set when the request starts,
+so concurrent requests never share errors.
+"""
 
 
 class ErrorCode(Enum):
@@ -66,11 +74,11 @@ class BaseError(Exception):
 
     error_code: Enum = ErrorCode.SERVER_ERROR
     fields: List[str] = ["*"]
-    extensions: dict = {}
+    extensions: dict
 
     def __init__(self, message: str = None):
-        self.extensions[conf.settings.TURBULETTE_ERROR_KEY] = {
-            self.error_code.name: self.fields
+        self.extensions = {
+            conf.settings.TURBULETTE_ERROR_KEY: {self.error_code.name: self.fields}
         }
         if not message:
             message = self.error_code.value
@@ -135,13 +143,34 @@ def error_formatter(error: GraphQLError, debug: bool = False):
     return formatted
 
 
+def start_errors_collection() -> Token:
+    """Collect errors added from now on in a new dict, until the request ends.
+
+    Returns:
+        Token: To give to `end_errors_collection` at the end of the request
+    """
+    return _errors.set({})
+
+
+def end_errors_collection(token: Token):
+    """Restore the errors collection in use before `start_errors_collection`."""
+    _errors.reset(token)
+
+
+def get_errors() -> ErrorsDict:
+    """Get errors added during the current request."""
+    errors = _errors.get()
+    if errors is None:
+        # Outside a request, errors are collected for the current context only
+        errors = {}
+        _errors.set(errors)
+    return errors
+
+
 def add_error(code: ErrorCode, fields: str = None):
     if not fields:
         fields = code.value
-    if conf.settings.TURBULETTE_ERROR_KEY not in errors:
-        errors[conf.settings.TURBULETTE_ERROR_KEY] = {code.name: [fields]}
-    elif (
-        code.name in errors[conf.settings.TURBULETTE_ERROR_KEY]
-        and fields not in errors[conf.settings.TURBULETTE_ERROR_KEY][code.name]
-    ):
-        errors[conf.settings.TURBULETTE_ERROR_KEY][code.name].append(fields)
+    codes = get_errors().setdefault(conf.settings.TURBULETTE_ERROR_KEY, {})
+    code_fields = codes.setdefault(code.name, [])
+    if fields not in code_fields:
+        code_fields.append(fields)
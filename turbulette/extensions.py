@@ -1,14 +1,200 @@
 """Defines Ariadne extensions."""
 
-from ariadne.types import Extension
+from inspect import isawaitable
+from time import perf_counter
+from typing import Any, List, Optional
 
-from turbulette.errors import errors
+from ariadne.contrib.tracing.utils import should_trace
+from ariadne.types import Extension, Resolver
+from graphql import GraphQLError, GraphQLResolveInfo, OperationDefinitionNode
+
+from turbulette import conf
+from turbulette.errors import (
+    BaseError,
+    ErrorCode,
+    end_errors_collection,
+    get_errors,
+    start_errors_collection,
+)
+from turbulette.metrics import metrics
+from turbulette.tracing import RESOLVER, Trace, activate_span, deactivate_span, tracer
+
+# Counted as errors in metrics, but not as policy denials
+GRAPHQL_ERROR = "GRAPHQL_ERROR"
+
+POLICY_DENIAL_CODES = frozenset(
+    (ErrorCode.QUERY_NOT_ALLOWED.name, ErrorCode.FIELD_NOT_ALLOWED.name)
+)
 
 
 class PolicyExtension(Extension):
+    """Add errors collected during the request to the response extensions."""
+
+    def __init__(self):
+        self._token = None
+
+    def request_started(self, context):
+        self._token = start_errors_collection()
+
+    def request_finished(self, context):
+        if self._token is not None:
+            end_errors_collection(self._token)
+            self._token = None
+
     def format(self, context):
-        messages = None
-        if errors:
-            messages = {**errors}
-            errors.clear()
-        return messages
+        errors = get_errors()
+        return {**errors} if errors else None
+
+
+class MetricsExtension(Extension):
+    """Record latency and errors of GraphQL operations.
+
+    Metrics are stored in [metrics][turbulette.metrics.metrics],
+    see the [metrics][turbulette.metrics] module for the list.
+
+    It must come after `PolicyExtension`, to count errors
+    collected during the request.
+    """
+
+    def __init__(self):
+        self.start = 0.0
+        self.sampled = False
+        self.operation: Optional[OperationDefinitionNode] = None
+
+    def request_started(self, context):
+        self.start = perf_counter()
+        self.sampled = metrics.sampled()
+
+    def resolve(
+        self, next_: Resolver, parent: Any, info: GraphQLResolveInfo, **kwargs
+    ):  # pylint: disable=invalid-overridden-method
+        if self.operation is None:
+            self.operation = info.operation
+        if not self.sampled or not should_trace(info):
+            return next_(parent, info, **kwargs)
+        start = perf_counter()
+        try:
+            result = next_(parent, info, **kwargs)
+        except Exception:
+            self._observe_resolver(info, start)
+            raise
+        if isawaitable(result):
+            return self._observe_awaitable(result, info, start)
+        self._observe_resolver(info, start)
+        return result
+
+    async def _observe_awaitable(self, result, info: GraphQLResolveInfo, start: float):
+        try:
+            return await result
+        finally:
+            self._observe_resolver(info, start)
+
+    @staticmethod
+    def _observe_resolver(info: GraphQLResolveInfo, start: float):
+        metrics.resolver_duration.observe(
+            (info.parent_type.name, info.field_name), perf_counter() - start
+        )
+
+    def has_errors(self, errors: List[GraphQLError], context):
+        for error in errors:
+            original = getattr(error, "original_error", None)
+            if isinstance(original, BaseError):
+                code = original.error_code.name
+            elif original is not None:
+                code = ErrorCode.SERVER_ERROR.name
+            else:
+                code = GRAPHQL_ERROR
+            metrics.errors.inc((code,))
+
+    def request_finished(self, context):
+        if self.operation is None:
+            # The operation was not executed
+            operation, operation_type = "", ""
+        else:
+            operation = self.operation.name.value if self.operation.name else ""
+            operation_type = self.operation.operation.value
+        metrics.operation_duration.observe(
+            (operation, operation_type), perf_counter() - self.start
+        )
+        codes = get_errors().get(conf.settings.TURBULETTE_ERROR_KEY, {})
+        for code, fields in codes.items():
+            metrics.errors.inc((code,), len(fields))
+            if code in POLICY_DENIAL_CODES:
+                metrics.policy_denials.inc((operation, code), len(fields))
+
+
+class TracingExtension(Extension):
+    """Trace sampled GraphQL operations.
+
+    Traces are collected by [tracer][turbulette.tracing.tracer],
+    see the [tracing][turbulette.tracing] module for what they contain.
+    """
+
+    def __init__(self):
+        self.trace: Optional[Trace] = None
+        self.token = None
+        self.named = False
+
+    def request_started(self, context):
+        if tracer.sampled():
+            self.trace = tracer.start_trace("graphql")
+            self.token = activate_span(self.trace.root)
+
+    def resolve(
+        self, next_: Resolver, parent: Any, info: GraphQLResolveInfo, **kwargs
+    ):  # pylint: disable=invalid-overridden-method
+        if self.trace is None:
+            return next_(parent, info, **kwargs)
+        if not self.named:
+            self._name_operation(info.operation)
+        if not should_trace(info):
+            return next_(parent, info, **kwargs)
+        span = self.trace.start_span(
+            f"{info.parent_type.name}.{info.field_name}",
+            RESOLVER,
+            attributes={
+                "graphql.field.path": ".".join(str(key) for key in info.path.as_list())
+            },
+        )
+        try:
+            result = next_(parent, info, **kwargs)
+        except Exception as error:
+            self.trace.finish_span(span, error)
+            raise
+        if isawaitable(result):
+            return self._trace_awaitable(result, span)
+        self.trace.finish_span(span)
+        return result
+
+    async def _trace_awaitable(self, result, span):
+        # Database queries run while awaiting are attached to this span
+        token = activate_span(span)
+        try:
+            result = await result
+        except Exception as error:
+            self.trace.finish_span(span, error)
+            raise
+        finally:
+            deactivate_span(token)
+        self.trace.finish_span(span)
+        return result
+
+    def _name_operation(self, operation: OperationDefinitionNode):
+        self.named = True
+        root = self.trace.root
+        operation_type = operation.operation.value
+        root.attributes["graphql.operation.type"] = operation_type
+        if operation.name:
+            root.name = f"{operation_type} {operation.name.value}"
+            root.attributes["graphql.operation.name"] = operation.name.value
+        else:
+            root.name = operation_type
+
+    def has_errors(self, errors: List[GraphQLError], context):
+        if self.trace is not None:
+            self.trace.root.error = "; ".join(error.message for error in errors)
+
+    def request_finished(self, context):
+        if self.trace is not None:
+            deactivate_span(self.token)
+            tracer.finish_trace(self.trace)
@@ -0,0 +1,501 @@
+"""The ASGI GraphQL application serving the Turbulette schema."""
+
+from asyncio import Future, Queue, ensure_future
+from copy import deepcopy
+from inspect import isawaitable
+from typing import Any, AsyncGenerator, Dict, List, Optional, Set, Tuple, Union
+
+from ariadne.asgi import GQL_ERROR, ExtensionList, GraphQL
+from ariadne.exceptions import HttpError
+from ariadne.extensions import ExtensionManager
+from ariadne.graphql import (
+    handle_graphql_errors,
+    handle_query_result,
+    parse_query,
+    validate_data,
+    validate_query,
+)
+from ariadne.logger import log_error
+from ariadne.types import GraphQLResult
+from graphql import (
+    DocumentNode,
+    ExecutionContext,
+    ExecutionResult,
+    GraphQLError,
+    GraphQLSchema,
+    MiddlewareManager,
+    execute,
+)
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.websockets import WebSocket, WebSocketDisconnect, WebSocketState
+
+from turbulette.complexity import QueryComplexity
+from turbulette.delivery import OverflowPolicy, QueuedWebSocket, WebSocketSender
+from turbulette.incremental import (
+    MULTIPART_CONTENT_TYPE,
+    IncrementalExecutionContext,
+    accepts_multipart,
+    execute_incremental,
+    multipart_end,
+    multipart_part,
+)
+from turbulette.persisted_queries import PersistedQueries, query_hash
+from turbulette.serializers import JSONResponse, Serializer, json_dumps
+from turbulette.utils import LRUCache
+
+
+class DocumentCache:
+    """Bounded LRU of parsed and validated documents, keyed by query hash.
+
+    Documents are only valid for the schema they were validated against,
+    the cache is emptied when it's used with another schema.
+    """
+
+    def __init__(self, maxsize: int):
+        """Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of documents to keep
+        """
+        self.documents = LRUCache(maxsize)
+        self.schema: Optional[GraphQLSchema] = None
+
+    def get(self, schema: GraphQLSchema, query: str) -> Optional[DocumentNode]:
+        """Get the document of a query already validated against `schema`."""
+        if schema is not self.schema:
+            self.documents.clear()
+            self.schema = schema
+        return self.documents.get(query_hash(query))
+
+    def set(self, schema: GraphQLSchema, query: str, document: DocumentNode):
+        """Store the document of a query successfully validated against `schema`."""
+        if schema is self.schema:
+            self.documents.set(query_hash(query), document)
+
+    @property
+    def hits(self) -> int:
+        return self.documents.hits
+
+    @property
+    def misses(self) -> int:
+        return self.documents.misses
+
+    def stats(self) -> dict:
+        """Return cache metrics (hits, misses, hit ratio, size...)."""
+        return self.documents.stats()
+
+
+class TurbuletteGraphQL(GraphQL):
+    """Ariadne's ASGI GraphQL application, with persisted queries support.
+
+    Parsed and validated documents are cached, so known queries
+    are executed right away. The depth and cost of operations
+    are checked before execution.
+
+    Messages sent to websocket clients go through a bounded queue
+    per connection, so slow clients can't make the server buffer
+    subscription results indefinitely.
+
+    Queries using `@defer` or `@stream` are delivered incrementally
+    to clients accepting `multipart/mixed` responses.
+    """
+
+    def __init__(
+        self,
+        *args,
+        persisted_queries: Optional[PersistedQueries] = None,
+        document_cache_size: int = 0,
+        query_complexity: Optional[QueryComplexity] = None,
+        subscription_queue_size: int = 0,
+        subscription_overflow_policy: Union[
+            OverflowPolicy, str
+        ] = OverflowPolicy.DROP_OLDEST,
+        json_serializer: Serializer = json_dumps,
+        stream_chunk_size: int = IncrementalExecutionContext.chunk_size,
+        **kwargs,
+    ):
+        """Initialize the application.
+
+        Args:
+            persisted_queries (PersistedQueries, optional): Store used to resolve
+                persisted queries. Defaults to None (persisted queries disabled).
+            document_cache_size (int, optional): Maximum number of parsed and
+                validated documents to keep. Defaults to 0 (no cache).
+            query_complexity (QueryComplexity, optional): Limits on the depth
+                and cost of operations. Defaults to None (no limits).
+            subscription_queue_size (int, optional): Maximum number of messages
+                pending for a websocket connection. Defaults to 0 (no limit).
+            subscription_overflow_policy (Union[OverflowPolicy, str], optional):
+                What to do when a connection queue is full.
+                Defaults to `OverflowPolicy.DROP_OLDEST`.
+            json_serializer (Serializer, optional): Encode JSON responses.
+                Defaults to `json_dumps` (standard library).
+            stream_chunk_size (int, optional): Number of items sent
+                in each subsequent payload of `@stream` fields. Defaults to 100.
+
+        Other arguments are passed to Ariadne's `GraphQL`.
+        """
+        self.persisted_queries = persisted_queries
+        self.query_complexity = query_complexity
+        self.document_cache = (
+            DocumentCache(document_cache_size) if document_cache_size > 0 else None
+        )
+        self.subscription_queue_size = subscription_queue_size
+        self.subscription_overflow_policy = OverflowPolicy(subscription_overflow_policy)
+        self.websocket_senders: Set[WebSocketSender] = set()
+        self.json_serializer = json_serializer
+        self.stream_chunk_size = stream_chunk_size
+        super().__init__(*args, **kwargs)
+
+    async def extract_data_from_request(self, request: Request) -> Any:
+        data = await super().extract_data_from_request(request)
+        if self.persisted_queries is not None:
+            data = await self.persisted_queries.resolve(data)
+        return data
+
+    async def graphql_http_server(self, request: Request) -> Response:
+        try:
+            data = await self.extract_data_from_request(request)
+        except HttpError as error:
+            return PlainTextResponse(error.message or error.status, status_code=400)
+        except GraphQLError as error:
+            # Apollo clients expect persisted query errors with a 200 status code
+            return JSONResponse(
+                {"errors": [self.error_formatter(error, self.debug)]},
+                serializer=self.json_serializer,
+            )
+
+        context_value = await self.get_context_for_request(request)
+        extensions = await self.get_extensions_for_request(request, context_value)
+        middleware = await self.get_middleware_for_request(request, context_value)
+
+        if accepts_multipart(request.headers.get("accept", "")):
+            success, response, payloads = await self.execute_incremental_query(
+                data, context_value, extensions, middleware
+            )
+            if payloads is not None:
+                return StreamingResponse(payloads, media_type=MULTIPART_CONTENT_TYPE)
+        else:
+            success, response = await self.execute_query(
+                data, context_value, extensions, middleware
+            )
+        status_code = 200 if success else 400
+        return JSONResponse(
+            response, status_code=status_code, serializer=self.json_serializer
+        )
+
+    async def execute_incremental_query(
+        self,
+        data: Any,
+        context_value: Any,
+        extensions: ExtensionList,
+        middleware: Optional[MiddlewareManager],
+    ) -> Tuple[bool, dict, Optional[AsyncGenerator[bytes, None]]]:
+        """Execute a GraphQL request, delivering root `@defer` and `@stream` later.
+
+        The request runs in its own task until the last payload, so extensions
+        see subsequent payloads within the request, in the same context.
+
+        Returns:
+            Success, the initial response, and its multipart payloads
+            if there are subsequent payloads to deliver, `None` otherwise
+        """
+        queue: "Queue[Any]" = Queue()
+        task = ensure_future(
+            self.incremental_request(queue, data, context_value, extensions, middleware)
+        )
+        first = await queue.get()
+        if isinstance(first, Exception):
+            raise first
+        success, response, initial = first
+        if initial is None:
+            await task
+            return success, response, None
+        return success, response, self.incremental_payloads(initial, queue, task)
+
+    async def incremental_request(
+        self,
+        queue: "Queue[Any]",
+        data: Any,
+        context_value: Any,
+        extensions: ExtensionList,
+        middleware: Optional[MiddlewareManager],
+    ):
+        """Put the initial result, then encoded subsequent payloads, on `queue`.
+
+        `None` is put when the request is finished, after the exception
+        that ended it if any.
+        """
+        extension_manager = ExtensionManager(extensions, context_value)
+        try:
+            with extension_manager.request():
+                incremental: Dict[str, Any] = {}
+                success, response = await self.execute_request(
+                    data, context_value, extension_manager, middleware, incremental
+                )
+                context = incremental.get("context")
+                if context is None:
+                    queue.put_nowait((success, response, None))
+                    return
+                # Encoded right away, before errors of subsequent payloads are added
+                initial = multipart_part(
+                    self.json_serializer({**response, "hasNext": True})
+                )
+                queue.put_nowait((success, response, initial))
+
+                reported = deepcopy(response.get("extensions"))
+                pending = None
+                async for entry in context.incremental_results():
+                    if pending is not None:
+                        queue.put_nowait(multipart_part(self.json_serializer(pending)))
+                    if "errors" in entry:
+                        extension_manager.has_errors(entry["errors"])
+                    pending = {
+                        "incremental": [self.format_incremental_entry(entry)],
+                        "hasNext": True,
+                    }
+                    extensions_data = extension_manager.format()
+                    if extensions_data and extensions_data != reported:
+                        reported = deepcopy(extensions_data)
+                        pending["extensions"] = reported
+                last: Dict[str, Any] = {"hasNext": False}
+                if pending is not None:
+                    last = {**pending, **last}
+                queue.put_nowait(multipart_part(self.json_serializer(last)))
+                queue.put_nowait(multipart_end())
+        except Exception as error:  # pylint: disable=broad-except
+            queue.put_nowait(error)
+        finally:
+            queue.put_nowait(None)
+
+    async def incremental_payloads(
+        self, initial: bytes, queue: "Queue[Any]", request: Future
+    ) -> AsyncGenerator[bytes, None]:
+        """Yield multipart parts put on `queue` by `incremental_request`."""
+        try:
+            yield initial
+            while True:
+                part = await queue.get()
+                if part is None:
+                    break
+                if isinstance(part, Exception):
+                    raise part
+                yield part
+        finally:
+            # The client may be gone before the last payload
+            request.cancel()
+
+    def format_incremental_entry(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        if "errors" in entry:
+            for error in entry["errors"]:
+                log_error(error, self.logger)
+            entry["errors"] = [
+                self.error_formatter(error, self.debug) for error in entry["errors"]
+            ]
+        return entry
+
+    async def websocket_server(self, websocket: WebSocket) -> None:
+        sender = WebSocketSender(
+            websocket, self.subscription_queue_size, self.subscription_overflow_policy
+        )
+        queued_websocket = QueuedWebSocket(websocket, sender)
+        subscriptions: Dict[str, AsyncGenerator] = {}
+        await websocket.accept("graphql-ws")
+        self.websocket_senders.add(sender)
+        sending = ensure_future(sender.run())
+        try:
+            while (
+                websocket.client_state != WebSocketState.DISCONNECTED
+                and websocket.application_state != WebSocketState.DISCONNECTED
+            ):
+                message = await websocket.receive_json()
+                await self.handle_websocket_message(
+                    message, queued_websocket, subscriptions
+                )
+        except WebSocketDisconnect:
+            pass
+        finally:
+            for operation_id in subscriptions:
+                await subscriptions[operation_id].aclose()
+            sending.cancel()
+            self.websocket_senders.discard(sender)
+
+    async def start_websocket_subscription(
+        self,
+        data: Any,
+        operation_id: str,
+        websocket: WebSocket,
+        subscriptions: Dict[str, AsyncGenerator],
+    ):
+        if self.persisted_queries is not None:
+            # Operations sent over websockets go through the allow-list too
+            try:
+                data = await self.persisted_queries.resolve(data)
+            except GraphQLError as error:
+                await websocket.send_json(
+                    {
+                        "type": GQL_ERROR,
+                        "id": operation_id,
+                        "payload": self.error_formatter(error, self.debug),
+                    }
+                )
+                return
+        await super().start_websocket_subscription(
+            data, operation_id, websocket, subscriptions
+        )
+
+    def subscription_stats(self) -> List[Dict[str, Any]]:
+        """Return delivery metrics of open websocket connections."""
+        return [sender.stats() for sender in self.websocket_senders]
+
+    def get_document(
+        self, query: str, context_value: Any, data: dict
+    ) -> Tuple[DocumentNode, List[GraphQLError]]:
+        """Parse and validate a query, or get its document from the cache.
+
+        Documents are not cached when validation rules depend on the request.
+
+        Returns:
+            Tuple[DocumentNode, List[GraphQLError]]: The document and validation errors
+        """
+        cacheable = self.document_cache is not None and not callable(
+            self.validation_rules
+        )
+        if cacheable:
+            document = self.document_cache.get(self.schema, query)
+            if document is not None:
+                return document, []
+
+        document = parse_query(query)
+        validation_rules = self.validation_rules
+        if callable(validation_rules):
+            validation_rules = validation_rules(context_value, document, data)
+        errors = validate_query(
+            self.schema,
+            document,
+            validation_rules,
+            enable_introspection=self.introspection,
+        )
+        if cacheable and not errors:
+            self.document_cache.set(self.schema, query, document)
+        return document, errors
+
+    async def execute_query(
+        self,
+        data: Any,
+        context_value: Any,
+        extensions: ExtensionList,
+        middleware: Optional[MiddlewareManager],
+    ) -> GraphQLResult:
+        """Execute a GraphQL request, like Ariadne's `graphql` does.
+
+        Returns:
+            GraphQLResult: Success and the response data
+        """
+        extension_manager = ExtensionManager(extensions, context_value)
+        with extension_manager.request():
+            return await self.execute_request(
+                data, context_value, extension_manager, middleware
+            )
+
+    async def execute_request(
+        self,
+        data: Any,
+        context_value: Any,
+        extension_manager: ExtensionManager,
+        middleware: Optional[MiddlewareManager],
+        incremental: Optional[Dict[str, Any]] = None,
+    ) -> GraphQLResult:
+        """Execute a GraphQL request, within the request of `extension_manager`.
+
+        Args:
+            incremental (dict, optional): If given, root `@defer` and `@stream`
+                selections are executed after the initial result, and
+                the execution context delivering them is set under `context`
+
+        Returns:
+            GraphQLResult: Success and the response data
+        """
+        try:
+            validate_data(data)
+            query, variables, operation_name = (
+                data["query"],
+                data.get("variables"),
+                data.get("operationName"),
+            )
+
+            document, validation_errors = self.get_document(query, context_value, data)
+            throttle = None
+            if not validation_errors and self.query_complexity is not None:
+                validation_errors, cost = self.query_complexity.validate(
+                    self.schema, document, variables, operation_name
+                )
+                if self.query_complexity.throttled(cost):
+                    throttle = self.query_complexity.semaphore
+            if validation_errors:
+                return handle_graphql_errors(
+                    validation_errors,
+                    logger=self.logger,
+                    error_formatter=self.error_formatter,
+                    debug=self.debug,
+                    extension_manager=extension_manager,
+                )
+
+            root_value = self.root_value
+            if callable(root_value):
+                root_value = root_value(context_value, document)
+                if isawaitable(root_value):
+                    root_value = await root_value
+
+            execution = self._execute(
+                document,
+                incremental,
+                root_value=root_value,
+                context_value=context_value,
+                variable_values=variables,
+                operation_name=operation_name,
+                middleware=extension_manager.as_middleware_manager(middleware),
+            )
+            if throttle is None:
+                result = await execution
+            else:
+                # Expensive operations wait for a free slot
+                async with throttle:
+                    result = await execution
+        except GraphQLError as error:
+            return handle_graphql_errors(
+                [error],
+                logger=self.logger,
+                error_formatter=self.error_formatter,
+                debug=self.debug,
+                extension_manager=extension_manager,
+            )
+        else:
+            return handle_query_result(
+                result,
+                logger=self.logger,
+                error_formatter=self.error_formatter,
+                debug=self.debug,
+                extension_manager=extension_manager,
+            )
+
+    async def _execute(
+        self,
+        document: DocumentNode,
+        incremental: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> ExecutionResult:
+        if incremental is not None:
+            result, context = await execute_incremental(
+                self.schema, document, chunk_size=self.stream_chunk_size, **kwargs
+            )
+            if context is not None:
+                incremental["context"] = context
+            return result
+        result = execute(
+            self.schema, document, execution_context_class=ExecutionContext, **kwargs
+        )
+        if isawaitable(result):
+            result = await result
+        return result
@@ -0,0 +1,338 @@
+"""Incremental delivery of query results, with the `@defer` and `@stream` directives.
+
+When the client accepts `multipart/mixed` responses, the initial payload
+is sent as soon as it's ready, and the rest of the result follows
+in subsequent payloads:
+
+- Fragments marked with `@defer` are executed after the initial payload
+- List fields marked with `@stream` only return their first `initialCount`
+  items in the initial payload, other items are sent in chunks
+
+```graphql
+query {
+    books @stream(initialCount: 10) {
+        title
+    }
+    ... @defer(label: "stats") {
+        borrowingsCount
+    }
+}
+```
+
+Resolvers of streamed fields can return an async iterator, so items
+are only produced as they are sent.
+
+Only fragments and fields selected directly on the query root are delivered
+incrementally. Nested directives, and directives used in mutations,
+are ignored: the fields are executed and returned in the initial payload.
+Clients not accepting `multipart/mixed` responses always get the full result.
+
+Payloads follow the incremental delivery format of the GraphQL
+`@defer`/`@stream` RFC (`incremental` entries and `hasNext`).
+"""
+
+from asyncio import gather
+from inspect import isawaitable
+from itertools import islice
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+from graphql import (
+    ExecutionContext,
+    ExecutionResult,
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLOutputType,
+    GraphQLResolveInfo,
+    InlineFragmentNode,
+    SelectionNode,
+    SelectionSetNode,
+)
+from graphql.execution.execute import assert_valid_execution_arguments
+from graphql.execution.values import get_directive_values
+from graphql.language import OperationType
+from graphql.pyutils import Path
+from graphql.utilities import get_operation_root_type
+
+DEFER_DIRECTIVE = "defer"
+STREAM_DIRECTIVE = "stream"
+MULTIPART_MIXED = "multipart/mixed"
+MULTIPART_BOUNDARY = "-"
+MULTIPART_CONTENT_TYPE = (
+    f'{MULTIPART_MIXED}; boundary="{MULTIPART_BOUNDARY}"; deferSpec=20220824'
+)
+
+
+class DeferredFragment(NamedTuple):
+    label: Optional[str]
+    selection: SelectionNode
+
+
+class StreamedField(NamedTuple):
+    label: Optional[str]
+    item_type: GraphQLOutputType
+    field_nodes: List[FieldNode]
+    info: GraphQLResolveInfo
+    path: Path
+    items: Union[Iterator[Any], AsyncIterator[Any]]
+    start: int
+
+
+class IncrementalExecutionContext(ExecutionContext):
+    """Execution context keeping root `@defer` and `@stream` selections for later.
+
+    The initial result is produced by the regular execution,
+    then `incremental_results()` executes what's been put aside.
+    """
+
+    chunk_size = 100
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.deferred: List[DeferredFragment] = []
+        self.streams: List[StreamedField] = []
+        self.enabled = self.operation.operation == OperationType.QUERY
+
+    @property
+    def has_next(self) -> bool:
+        return bool(self.deferred or self.streams)
+
+    def directive_values(self, name: str, node: Any) -> Optional[Dict[str, Any]]:
+        """Return arguments of a directive applied on a node, if it's enabled."""
+        directive = self.schema.get_directive(name)
+        if directive is None:
+            return None
+        values = get_directive_values(directive, node, self.variable_values)
+        if values is None or not values.get("if", True):
+            return None
+        return values
+
+    def collect_fields(
+        self, runtime_type, selection_set, fields, visited_fragment_names
+    ):
+        if self.enabled and selection_set is self.operation.selection_set:
+            selections = []
+            for selection in selection_set.selections:
+                defer = (
+                    self.directive_values(DEFER_DIRECTIVE, selection)
+                    if isinstance(selection, (InlineFragmentNode, FragmentSpreadNode))
+                    else None
+                )
+                if defer is None:
+                    selections.append(selection)
+                else:
+                    self.deferred.append(
+                        DeferredFragment(defer.get("label"), selection)
+                    )
+            selection_set = SelectionSetNode(selections=selections)
+        return super().collect_fields(
+            runtime_type, selection_set, fields, visited_fragment_names
+        )
+
+    def complete_list_value(self, return_type, field_nodes, info, path, result):
+        stream = (
+            self.directive_values(STREAM_DIRECTIVE, field_nodes[0])
+            if self.enabled and path.prev is None
+            else None
+        )
+        if stream is None:
+            return super().complete_list_value(
+                return_type, field_nodes, info, path, result
+            )
+
+        initial_count = max(stream.get("initialCount") or 0, 0)
+        label = stream.get("label")
+        if hasattr(result, "__aiter__"):
+            items = result.__aiter__()
+
+            async def complete_initial():
+                initial = await _next_items(items, initial_count)
+                self.streams.append(
+                    StreamedField(
+                        label,
+                        return_type.of_type,
+                        field_nodes,
+                        info,
+                        path,
+                        items,
+                        len(initial),
+                    )
+                )
+                completed = super(
+                    IncrementalExecutionContext, self
+                ).complete_list_value(return_type, field_nodes, info, path, initial)
+                return await completed if isawaitable(completed) else completed
+
+            return complete_initial()
+
+        if not isinstance(result, Iterable) or isinstance(result, str):
+            # Let the regular completion raise the error
+            return super().complete_list_value(
+                return_type, field_nodes, info, path, result
+            )
+        items = iter(result)
+        initial = list(islice(items, initial_count))
+        self.streams.append(
+            StreamedField(
+                label, return_type.of_type, field_nodes, info, path, items, len(initial)
+            )
+        )
+        return super().complete_list_value(
+            return_type, field_nodes, info, path, initial
+        )
+
+    async def incremental_results(self) -> AsyncGenerator[Dict[str, Any], None]:
+        """Execute deferred fragments and remaining items of streamed fields.
+
+        Yields:
+            Incremental entries, with unformatted errors
+        """
+        root_type = get_operation_root_type(self.schema, self.operation)
+        for fragment in self.deferred:
+            errors_start = len(self.errors)
+            fields = super().collect_fields(
+                root_type, SelectionSetNode(selections=[fragment.selection]), {}, set()
+            )
+            try:
+                data = self.execute_fields(root_type, self.root_value, None, fields)
+                if isawaitable(data):
+                    data = await data
+            except GraphQLError as error:
+                data = None
+                self.errors.append(error)
+            yield self._entry({"data": data, "path": []}, fragment.label, errors_start)
+
+        for stream in self.streams:
+            index = stream.start
+            while True:
+                errors_start = len(self.errors)
+                items = await _next_items(stream.items, self.chunk_size)
+                if not items:
+                    break
+                try:
+                    completed = await self._complete_items(stream, index, items)
+                except GraphQLError as error:
+                    # A non-null item failed, the rest of the stream is dropped
+                    self.errors.append(error)
+                    yield self._entry(
+                        {"items": None, "path": stream.path.as_list() + [index]},
+                        stream.label,
+                        errors_start,
+                    )
+                    break
+                yield self._entry(
+                    {"items": completed, "path": stream.path.as_list() + [index]},
+                    stream.label,
+                    errors_start,
+                )
+                index += len(items)
+
+    async def _complete_items(
+        self, stream: StreamedField, start: int, items: List[Any]
+    ) -> List[Any]:
+        completed = [
+            self.complete_value_catching_error(
+                stream.item_type,
+                stream.field_nodes,
+                stream.info,
+                stream.path.add_key(start + offset),
+                item,
+            )
+            for offset, item in enumerate(items)
+        ]
+        awaitables = [i for i, value in enumerate(completed) if isawaitable(value)]
+        if awaitables:
+            results = await gather(*(completed[i] for i in awaitables))
+            for i, value in zip(awaitables, results):
+                completed[i] = value
+        return completed
+
+    def _entry(
+        self, entry: Dict[str, Any], label: Optional[str], errors_start: int
+    ) -> Dict[str, Any]:
+        if label is not None:
+            entry["label"] = label
+        if len(self.errors) > errors_start:
+            entry["errors"] = self.errors[errors_start:]
+        return entry
+
+
+async def _next_items(
+    items: Union[Iterator[Any], AsyncIterator[Any]], count: int
+) -> List[Any]:
+    """Take up to `count` items from a sync or async iterator."""
+    if not hasattr(items, "__anext__"):
+        return list(islice(items, count))  # type: ignore [arg-type]
+    taken: List[Any] = []
+    while len(taken) < count:
+        try:
+            taken.append(await items.__anext__())  # type: ignore [union-attr]
+        except StopAsyncIteration:
+            break
+    return taken
+
+
+async def execute_incremental(
+    schema,
+    document,
+    root_value: Any = None,
+    context_value: Any = None,
+    variable_values: Optional[Dict[str, Any]] = None,
+    operation_name: Optional[str] = None,
+    middleware: Any = None,
+    chunk_size: int = IncrementalExecutionContext.chunk_size,
+):
+    """Execute an operation, putting root `@defer` and `@stream` selections aside.
+
+    Returns:
+        The initial `ExecutionResult`, and the execution context
+        if there are incremental results to deliver, `None` otherwise
+    """
+    assert_valid_execution_arguments(schema, document, variable_values)
+    context = IncrementalExecutionContext.build(
+        schema,
+        document,
+        root_value,
+        context_value,
+        variable_values,
+        operation_name,
+        middleware=middleware,
+    )
+    if isinstance(context, list):
+        return ExecutionResult(data=None, errors=context), None
+    context.chunk_size = chunk_size
+
+    data = context.execute_operation(context.operation, root_value)
+    result = context.build_response(data)
+    if isawaitable(result):
+        result = await result
+    # Errors of subsequent payloads are reported separately
+    context.errors = []
+    return result, context if context.has_next else None
+
+
+def accepts_multipart(accept: str) -> bool:
+    """Tell if an `Accept` header allows incremental delivery."""
+    return MULTIPART_MIXED in accept
+
+
+def multipart_part(payload: bytes) -> bytes:
+    return (
+        f"\r\n--{MULTIPART_BOUNDARY}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n\r\n"
+    ).encode() + payload
+
+
+def multipart_end() -> bytes:
+    return f"\r\n--{MULTIPART_BOUNDARY}--\r\n".encode()
@@ -1,17 +1,24 @@
 """Expose functions to instantiate a Turbulette instance."""
 
 from importlib import import_module
-from typing import List, Type
+from typing import List, Optional, Type
 
-from ariadne.asgi import GraphQL
 from ariadne.types import Extension
 from caches import Cache
 from gino import Gino  # type: ignore [attr-defined]
 
 from turbulette import conf
 from turbulette.cache import cache
+from turbulette.complexity import QueryComplexity
+from turbulette.conf.utils import freeze_settings
 from turbulette.errors import error_formatter
-from turbulette.extensions import PolicyExtension
+from turbulette.extensions import MetricsExtension, PolicyExtension, TracingExtension
+from turbulette.graphql_app import TurbuletteGraphQL
+from turbulette.metrics import Metrics, metrics
+from turbulette.persisted_queries import PersistedQueries
+from turbulette.pubsub import Broker, broker
+from turbulette.serializers import get_serializer
+from turbulette.tracing import Tracer, tracer
 from turbulette.utils import get_project_settings
 
 from .apps import Registry
@@ -25,7 +32,39 @@ def get_gino_instance() -> Gino:
     return database
 
 
-def setup(project_settings: str = None, database: bool = False) -> GraphQL:
+def get_persisted_queries() -> Optional[PersistedQueries]:
+    """Create the persisted queries store, if enabled, and load the allow-list."""
+    if not conf.settings.PERSISTED_QUERIES_ENABLED:
+        return None
+    persisted_queries = PersistedQueries(conf.settings.PERSISTED_QUERIES_ONLY)
+    if conf.settings.PERSISTED_QUERIES_ALLOW_LIST:
+        persisted_queries.load(conf.settings.PERSISTED_QUERIES_ALLOW_LIST)
+    return persisted_queries
+
+
+def get_query_complexity() -> Optional[QueryComplexity]:
+    """Create the query complexity analyzer, if any limit is set."""
+    settings = conf.settings
+    if not (
+        settings.QUERY_MAX_DEPTH
+        or settings.QUERY_MAX_COST
+        or settings.QUERY_THROTTLE_COST
+    ):
+        return None
+    return QueryComplexity(
+        max_depth=settings.QUERY_MAX_DEPTH,
+        max_cost=settings.QUERY_MAX_COST,
+        throttle_cost=settings.QUERY_THROTTLE_COST,
+        throttle_concurrency=settings.QUERY_THROTTLE_CONCURRENCY,
+    )
+
+
+def _import_class(path: str) -> type:
+    module, class_ = path.rsplit(".", 1)
+    return getattr(import_module(module), class_)
+
+
+def setup(project_settings: str = None, database: bool = False) -> TurbuletteGraphQL:
     """Load Turbulette applications and return the GraphQL route."""
     project_settings_module = import_module(get_project_settings(project_settings))
 
@@ -45,21 +84,45 @@ def setup(project_settings: str = None, database: bool = False) -> GraphQL:
     # Now that the database connection is established, we can use `settings`
 
     cache.__setup__(Cache(settings.CACHE))
+    broker.__setup__(
+        Broker(
+            settings.PUBSUB,
+            queue_size=settings.SUBSCRIPTION_QUEUE_SIZE,
+            overflow_policy=settings.SUBSCRIPTION_OVERFLOW_POLICY,
+        )
+    )
+
+    metrics.__setup__(Metrics(sample_rate=settings.METRICS_SAMPLE_RATE))
+    tracer.__setup__(
+        Tracer(
+            sample_rate=settings.TRACING_SAMPLE_RATE,
+            slow_resolver_threshold=settings.TRACING_SLOW_RESOLVER_THRESHOLD,
+            buffer_size=settings.TRACING_BUFFER_SIZE,
+            exporters=[_import_class(path)() for path in settings.TRACING_EXPORTERS],
+        )
+    )
 
     extensions: List[Type[Extension]] = [PolicyExtension]
+    if settings.METRICS_ENABLED:
+        extensions.append(MetricsExtension)
+    if settings.TRACING_ENABLED:
+        extensions.append(TracingExtension)
     for ext in settings.ARIADNE_EXTENSIONS:
-        module_class = ext.rsplit(".", 1)
-        extensions.append(
-            getattr(
-                import_module(module_class[0]),
-                module_class[1],
-            )
-        )
+        extensions.append(_import_class(ext))
 
-    graphql_route = GraphQL(
+    graphql_route = TurbuletteGraphQL(
         schema,
         debug=settings.DEBUG,
         extensions=extensions,
         error_formatter=error_formatter,
+        persisted_queries=get_persisted_queries(),
+        document_cache_size=settings.DOCUMENT_CACHE_SIZE,
+        query_complexity=get_query_complexity(),
+        subscription_queue_size=settings.SUBSCRIPTION_QUEUE_SIZE,
+        subscription_overflow_policy=settings.SUBSCRIPTION_OVERFLOW_POLICY,
+        json_serializer=get_serializer(settings.JSON_SERIALIZER),
+        stream_chunk_size=settings.STREAM_CHUNK_SIZE,
     )
+    if settings.FREEZE_SETTINGS:
+        freeze_settings(settings)
     return graphql_route
@@ -2,6 +2,7 @@
 
 import asyncio
 import configparser
+from importlib import import_module
 from os import chdir, environ, remove, sep
 from pathlib import Path
 from pprint import pprint
@@ -16,12 +17,15 @@ from click.exceptions import ClickException
 from jwcrypto import jwk
 
 from turbulette import conf, turbulette_starlette
+from turbulette.apps import Registry
+from turbulette.apps.snapshot import SchemaSnapshot
 from turbulette.conf.constants import (
     FILE_ALEMBIC_INI,
     FOLDER_MIGRATIONS,
     PROJECT_SETTINGS_MODULE,
     TEST_MODE,
 )
+from turbulette.main import get_gino_instance
 from turbulette.utils import get_project_settings
 
 TEMPLATE_FILES = ["app.py", ".env", "settings.py"]
@@ -264,6 +268,43 @@ def makerevision(app, message):
     revision(config, message=message, autogenerate=True, head=f"{app}@head")
 
 
+@click.command(
+    help=(
+        "Write a validated schema snapshot, loaded at startup"
+        " instead of parsing GraphQL files as long as they don't change."
+        " Written to the SCHEMA_SNAPSHOT setting path unless --output is given"
+    )
+)
+@click.option("--output", "-o", help="Snapshot path", default=None)
+def snapshot(output):
+    try:
+        project_settings = import_module(get_project_settings(guess=True))
+    except ModuleNotFoundError as error:  # pragma: no cover
+        raise click.ClickException(
+            "Project settings module not found, are you in the project directory?"
+            f" You may want to set the {PROJECT_SETTINGS_MODULE}"
+            " environment variable."
+        ) from error
+
+    get_gino_instance()
+    registry = Registry(project_settings_module=project_settings)
+    conf.registry.__setup__(registry)
+    # Build the schema from GraphQL files, validating it
+    registry.setup(use_snapshot=False)
+    if conf.settings.APOLLO_FEDERATION:
+        raise click.ClickException(
+            "Schema snapshots are not supported with APOLLO_FEDERATION"
+        )
+    path = output or conf.settings.SCHEMA_SNAPSHOT
+    if not path:
+        raise click.ClickException(
+            "No snapshot path, set SCHEMA_SNAPSHOT or pass the --output option"
+        )
+    schema_snapshot = SchemaSnapshot.build(registry.type_defs)
+    schema_snapshot.save(path)
+    click.echo(f"Schema snapshot written to {path} (hash {schema_snapshot.hash})")
+
+
 @click.command(help="Create a user using the AUTH_USER_MODEL setting")
 @click.argument("username", nargs=1)
 @click.argument("password", nargs=1)
@@ -306,5 +347,6 @@ cli.add_command(project)
 cli.add_command(app_, "app")
 cli.add_command(upgrade)
 cli.add_command(makerevision)
+cli.add_command(snapshot)
 cli.add_command(jwk_, "jwk")
 cli.add_command(create_user_cmd, "createuser")
@@ -0,0 +1,248 @@
+"""Collect metrics about GraphQL operations, in the Prometheus text format.
+
+Metrics are recorded by the
+[MetricsExtension][turbulette.extensions.MetricsExtension]:
+
+- `graphql_operation_duration_seconds`: histogram of operation durations,
+  by operation name and type
+- `graphql_resolver_duration_seconds`: histogram of resolver durations,
+  by parent type and field. Default resolvers are not measured
+- `graphql_errors_total`: errors by `ErrorCode` name. Errors without
+  a Turbulette error code are counted as `GRAPHQL_ERROR`
+- `graphql_policy_denials_total`: fields or queries denied by policies,
+  by operation name and error code
+
+Anonymous operations, and requests failing before execution,
+have an empty operation name.
+
+Resolvers are only measured in sampled requests, as measuring all fields
+has a cost. Other metrics are recorded for all requests.
+
+Metrics are kept per process: when running multiple workers,
+each one exposes its own metrics.
+"""
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from random import random
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from turbulette.utils import LazyInitMixin
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    7.5,
+    10.0,
+)
+
+# Label value used once a metric has reached its maximum number of series
+OTHER_LABEL = "__other__"
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class Metric(ABC):
+    """Base class for metrics with labels.
+
+    The number of series is bounded, as label values may come
+    from clients (operation names). Past `max_series`, new label values
+    are recorded as `__other__`.
+    """
+
+    kind = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str],
+        max_series: int,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.max_series = max_series
+
+    def _series_key(self, series: dict, labels: Labels) -> Labels:
+        if labels in series or len(series) < self.max_series:
+            return labels
+        return tuple(OTHER_LABEL for _ in labels)
+
+    @abstractmethod
+    def samples(self) -> Iterable[str]:
+        """Yield the sample lines of each series."""
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self.samples(),
+        ]
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """A value that only goes up, per label values."""
+
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels, amount: float = 1):
+        """Add `amount` to the series of these label values."""
+        key = self._series_key(self.values, labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, labels: Labels) -> float:
+        return self.values.get(labels, 0)
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in sorted(self.values.items()):
+            yield (
+                f"{self.name}{_format_labels(self.label_names, labels)}"
+                f" {_format_value(value)}"
+            )
+
+
+class Histogram(Metric):
+    """Observed values counted in buckets, per label values."""
+
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: count of each bucket (not cumulative), +Inf included, and sum
+        self.series: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, labels: Labels, value: float):
+        """Count `value` in its bucket, in the series of these label values."""
+        key = self._series_key(self.series, labels)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    def count(self, labels: Labels) -> int:
+        series = self.series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def samples(self) -> Iterable[str]:
+        for labels, (counts, total) in sorted(self.series.items()):
+            cumulated = 0
+            bounds = [_format_value(b) for b in self.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, counts):
+                cumulated += count
+                bucket_labels = _format_labels(
+                    self.label_names, labels, f'le="{bound}"'
+                )
+                yield f"{self.name}_bucket{bucket_labels} {cumulated}"
+            series_labels = _format_labels(self.label_names, labels)
+            yield f"{self.name}_sum{series_labels} {_format_value(total[0])}"
+            yield f"{self.name}_count{series_labels} {cumulated}"
+
+
+class Metrics:
+    """Metrics recorded about GraphQL operations."""
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        max_series: int = 1000,
+    ):
+        """Initialize metrics.
+
+        Args:
+            sample_rate (float, optional): Ratio of requests in which resolvers
+                are measured, between 0 and 1. Defaults to 1.0.
+            buckets (Sequence[float], optional): Upper bounds of histogram buckets,
+                in seconds. Defaults to `DEFAULT_BUCKETS`.
+            max_series (int, optional): Maximum number of label combinations
+                per metric. Defaults to 1000.
+        """
+        self.sample_rate = sample_rate
+        self.operation_duration = Histogram(
+            "graphql_operation_duration_seconds",
+            "Duration of GraphQL operations.",
+            ("operation", "type"),
+            max_series,
+            buckets=buckets,
+        )
+        self.resolver_duration = Histogram(
+            "graphql_resolver_duration_seconds",
+            "Duration of GraphQL resolvers, in sampled requests.",
+            ("parent_type", "field"),
+            max_series,
+            buckets=buckets,
+        )
+        self.errors = Counter(
+            "graphql_errors_total",
+            "Errors returned in GraphQL responses, by error code.",
+            ("code",),
+            max_series,
+        )
+        self.policy_denials = Counter(
+            "graphql_policy_denials_total",
+            "Fields and queries denied by policies.",
+            ("operation", "code"),
+            max_series,
+        )
+
+    def sampled(self) -> bool:
+        """Tell if resolvers should be measured in a new request."""
+        return self.sample_rate >= 1 or random() < self.sample_rate  # nosec
+
+    def all(self) -> List[Metric]:
+        """Return all metrics, in the order they are rendered."""
+        return [
+            self.operation_duration,
+            self.resolver_duration,
+            self.errors,
+            self.policy_denials,
+        ]
+
+    def render(self) -> str:
+        """Render metrics in the Prometheus text exposition format."""
+        return "\n".join(metric.render() for metric in self.all()) + "\n"
+
+
+class LazyMetrics(LazyInitMixin, Metrics):
+    """Metrics set up with the `METRICS_*` settings when the app starts."""
+
+    def __init__(self):
+        super().__init__("metrics")
+
+
+metrics = LazyMetrics()
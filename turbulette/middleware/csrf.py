@@ -3,18 +3,15 @@
 # Adapted from https://github.com/piccolo-orm/piccolo_api
 
 from enum import Enum
+from http.cookies import SimpleCookie
 from string import ascii_letters, digits
 from typing import Tuple
 
-from starlette.datastructures import URL
+from starlette.datastructures import URL, MutableHeaders
 from starlette.exceptions import HTTPException
-from starlette.middleware.base import (
-    BaseHTTPMiddleware,
-    Request,
-    RequestResponseEndpoint,
-)
+from starlette.requests import Request
 from starlette.responses import Response
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from turbulette.conf import settings
 from turbulette.conf.exceptions import ImproperlyConfigured
@@ -62,7 +59,7 @@ def _is_valid_referer(request: Request) -> bool:
     return is_valid
 
 
-class CSRFMiddleware(BaseHTTPMiddleware):
+class CSRFMiddleware:
     """
     CSRF Middleware.
 
@@ -76,6 +73,9 @@ class CSRFMiddleware(BaseHTTPMiddleware):
     [Double Submit Cookie](https://cheatsheetseries.owasp.org/cheatsheets/Cross-Site_Request_Forgery_Prevention_Cheat_Sheet.html#double-submit-cookie)
     [Use of custom request headers](https://cheatsheetseries.owasp.org/cheatsheets/Cross-Site_Request_Forgery_Prevention_Cheat_Sheet.html#use-of-custom-request-headers)
 
+    This is a pure ASGI middleware: responses are streamed untouched,
+    only the `Set-Cookie` header is added when a new token is issued.
+
     !!! warning
         This is currently only intended for use using AJAX - since the CSRF token
         needs to be added to the request header.
@@ -87,12 +87,11 @@ class CSRFMiddleware(BaseHTTPMiddleware):
         cookie_name=settings.CSRF_COOKIE_NAME,
         header_name=settings.CSRF_HEADER_NAME,
         max_age=ONE_YEAR,
-        **kwargs,
     ):
+        self.app = app
         self.cookie_name = cookie_name
         self.header_name = header_name
         self.max_age = max_age
-        super().__init__(app, **kwargs)
 
     async def get_token_from_request(
         self, request: Request
@@ -103,6 +102,8 @@ class CSRFMiddleware(BaseHTTPMiddleware):
             token = request.headers.get(self.header_name, None)
             method = SubmitMethod.HEADER
         elif settings.CSRF_FORM_PARAM:
+            # Keep the body around so it can be replayed to the app
+            await request.body()
             form_data = await request.form()
             token = form_data.get(self.cookie_name, None)
             request.scope.update({"form": form_data})
@@ -120,7 +121,22 @@ class CSRFMiddleware(BaseHTTPMiddleware):
 
         return token, method
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint):
+    def _cookie_header(self, token: str) -> str:
+        """Build the `Set-Cookie` header value, like `Response.set_cookie`."""
+        cookie: SimpleCookie = SimpleCookie()
+        cookie[self.cookie_name] = token
+        cookie[self.cookie_name]["max-age"] = self.max_age
+        cookie[self.cookie_name]["path"] = "/"
+        cookie[self.cookie_name]["samesite"] = "lax"
+        return cookie.output(header="").strip()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope, receive)
+
         if request.method in SAFE_HTTP_METHODS:
             token = request.cookies.get(self.cookie_name, None)
             token_required = token is None
@@ -128,31 +144,41 @@ class CSRFMiddleware(BaseHTTPMiddleware):
             if token_required:
                 token = get_new_token()
 
-            request.scope.update({CSRF_REQUEST_SCOPE_NAME: token})
-            response = await call_next(request)
+            scope[CSRF_REQUEST_SCOPE_NAME] = token
 
             if token_required and token:
-                response.set_cookie(
-                    self.cookie_name,
-                    token,
-                    max_age=self.max_age,
-                )
-            return response
+                cookie = self._cookie_header(token)
+
+                async def send_with_cookie(message: Message):
+                    if message["type"] == "http.response.start":
+                        MutableHeaders(scope=message).append("set-cookie", cookie)
+                    await send(message)
+
+                await self.app(scope, receive, send_with_cookie)
+            else:
+                await self.app(scope, receive, send)
+            return
 
         cookie_token = request.cookies.get(self.cookie_name)
         if not cookie_token:
-            return Response("No CSRF cookie found", status_code=403)
+            response = Response("No CSRF cookie found", status_code=403)
+            await response(scope, receive, send)
+            return
 
         try:
             token, method = await self.get_token_from_request(request)
         except CSRFNotFound as error:
-            return Response(error.detail, status_code=403)
+            response = Response(error.detail, status_code=403)
+            await response(scope, receive, send)
+            return
 
         if token and (cookie_token != token):
-            return Response(
+            response = Response(
                 f"The CSRF token in the {method.value} doesn't match the cookie.",
                 status_code=403,
             )
+            await response(scope, receive, send)
+            return
 
         # Provides defense in depth:
         if request.base_url.is_secure:
@@ -161,8 +187,27 @@ class CSRFMiddleware(BaseHTTPMiddleware):
             # so only check it for HTTPS.
             # https://seclab.stanford.edu/websec/csrf/csrf.pdf
             if not _is_valid_referer(request):
-                return Response("Referrer or origin is incorrect", status_code=403)
+                response = Response("Referrer or origin is incorrect", status_code=403)
+                await response(scope, receive, send)
+                return
+
+        scope[CSRF_REQUEST_SCOPE_NAME] = cookie_token
+
+        if method is SubmitMethod.FORM:
+            receive = _replay_body(await request.body(), receive)
+
+        await self.app(scope, receive, send)
+
+
+def _replay_body(body: bytes, receive: Receive) -> Receive:
+    """Send back an already consumed request body, then defer to `receive`."""
+    body_sent = False
 
-        request.scope.update({CSRF_REQUEST_SCOPE_NAME: cookie_token})
+    async def replay() -> Message:
+        nonlocal body_sent
+        if body_sent:
+            return await receive()
+        body_sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
 
-        return await call_next(request)
+    return replay
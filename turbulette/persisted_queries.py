@@ -0,0 +1,168 @@
+"""Persisted queries, following the Apollo automatic persisted queries (APQ) protocol.
+
+Clients send the sha256 hash of a query instead of its full text.
+When the hash is unknown, the client sends the query again along with
+its hash so it can be stored, and only the hash afterwards.
+
+An allow-list of queries can be loaded at startup.
+Only queries from this list are accepted when `PERSISTED_QUERIES_ONLY` is `True`,
+over HTTP as well as for operations started over websockets.
+"""
+
+import json
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from graphql import GraphQLError
+
+from turbulette.cache import cache
+
+PERSISTED_QUERY_VERSION = 1
+CACHE_KEY_PREFIX = "turbulette:pq:"
+
+
+class PersistedQueryError(GraphQLError):
+    """Base class for persisted query errors."""
+
+    code = "PERSISTED_QUERY_ERROR"
+    default_message = "Invalid persisted query"
+
+    def __init__(self, message: str = None):
+        super().__init__(
+            message or self.default_message, extensions={"code": self.code}
+        )
+
+
+class PersistedQueryNotFound(PersistedQueryError):
+    """The hash is unknown, the client should send the full query."""
+
+    code = "PERSISTED_QUERY_NOT_FOUND"
+    default_message = "PersistedQueryNotFound"
+
+
+class PersistedQueryNotAllowed(PersistedQueryError):
+    """The query is not in the allow-list."""
+
+    code = "PERSISTED_QUERY_NOT_ALLOWED"
+    default_message = "PersistedQueryNotAllowed"
+
+
+def query_hash(query: str) -> str:
+    """Compute the hash identifying a persisted query.
+
+    Args:
+        query (str): The query text
+
+    Returns:
+        str: Hex digest of the sha256 hash
+    """
+    return sha256(query.encode("utf-8")).hexdigest()
+
+
+class PersistedQueries:
+    """Resolve persisted queries from the allow-list or the cache."""
+
+    def __init__(self, allow_list_only: bool = False):
+        """Initialize the store.
+
+        Args:
+            allow_list_only (bool, optional): Reject queries that are not
+                in the allow-list. Defaults to False.
+        """
+        self.allow_list_only = allow_list_only
+        self.allow_list: Dict[str, str] = {}
+
+    def load(self, path: str):
+        """Add queries from a JSON file to the allow-list.
+
+        The file holds either a list of queries, or an object
+        mapping sha256 hashes to queries.
+
+        Args:
+            path (str): Path of the JSON file
+
+        Raises:
+            ValueError: Raised if a hash doesn't match its query
+        """
+        with open(Path(path)) as file:
+            queries = json.load(file)
+        if isinstance(queries, list):
+            queries = {query_hash(query): query for query in queries}
+        for hash_, query in queries.items():
+            if query_hash(query) != hash_:
+                raise ValueError(f"Hash {hash_} doesn't match its query in {path}")
+        self.allow_list.update(queries)
+
+    async def get(self, hash_: str) -> Optional[str]:
+        """Get a query from its hash.
+
+        Args:
+            hash_ (str): sha256 hash of the query
+
+        Returns:
+            Optional[str]: The query, or `None` if it's unknown
+        """
+        query = self.allow_list.get(hash_)
+        if query is None and not self.allow_list_only:
+            query = await cache.get(CACHE_KEY_PREFIX + hash_)
+        return query
+
+    async def resolve(self, data: Any) -> Any:
+        """Fill the query of a GraphQL request sent with a hash only.
+
+        Queries sent with their hash are stored, so next requests
+        can omit them.
+
+        Args:
+            data (Any): The GraphQL request data
+
+        Raises:
+            PersistedQueryNotFound: Raised if the hash is unknown
+            PersistedQueryNotAllowed: Raised in allow-list mode
+                if the query is not in the list
+            PersistedQueryError: Raised if the persisted query
+                extension is invalid, or the hash doesn't match the query
+
+        Returns:
+            Any: The request data, with the query
+        """
+        if not isinstance(data, dict):
+            return data
+
+        extensions = data.get("extensions")
+        persisted = (
+            extensions.get("persistedQuery") if isinstance(extensions, dict) else None
+        )
+        query = data.get("query")
+
+        if persisted is None:
+            if self.allow_list_only and (
+                not isinstance(query, str) or query_hash(query) not in self.allow_list
+            ):
+                raise PersistedQueryNotAllowed()
+            return data
+
+        if (
+            not isinstance(persisted, dict)
+            or persisted.get("version") != PERSISTED_QUERY_VERSION
+            or not isinstance(persisted.get("sha256Hash"), str)
+        ):
+            raise PersistedQueryError("Unsupported persisted query version or hash")
+        hash_ = persisted["sha256Hash"]
+
+        if query is None:
+            query = await self.get(hash_)
+            if query is None:
+                if self.allow_list_only:
+                    raise PersistedQueryNotAllowed()
+                raise PersistedQueryNotFound()
+            return {**data, "query": query}
+
+        if not isinstance(query, str) or query_hash(query) != hash_:
+            raise PersistedQueryError("Provided sha does not match query")
+        if hash_ not in self.allow_list:
+            if self.allow_list_only:
+                raise PersistedQueryNotAllowed()
+            await cache.set(CACHE_KEY_PREFIX + hash_, query)
+        return data
@@ -0,0 +1,509 @@
+"""Publish and subscribe to events, to feed GraphQL subscriptions.
+
+The broker backend is chosen by the `PUBSUB` setting:
+
+- `memory://` : events are only delivered within the current process
+- `redis://[:password@]host[:port]` : events go through a Redis server
+  (or any server speaking the Redis protocol), so they reach subscribers
+  of all processes
+
+Usage in a subscription source:
+
+```python
+from turbulette import subscription
+from turbulette.pubsub import broker
+
+
+@subscription.source("bookAdded")
+async def book_added_source(obj, info):
+    async with broker.subscribe("books") as subscriber:
+        async for book in subscriber:
+            yield book
+```
+
+And to publish an event:
+
+```python
+await broker.publish("books", {"title": "Dune"})
+```
+"""
+
+import json
+import logging
+from abc import ABC, abstractmethod
+from asyncio import (
+    CancelledError,
+    IncompleteReadError,
+    Lock,
+    StreamReader,
+    StreamWriter,
+    ensure_future,
+    open_connection,
+    sleep,
+)
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    Type,
+    Union,
+)
+
+from starlette.datastructures import URL
+
+from turbulette.delivery import DeliveryQueue, OverflowPolicy, QueueOverflow
+from turbulette.utils import LazyInitMixin
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[str, str], None]
+ErrorHandler = Callable[[Exception], None]
+MessageKey = Callable[[Any], Hashable]
+
+
+class PubSubError(Exception):
+    """The broker backend returned an error."""
+
+
+class Subscriber:
+    """Receive messages published on a channel.
+
+    Pending messages are held in a bounded queue, see `turbulette.delivery`.
+    With the `disconnect` overflow policy, a subscriber falling behind
+    raises `QueueOverflow` when reading its next message.
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        queue: DeliveryQueue,
+        key: Optional[MessageKey] = None,
+    ):
+        self.channel = channel
+        self.queue = queue
+        self.key = key
+
+    def put(self, message: Any):
+        """Deliver a message to this subscriber."""
+        try:
+            self.queue.put(message, key=self.key(message) if self.key else None)
+        except QueueOverflow:
+            # The queue is closed, the consumer will get the error
+            pass
+
+    async def get(self) -> Any:
+        """Wait for the next message."""
+        return await self.queue.get()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Any:
+        return await self.get()
+
+
+class BrokerBackend(ABC):
+    """Transport messages between publishers and subscribed channels."""
+
+    def __init__(
+        self,
+        url: URL,
+        on_message: MessageHandler,
+        on_error: Optional[ErrorHandler] = None,
+    ):
+        """Initialize the backend.
+
+        Args:
+            url (URL): The broker URL
+            on_message (MessageHandler): Called with the channel and the raw message
+                for each message received on a subscribed channel
+            on_error (ErrorHandler, optional): Called when messages can no longer
+                be received, with the error. Defaults to None.
+        """
+        self.url = url
+        self.on_message = on_message
+        self.on_error = on_error
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        pass
+
+    @abstractmethod
+    async def subscribe(self, channel: str):
+        """Start receiving messages published on `channel`."""
+
+    @abstractmethod
+    async def unsubscribe(self, channel: str):
+        """Stop receiving messages published on `channel`."""
+
+    @abstractmethod
+    async def publish(self, channel: str, message: str):
+        """Publish a raw message on `channel`."""
+
+
+class MemoryBackend(BrokerBackend):
+    """Deliver messages within the current process."""
+
+    def __init__(
+        self,
+        url: URL,
+        on_message: MessageHandler,
+        on_error: Optional[ErrorHandler] = None,
+    ):
+        super().__init__(url, on_message, on_error)
+        self._channels: Set[str] = set()
+
+    async def subscribe(self, channel: str):
+        self._channels.add(channel)
+
+    async def unsubscribe(self, channel: str):
+        self._channels.discard(channel)
+
+    async def publish(self, channel: str, message: str):
+        if channel in self._channels:
+            self.on_message(channel, message)
+
+
+def _encode_command(*args: str) -> bytes:
+    """Encode a command using the Redis serialization protocol (RESP)."""
+    parts = [f"*{len(args)}\r\n".encode()]
+    for arg in args:
+        data = arg.encode("utf-8")
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def _read_reply(reader: StreamReader) -> Any:
+    """Read a reply encoded using the Redis serialization protocol (RESP)."""
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Connection closed by the pub/sub server")
+    kind, value = line[:1], line[1:-2]
+    if kind == b"+":
+        return value.decode("utf-8")
+    if kind == b"-":
+        raise PubSubError(value.decode("utf-8"))
+    if kind == b":":
+        return int(value)
+    if kind == b"$":
+        length = int(value)
+        if length == -1:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2].decode("utf-8")
+    if kind == b"*":
+        length = int(value)
+        if length == -1:
+            return None
+        return [await _read_reply(reader) for _ in range(length)]
+    raise PubSubError(f"Unexpected reply from the pub/sub server: {line!r}")
+
+
+class RedisBackend(BrokerBackend):
+    """Deliver messages through a server speaking the Redis protocol.
+
+    One connection is used to publish, and another one, dedicated
+    to subscriptions, receives messages from all subscribed channels.
+
+    When the subscription connection is lost, it's opened again and
+    subscribed channels are restored, retrying `reconnect_attempts` times
+    with an exponential backoff starting at `reconnect_delay` seconds.
+    Messages published in the meantime are lost. If all attempts fail,
+    the error is passed to `on_error`.
+
+    When the publishing connection is lost, it's opened again on the next
+    publish, and the message is sent once more.
+    """
+
+    reconnect_attempts = 5
+    reconnect_delay = 0.5
+
+    def __init__(
+        self,
+        url: URL,
+        on_message: MessageHandler,
+        on_error: Optional[ErrorHandler] = None,
+    ):
+        super().__init__(url, on_message, on_error)
+        self._publisher: Optional[Any] = None
+        self._subscriber: Optional[Any] = None
+        # Created on connection, so it's bound to the worker event loop
+        self._publish_lock: Optional[Lock] = None
+        self._listener: Optional[Any] = None
+        self._channels: Set[str] = set()
+
+    async def _open_connection(self):
+        reader, writer = await open_connection(
+            self.url.hostname or "localhost", self.url.port or 6379
+        )
+        if self.url.password:
+            writer.write(_encode_command("AUTH", self.url.password))
+            await _read_reply(reader)
+        return reader, writer
+
+    async def connect(self):
+        self._publish_lock = Lock()
+        self._publisher = await self._open_connection()
+        self._subscriber = await self._open_connection()
+        self._listener = ensure_future(self._listen())
+
+    async def disconnect(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except CancelledError:
+                pass
+            self._listener = None
+        for connection in (self._publisher, self._subscriber):
+            if connection is not None:
+                connection[1].close()
+        self._publisher = self._subscriber = None
+        self._publish_lock = None
+        self._channels.clear()
+
+    async def _listen(self):
+        while True:
+            try:
+                reply = await _read_reply(self._subscriber[0])
+            except (OSError, EOFError, IncompleteReadError, ValueError) as error:
+                # Includes `ConnectionError`, and parse errors of malformed replies
+                logger.warning("Lost the pub/sub subscription connection: %r", error)
+                if not await self._reconnect():
+                    return
+                continue
+            # Subscription confirmations are ignored
+            if isinstance(reply, list) and reply[0] == "message":
+                try:
+                    self.on_message(reply[1], reply[2])
+                except Exception:  # pylint: disable=broad-except
+                    # A bad message must not stop delivering the next ones
+                    logger.exception("Could not handle a message on %s", reply[1])
+
+    async def _reconnect(self) -> bool:
+        """Open the subscription connection again and restore subscriptions."""
+        self._subscriber[1].close()
+        delay = self.reconnect_delay
+        cause: Optional[Exception] = None
+        for attempt in range(1, self.reconnect_attempts + 1):
+            await sleep(delay)
+            delay *= 2
+            try:
+                self._subscriber = await self._open_connection()
+                for channel in list(self._channels):
+                    await self._send(self._subscriber[1], "SUBSCRIBE", channel)
+            except (OSError, PubSubError) as error:
+                logger.warning(
+                    "Pub/sub reconnection attempt %d/%d failed: %r",
+                    attempt,
+                    self.reconnect_attempts,
+                    error,
+                )
+                cause = error
+                continue
+            logger.info("Pub/sub subscription connection restored")
+            return True
+        logger.error("Could not reconnect to the pub/sub server, giving up")
+        self._subscriber = None
+        if self.on_error is not None:
+            failure = PubSubError("Lost the connection to the pub/sub server")
+            failure.__cause__ = cause
+            self.on_error(failure)
+        return False
+
+    def _send(self, writer: StreamWriter, *args: str) -> Awaitable[None]:
+        writer.write(_encode_command(*args))
+        return writer.drain()
+
+    async def subscribe(self, channel: str):
+        if self._subscriber is None:
+            raise PubSubError("Not connected to the pub/sub server")
+        self._channels.add(channel)
+        try:
+            await self._send(self._subscriber[1], "SUBSCRIBE", channel)
+        except OSError:
+            # The listener reconnects and restores subscribed channels
+            pass
+
+    async def unsubscribe(self, channel: str):
+        self._channels.discard(channel)
+        if self._subscriber is not None:
+            try:
+                await self._send(self._subscriber[1], "UNSUBSCRIBE", channel)
+            except OSError:
+                pass
+
+    async def publish(self, channel: str, message: str):
+        if self._publish_lock is None:
+            raise PubSubError("Not connected to the pub/sub server")
+        # Replies must be read in the order commands are sent
+        async with self._publish_lock:
+            if self._publisher is None or self._publisher[1].is_closing():
+                await self._reopen_publisher()
+            try:
+                await self._publish(channel, message)
+            except (OSError, EOFError, ValueError) as error:
+                logger.warning("Lost the pub/sub publishing connection: %r", error)
+                await self._reopen_publisher()
+                await self._publish(channel, message)
+
+    async def _reopen_publisher(self):
+        if self._publisher is not None:
+            self._publisher[1].close()
+            self._publisher = None
+        self._publisher = await self._open_connection()
+
+    async def _publish(self, channel: str, message: str):
+        reader, writer = self._publisher  # type: ignore [misc]
+        await self._send(writer, "PUBLISH", channel, message)
+        await _read_reply(reader)
+
+
+class _Subscription:
+    """Async context manager registering a subscriber for its lifetime."""
+
+    def __init__(self, owner: "Broker", channel: str, key: Optional[MessageKey]):
+        self.broker = owner
+        self.channel = channel
+        self.key = key
+        self.subscriber: Optional[Subscriber] = None
+
+    async def __aenter__(self) -> Subscriber:
+        self.subscriber = await self.broker._add_subscriber(self.channel, self.key)
+        return self.subscriber
+
+    async def __aexit__(self, *args):
+        if self.subscriber is not None:
+            await self.broker._remove_subscriber(self.subscriber)
+            self.subscriber = None
+
+
+class Broker:
+    """Fan out messages published on channels to local subscribers.
+
+    A backend channel subscription is shared by all the subscribers
+    of the current process listening to the same channel.
+    """
+
+    backends: Dict[str, Type[BrokerBackend]] = {
+        "memory": MemoryBackend,
+        "redis": RedisBackend,
+    }
+
+    def __init__(
+        self,
+        url: str,
+        queue_size: int = 0,
+        overflow_policy: Union[OverflowPolicy, str] = OverflowPolicy.DROP_OLDEST,
+    ):
+        """Initialize the broker.
+
+        Args:
+            url (str): The broker URL, its scheme selects the backend
+            queue_size (int, optional): Maximum number of messages pending
+                for each subscriber, 0 for no limit. Defaults to 0.
+            overflow_policy (Union[OverflowPolicy, str], optional): What to do
+                when a subscriber queue is full.
+                Defaults to `OverflowPolicy.DROP_OLDEST`.
+
+        Raises:
+            ValueError: Raised if the scheme has no backend
+        """
+        self.url = URL(url)
+        if self.url.scheme not in self.backends:
+            raise ValueError(f"Unsupported pub/sub backend: {self.url.scheme}")
+        self.backend = self.backends[self.url.scheme](
+            self.url, self._on_message, self._on_error
+        )
+        self.queue_size = queue_size
+        self.overflow_policy = OverflowPolicy(overflow_policy)
+        self._subscribers: Dict[str, Set[Subscriber]] = {}
+        self.is_connected = False
+
+    async def connect(self):
+        await self.backend.connect()
+        self.is_connected = True
+
+    async def disconnect(self):
+        await self.backend.disconnect()
+        self.is_connected = False
+
+    async def publish(self, channel: str, message: Any):
+        """Publish a message to all subscribers of `channel`.
+
+        Args:
+            channel (str): Channel name
+            message (Any): The message, must be JSON serializable
+        """
+        await self.backend.publish(channel, json.dumps(message))
+
+    def subscribe(
+        self, channel: str, key: Optional[MessageKey] = None
+    ) -> _Subscription:
+        """Subscribe to a channel.
+
+        Use it as an async context manager, giving an async iterator
+        over the messages published on `channel`.
+
+        Args:
+            channel (str): Channel name
+            key (MessageKey, optional): Return the key of a message,
+                pending messages with the same key are coalesced
+                with the `coalesce` overflow policy
+        """
+        return _Subscription(self, channel, key)
+
+    def _on_message(self, channel: str, message: str):
+        subscribers = self._subscribers.get(channel)
+        if subscribers:
+            try:
+                data = json.loads(message)
+            except ValueError:
+                logger.warning("Ignoring a message on %s, it's not valid JSON", channel)
+                return
+            for subscriber in subscribers:
+                subscriber.put(data)
+
+    def _on_error(self, error: Exception):
+        """Make all subscribers raise `error`, as they won't get messages anymore."""
+        self.is_connected = False
+        for subscribers in self._subscribers.values():
+            for subscriber in subscribers:
+                subscriber.queue.close(error)
+
+    async def _add_subscriber(
+        self, channel: str, key: Optional[MessageKey] = None
+    ) -> Subscriber:
+        queue = DeliveryQueue(self.queue_size, self.overflow_policy)
+        subscriber = Subscriber(channel, queue, key)
+        subscribers = self._subscribers.setdefault(channel, set())
+        subscribers.add(subscriber)
+        if len(subscribers) == 1:
+            await self.backend.subscribe(channel)
+        return subscriber
+
+    async def _remove_subscriber(self, subscriber: Subscriber):
+        subscribers = self._subscribers.get(subscriber.channel, set())
+        subscribers.discard(subscriber)
+        if not subscribers:
+            self._subscribers.pop(subscriber.channel, None)
+            await self.backend.unsubscribe(subscriber.channel)
+
+    def subscribers(self, channel: str) -> List[Subscriber]:
+        """Return the local subscribers of a channel."""
+        return list(self._subscribers.get(channel, ()))
+
+
+class LazyBroker(LazyInitMixin, Broker):
+    def __init__(self):
+        super().__init__("broker")
+
+
+broker = LazyBroker()
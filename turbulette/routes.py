@@ -1,8 +1,10 @@
 """REST routes providing additional features that cannot be achieved with GraphQL."""
 
-from starlette.responses import JSONResponse
+from starlette.responses import Response
 
 from turbulette.conf import settings
+from turbulette.metrics import metrics
+from turbulette.serializers import JSONResponse, get_serializer
 
 from .middleware.csrf import get_new_token
 
@@ -18,7 +20,9 @@ async def csrf(request):  # pylint: disable=unused-argument
     to create the actual CSRF route, if you need it.
     """
     token = get_new_token()
-    response = JSONResponse({"csrftoken": token})
+    response = JSONResponse(
+        {"csrftoken": token}, serializer=get_serializer(settings.JSON_SERIALIZER)
+    )
     response.set_cookie(
         settings.CSRF_COOKIE_NAME,
         token,
@@ -26,3 +30,12 @@ async def csrf(request):  # pylint: disable=unused-argument
         secure=settings.CSRF_COOKIE_SECURE,
     )
     return response
+
+
+async def metrics_route(request):  # pylint: disable=unused-argument
+    """Expose GraphQL metrics in the Prometheus text format.
+
+    Added by `turbulette_starlette` on `METRICS_ENDPOINT` when `METRICS_ENABLED`
+    is set.
+    """
+    return Response(metrics.render(), media_type=metrics.content_type)
@@ -0,0 +1,115 @@
+"""JSON serializers used to render HTTP responses.
+
+The serializer is chosen by the `JSON_SERIALIZER` setting:
+
+- `auto` : `orjson` if it's installed, `json` otherwise
+- `json` : the standard library `json` module
+- `orjson` : the [orjson](https://github.com/ijl/orjson) library
+- a dotted path to a callable taking an object and returning `bytes`
+
+Dates and datetimes are encoded the same way
+as the `Date` and `DateTime` scalars.
+"""
+
+import json
+from datetime import date, datetime
+from functools import lru_cache
+from importlib import import_module
+from typing import Any, Callable, Mapping, Optional
+
+from starlette.background import BackgroundTask
+from starlette.responses import JSONResponse as StarletteJSONResponse
+
+from turbulette.apps.base.resolvers.root_types import serialize_date, serialize_datetime
+from turbulette.conf.exceptions import ImproperlyConfigured
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore [assignment]
+
+Serializer = Callable[[Any], bytes]
+
+
+def default(obj: Any) -> Any:
+    """Encode objects not natively supported by JSON.
+
+    Raises:
+        TypeError: Raised if the object cannot be encoded
+    """
+    if isinstance(obj, datetime):
+        return serialize_datetime(obj)
+    if isinstance(obj, date):
+        return serialize_date(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_dumps(content: Any) -> bytes:
+    """Encode content with the standard library, like Starlette's `JSONResponse`."""
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+        default=default,
+    ).encode("utf-8")
+
+
+def orjson_dumps(content: Any) -> bytes:
+    """Encode content with orjson."""
+    # Let `default` handle datetimes, to match the scalars output
+    return orjson.dumps(
+        content, default=default, option=orjson.OPT_PASSTHROUGH_DATETIME
+    )
+
+
+@lru_cache(maxsize=None)
+def get_serializer(name: str = "auto") -> Serializer:
+    """Get a serializer from its name, as accepted by the `JSON_SERIALIZER` setting.
+
+    Args:
+        name (str, optional): Serializer name or dotted path. Defaults to "auto".
+
+    Raises:
+        ImproperlyConfigured: Raised if the serializer cannot be loaded
+
+    Returns:
+        Serializer: Callable encoding an object to JSON bytes
+    """
+    if name == "auto":
+        return orjson_dumps if orjson is not None else json_dumps
+    if name == "json":
+        return json_dumps
+    if name == "orjson":
+        if orjson is None:
+            raise ImproperlyConfigured(
+                "JSON_SERIALIZER is set to orjson, but it's not installed"
+            )
+        return orjson_dumps
+    try:
+        module, attribute = name.rsplit(".", 1)
+        return getattr(import_module(module), attribute)
+    except (ValueError, ImportError, AttributeError) as error:
+        raise ImproperlyConfigured(
+            f"Cannot load the JSON serializer {name}: {error}"
+        ) from error
+
+
+class JSONResponse(StarletteJSONResponse):
+    """Starlette's `JSONResponse`, rendered with a configurable serializer."""
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        background: Optional[BackgroundTask] = None,
+        serializer: Optional[Serializer] = None,
+    ):
+        self.serializer = serializer or json_dumps
+        super().__init__(content, status_code, headers, media_type, background)
+
+    def render(self, content: Any) -> bytes:
+        return self.serializer(content)
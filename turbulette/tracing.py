@@ -0,0 +1,322 @@
+"""Trace GraphQL operations, with spans for resolvers and database queries.
+
+Traces are recorded by the
+[TracingExtension][turbulette.extensions.TracingExtension]
+in a fraction of requests (head-based sampling), chosen when they start:
+unsampled requests are not measured at all. A sampled trace has:
+
+- one `operation` span, covering the whole request
+- `resolver` spans, for resolvers slower than the slow resolver threshold.
+  Default resolvers are never traced
+- `db` spans, for queries executed through `conf.db` during the request.
+  Resolvers running queries are always kept, so `db` spans are not orphaned
+
+Finished traces are kept in an in-process ring buffer, and passed
+to exporters. Exporters are called once the request is finished,
+in the event loop: they should be fast, or hand traces off to a background task.
+
+Traces can be converted to the OTLP/JSON format with `Trace.to_otlp()`,
+to be sent to OpenTelemetry collectors.
+"""
+
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections import deque
+from contextvars import ContextVar, Token
+from random import getrandbits, random
+from time import perf_counter, time
+from typing import Any, Dict, List, Optional, Sequence
+
+from gino.engine import GinoConnection, GinoEngine
+
+from turbulette.utils import LazyInitMixin
+
+logger = logging.getLogger(__name__)
+
+OPERATION = "operation"
+RESOLVER = "resolver"
+DB = "db"
+
+# OTLP span kinds
+_SPAN_KINDS = {OPERATION: 2, RESOLVER: 1, DB: 3}
+
+_current_span: "ContextVar[Optional[Span]]" = ContextVar("span", default=None)
+"""Span of the resolver (or operation) currently running.
+
+Resolvers run in their own tasks, so each one sees its own span.
+"""
+
+
+def current_span() -> Optional["Span"]:
+    """Return the span of the resolver currently running, if traced."""
+    return _current_span.get()
+
+
+def activate_span(span: "Span") -> Token:
+    """Make `span` the parent of spans started in the current context."""
+    return _current_span.set(span)
+
+
+def deactivate_span(token: Token):
+    _current_span.reset(token)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(v)} for key, v in attributes.items()]
+
+
+class Span:
+    """A timed unit of work within a trace."""
+
+    __slots__ = (
+        "trace",
+        "name",
+        "kind",
+        "span_id",
+        "parent",
+        "attributes",
+        "start_time",
+        "duration",
+        "error",
+        "has_children",
+        "_start",
+    )
+
+    def __init__(
+        self,
+        trace: "Trace",
+        name: str,
+        kind: str,
+        parent: Optional["Span"] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.trace = trace
+        self.name = name
+        self.kind = kind
+        self.span_id = f"{getrandbits(64):016x}"
+        self.parent = parent
+        self.attributes = attributes or {}
+        self.start_time = time()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+        self.has_children = False
+        self._start = perf_counter()
+        if parent is not None:
+            parent.has_children = True
+
+    def finish(self, error: Optional[BaseException] = None):
+        self.duration = perf_counter() - self._start
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+
+    @property
+    def end_time(self) -> Optional[float]:
+        return None if self.duration is None else self.start_time + self.duration
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Convert the span to the OTLP/JSON format."""
+        span = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": _SPAN_KINDS[self.kind],
+            "startTimeUnixNano": str(int(self.start_time * 1e9)),
+            "endTimeUnixNano": str(int((self.end_time or self.start_time) * 1e9)),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": 2, "message": self.error} if self.error else {},
+        }
+        if self.parent is not None:
+            span["parentSpanId"] = self.parent.span_id
+        return span
+
+    def __repr__(self):
+        return f"<Span {self.kind} {self.name!r} {self.duration}>"
+
+
+class Trace:
+    """Spans recorded during a sampled request."""
+
+    def __init__(self, name: str, slow_resolver_threshold: float = 0.0):
+        self.trace_id = f"{getrandbits(128):032x}"
+        self.slow_resolver_threshold = slow_resolver_threshold
+        self.root = Span(self, name, OPERATION)
+        self.spans: List[Span] = [self.root]
+
+    def start_span(
+        self,
+        name: str,
+        kind: str,
+        parent: Optional[Span] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> Span:
+        return Span(self, name, kind, parent or self.root, attributes)
+
+    def finish_span(self, span: Span, error: Optional[BaseException] = None):
+        """Finish a span, and keep it unless it's a fast resolver."""
+        span.finish(error)
+        if (
+            span.kind == RESOLVER
+            and span.error is None
+            and not span.has_children
+            and span.duration < self.slow_resolver_threshold
+        ):
+            return
+        self.spans.append(span)
+
+    @property
+    def duration(self) -> Optional[float]:
+        return self.root.duration
+
+    def to_otlp(self, service_name: str = "turbulette") -> Dict[str, Any]:
+        """Convert the trace to the OTLP/JSON format (`ExportTraceServiceRequest`)."""
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _otlp_attributes({"service.name": service_name})
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "turbulette"},
+                            "spans": [span.to_otlp() for span in self.spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+
+class SpanExporter(ABC):
+    """Base class for trace exporters.
+
+    Exporters listed in the `TRACING_EXPORTERS` setting are instantiated
+    without arguments.
+    """
+
+    @abstractmethod
+    def export(self, trace: Trace):
+        """Send a finished trace."""
+
+
+class LoggingExporter(SpanExporter):
+    """Log traces in the OTLP/JSON format, at the `INFO` level."""
+
+    def __init__(self, service_name: str = "turbulette"):
+        self.service_name = service_name
+
+    def export(self, trace: Trace):
+        logger.info(json.dumps(trace.to_otlp(self.service_name)))
+
+
+class Tracer:
+    """Sample requests to trace, and collect their traces."""
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        slow_resolver_threshold: float = 0.0,
+        buffer_size: int = 100,
+        exporters: Sequence[SpanExporter] = (),
+    ):
+        """Initialize the tracer.
+
+        Args:
+            sample_rate (float, optional): Ratio of requests to trace,
+                between 0 and 1. Defaults to 1.0.
+            slow_resolver_threshold (float, optional): Resolvers faster than this,
+                in seconds, are not kept in traces. Defaults to 0.0.
+            buffer_size (int, optional): Number of traces kept in memory.
+                Defaults to 100.
+            exporters (Sequence[SpanExporter], optional): Exporters to call
+                with each finished trace. Defaults to ().
+        """
+        self.sample_rate = sample_rate
+        self.slow_resolver_threshold = slow_resolver_threshold
+        self.buffer: "deque[Trace]" = deque(maxlen=buffer_size)
+        self.exporters = list(exporters)
+
+    def sampled(self) -> bool:
+        """Tell if a new request should be traced."""
+        return self.sample_rate >= 1 or random() < self.sample_rate  # nosec
+
+    def start_trace(self, name: str = "") -> Trace:
+        return Trace(name, self.slow_resolver_threshold)
+
+    def finish_trace(self, trace: Trace):
+        """Finish the operation span, store the trace and export it."""
+        trace.root.finish()
+        self.buffer.append(trace)
+        for exporter in self.exporters:
+            try:
+                exporter.export(trace)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("%s failed to export a trace", exporter)
+
+    def traces(self) -> List[Trace]:
+        """Return the last finished traces, oldest first."""
+        return list(self.buffer)
+
+
+class LazyTracer(LazyInitMixin, Tracer):
+    def __init__(self):
+        super().__init__("tracer")
+
+
+tracer = LazyTracer()
+
+
+class TracedConnection(GinoConnection):
+    """GINO connection recording a `db` span for each query run while tracing."""
+
+    async def _traced(self, method, clause, *multiparams, **params):
+        parent = _current_span.get()
+        if parent is None:
+            return await method(clause, *multiparams, **params)
+        span = parent.trace.start_span(
+            "db.query",
+            DB,
+            parent,
+            {"db.system": "postgresql", "db.statement": str(clause)},
+        )
+        try:
+            result = await method(clause, *multiparams, **params)
+        except Exception as error:
+            parent.trace.finish_span(span, error)
+            raise
+        parent.trace.finish_span(span)
+        return result
+
+    async def all(self, clause, *multiparams, **params):
+        return await self._traced(super().all, clause, *multiparams, **params)
+
+    async def first(self, clause, *multiparams, **params):
+        return await self._traced(super().first, clause, *multiparams, **params)
+
+    async def one_or_none(self, clause, *multiparams, **params):
+        # `one()` runs its query through `one_or_none()`, so it's traced too
+        return await self._traced(super().one_or_none, clause, *multiparams, **params)
+
+    async def scalar(self, clause, *multiparams, **params):
+        return await self._traced(super().scalar, clause, *multiparams, **params)
+
+    async def status(self, clause, *multiparams, **params):
+        return await self._traced(super().status, clause, *multiparams, **params)
+
+
+def trace_database(engine: GinoEngine):
+    """Record `db` spans for queries run through this engine.
+
+    Queries run with `iterate()` or prepared statements are not traced.
+    """
+    engine.connection_cls = TracedConnection
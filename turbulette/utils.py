@@ -1,9 +1,11 @@
 """Helpers used internally by Turbulette."""
 
+from collections import OrderedDict
 from os import environ
 from pathlib import Path
 from random import SystemRandom
-from typing import Any, Optional, Type
+from time import time
+from typing import Any, Dict, Hashable, Optional, Type
 
 from ariadne.types import GraphQLResolveInfo
 
@@ -73,6 +75,10 @@ class LazyInitMixin:
 
     This has the advantage of conserving typing, because `bar` is an
     instance of `Foo`
+
+    Once set up, the instance class is swapped for a subclass delegating
+    attribute accesses to the wrapped object without any check,
+    as singletons like the cache or the database are accessed on hot paths.
     """
 
     lazy_attributes = frozenset(
@@ -103,7 +109,112 @@ class LazyInitMixin:
         """Actually initialize the wrapped object."""
         self.__initialized__ = True
         self.obj = obj
+        object.__setattr__(self, "__class__", _ready_class(type(self), obj))
 
     @property
     def initialized(self) -> bool:
         return self.__initialized__
+
+
+def _ready_class(cls: Type[LazyInitMixin], obj: Any) -> Type[LazyInitMixin]:
+    """Create a subclass of a `LazyInitMixin` class, bound to the wrapped object.
+
+    The original class is kept as a base, so `isinstance` checks still pass.
+    """
+    base = getattr(cls, "__lazy_class__", cls)
+    lazy_attributes = base.lazy_attributes
+    get_lazy_attribute = object.__getattribute__
+
+    def get_attribute(self, name: str) -> Any:
+        if name in lazy_attributes:
+            return get_lazy_attribute(self, name)
+        return getattr(obj, name)
+
+    return type(
+        base.__name__,
+        (base,),
+        {
+            "__getattribute__": get_attribute,
+            "__lazy_class__": base,
+            "__module__": base.__module__,
+            "__qualname__": base.__qualname__,
+        },
+    )
+
+
+class LRUCache:
+    """A bounded in-process cache evicting the least recently used entries first.
+
+    Entries can be given an expiration date (a UNIX timestamp), after which
+    they are considered missing. Hits and misses are counted to
+    monitor the cache efficiency.
+    """
+
+    __slots__ = ("maxsize", "hits", "misses", "evictions", "_data")
+
+    def __init__(self, maxsize: int = 128):
+        """Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of entries
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value stored for `key`, or `default` if missing or expired."""
+        try:
+            value, expires_at = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        if expires_at is not None and expires_at <= time():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float] = None):
+        """Store a value, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key (Hashable): The entry key
+            value (Any): The value to store
+            expires_at (float, optional): UNIX timestamp after which
+                the entry expires. Defaults to None (never expires).
+        """
+        if key in self._data:
+            self._data.move_to_end(key)
+        self._data[key] = (value, expires_at)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Remove all entries and reset counters."""
+        self._data.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """Return cache metrics."""
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hit_ratio,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)